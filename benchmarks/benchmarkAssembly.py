@@ -0,0 +1,202 @@
+"""
+benchmarks of the block phantom hot paths, results are written as JSON so runs can be compared
+
+    python benchmarks/benchmarkAssembly.py --output results.json
+    python benchmarks/benchmarkAssembly.py --sizes 10 100 --compare results.json
+
+each benchmark is run --repeat times and the minimum and median seconds are recorded, with --compare a
+benchmark whose median is more than --threshold times slower than in the given results is reported as a
+regression (and the script exits with status 1)
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pyg4ometry
+import pymcnp
+
+holeOrder = [0, 1, 2, 3, 7, 9, 4, 6]
+oneAtATimeMax = 1000  # gridOneAtATime grows quadratically, larger grids would take hours
+
+
+def gridTranslations(n, spacing=20):
+    """
+    translations of n blocks on a square grid in the xy plane
+    """
+    side = int(np.ceil(np.sqrt(n)))
+    x, y = np.meshgrid(np.arange(side) * spacing, np.arange(side) * spacing)
+    return np.stack([x.ravel(), y.ravel(), np.zeros(x.size)], axis=1)[:n]
+
+
+def gridOneAtATime(n, reg):
+    """
+    grid of n blocks with connectors made one block at a time, as in tests/test_gridBlocksWrite.py
+    """
+    cells = []
+    for translation in gridTranslations(n):
+        block = pymcnp.blockphantom.Block("full", reg=reg)
+        block_p = block.transform(translation=translation, rotation=[0, 0, 0])
+        reg.addCell(block_p, replace=True)
+        reg.addSurfaces(block_p.surfaceList, replace=True)
+        cells.append(block_p)
+        for hole in holeOrder:
+            connector = block_p.addConnector(localHole=hole, reg=reg)
+            reg.addCell(connector, replace=True)
+            reg.addSurfaces(connector.surfaceList, replace=True)
+            cells.append(connector)
+    return cells
+
+
+def gridPlaced(n, reg):
+    """
+    grid of n blocks with connectors made with placeBlocks
+    """
+    blocks, connectors = pymcnp.blockphantom.placeBlocks("full", gridTranslations(n), reg=reg,
+                                                         connectorHoles=holeOrder)
+    return blocks + [c for blockConnectors in connectors for c in blockConnectors]
+
+
+def writeDeck(reg):
+    with tempfile.TemporaryDirectory() as directory:
+        f = pyg4ometry.mcnp.Writer()
+        f.setTitle("benchmark")
+        f.addGeometry(reg=reg)
+        f.write(os.path.join(directory, "benchmark.txt"))
+
+
+def materialised(cell):
+    """
+    cell with its pending transform applied to its surfaces and geometry, so a benchmark of a transform
+    measures the same work as before transforms were deferred
+    """
+    cell.surfaceList
+    cell.geometry
+    return cell
+
+
+def blockBenchmarks():
+    """
+    dict of name -> (setup, function), setup makes the arguments of function so they are not timed
+    """
+    def connectedPair():
+        b1 = pymcnp.blockphantom.Block("full")
+        b2 = b1.makeNewConnectedBlock("full", 20, 13)
+        return (b2,)
+
+    def freeBlock():
+        b1 = pymcnp.blockphantom.Block("full")
+        return (b1,)
+
+    return {
+        "Block": (lambda: (), lambda: pymcnp.blockphantom.Block("full")),
+        "BlockWithRegistry": (lambda: (pyg4ometry.mcnp.Registry(),),
+                              lambda reg: pymcnp.blockphantom.Block("full", reg=reg)),
+        "transform": (freeBlock, lambda b: materialised(b.transform(translation=[1, 2, 3], rotation=[0, 1, 0]))),
+        "transformPending": (freeBlock, lambda b: b.transform(translation=[1, 2, 3], rotation=[0, 1, 0])),
+        "rotateAboutConnection": (connectedPair, lambda b: materialised(b.rotateAboutConnection(20, [0, 0, 1]))),
+        "rotateAboutConnectionPending": (connectedPair, lambda b: b.rotateAboutConnection(20, [0, 0, 1])),
+        "makeNewConnectedBlock": (freeBlock, lambda b: b.makeNewConnectedBlock("full", 20, 13)),
+        "addConnector": (freeBlock, lambda b: b.addConnector(13)),
+    }
+
+
+def gridBenchmarks(sizes):
+    benchmarks = {}
+    for n in sizes:
+        if n <= oneAtATimeMax:
+            benchmarks[f"gridOneAtATime[{n}]"] = (lambda: (pyg4ometry.mcnp.Registry(),),
+                                                  lambda reg, n=n: gridOneAtATime(n, reg))
+        benchmarks[f"gridPlaced[{n}]"] = (lambda: (pyg4ometry.mcnp.Registry(),),
+                                          lambda reg, n=n: gridPlaced(n, reg))
+
+        def placedRegistry(n=n):
+            reg = pyg4ometry.mcnp.Registry()
+            gridPlaced(n, reg)
+            return (reg,)
+
+        def placedCells(n=n):
+            deck = pymcnp.blockphantom.UniverseDeck()
+            blocks, connectors = pymcnp.blockphantom.placeBlocks("full", gridTranslations(n),
+                                                                 connectorHoles=holeOrder)
+            deck.addBlocks(blocks)
+            deck.addConnectors([c for blockConnectors in connectors for c in blockConnectors])
+            return (deck,)
+
+        benchmarks[f"Writer[{n}]"] = (placedRegistry, writeDeck)
+        benchmarks[f"UniverseDeck[{n}]"] = (placedCells, lambda deck: deck.cards())
+    return benchmarks
+
+
+def run(benchmarks, repeat):
+    results = {}
+    for name, (setup, function) in benchmarks.items():
+        times = []
+        for _ in range(repeat):
+            args = setup()
+            start = time.perf_counter()
+            function(*args)
+            times.append(time.perf_counter() - start)
+        results[name] = {"min": min(times), "median": statistics.median(times), "repeat": repeat}
+        print(f"{name:32s} min {min(times):.6f} s  median {statistics.median(times):.6f} s")
+    return results
+
+
+def machineInfo():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], stdout=subprocess.PIPE, universal_newlines=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        commit = ""
+    return {"python": sys.version.split()[0], "numpy": np.__version__,
+            "pyg4ometry": pymcnp.blockphantom.cache._pyg4ometryVersion(),
+            "platform": platform.platform(), "commit": commit, "time": time.strftime("%Y-%m-%dT%H:%M:%S")}
+
+
+def compare(results, baseline, threshold):
+    """
+    names of the benchmarks whose median is more than threshold times slower than the baseline
+    """
+    regressions = []
+    for name, result in results.items():
+        if name in baseline and result["median"] > threshold * baseline[name]["median"]:
+            regressions.append(name)
+            print(f"regression {name}: {baseline[name]['median']:.6f} s -> {result['median']:.6f} s")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="block phantom benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000],
+                        help="numbers of blocks of the grid assemblies")
+    parser.add_argument("--repeat", type=int, default=5, help="runs of each benchmark")
+    parser.add_argument("--filter", default="", help="only run benchmarks whose name contains this text")
+    parser.add_argument("--output", default=None, help="JSON file the results are written to")
+    parser.add_argument("--compare", default=None, help="JSON file of earlier results to compare with")
+    parser.add_argument("--threshold", type=float, default=1.2, help="slow down reported as a regression")
+    args = parser.parse_args(argv)
+
+    benchmarks = {**blockBenchmarks(), **gridBenchmarks(args.sizes)}
+    benchmarks = {name: b for name, b in benchmarks.items() if args.filter in name}
+    results = run(benchmarks, args.repeat)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"machine": machineInfo(), "benchmarks": results}, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["benchmarks"]
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
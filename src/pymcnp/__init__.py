@@ -1 +1,2 @@
+from . import trace
 from . import blockphantom
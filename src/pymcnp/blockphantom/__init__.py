@@ -1,3 +1,19 @@
 from .block import *
 from .connector import *
 from .utils import *
+from .cache import *
+from .placement import *
+from .holeindex import *
+from .overlap import *
+from .world import *
+from .cards import *
+from .universe import *
+from .description import *
+from .meshexport import *
+from .registry import *
+from .palette import *
+from .writer import *
+from .phantom import *
+from .query import *
+from .voxel import *
+from .mass import *
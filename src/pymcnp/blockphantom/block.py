@@ -1,17 +1,65 @@
+import logging
 import pyg4ometry
 import numpy as _np
+from pymcnp import trace as _trace
 from pymcnp.blockphantom import utils as _utils
 from pymcnp.blockphantom import connector as _connector
+from pymcnp.blockphantom import cache as _cache
+from pymcnp.blockphantom import registry as _registry
+from pymcnp.blockphantom import palette as _palette
 import time
 
+_log = logging.getLogger(__name__)
+
 fullBlockDim = [11.0, 16.5, 5.5]  # dimensions of a full block
 halfBlockDim = [11.0, 16.5, 2.5]  # dimensions of a half block
+holeRadius = 0.4  # radius of the connector holes
+
+# hole status bit flags
+holeConnected = 1
+holeCovered = 2
+holeHasConnector = 4
+_holeFlags = {"connected": holeConnected, "covered": holeCovered, "hasConnector": holeHasConnector}
+
+
+class _HoleStatus:
+    """
+    dict-like view of the status flags of one hole, so block.holeStatus[i]["connected"] can be read and set
+    """
+    __slots__ = ("_flags", "_hole")
+
+    def __init__(self, flags, hole):
+        self._flags = flags
+        self._hole = hole
+
+    def __getitem__(self, key):
+        if key == "name":
+            return Block.holeNames[self._hole]
+        return bool(self._flags[self._hole] & _holeFlags[key])
+
+    def __setitem__(self, key, value):
+        if value:
+            self._flags[self._hole] |= _holeFlags[key]
+        else:
+            self._flags[self._hole] &= 0xFF ^ _holeFlags[key]
+
+    def copy(self):
+        return {key: self[key] for key in ["name", *_holeFlags]}
+
 
 class Block(pyg4ometry.mcnp.Cell):
     fullBlockCache = None
     halfBlockCache = None
+    holeNames = ("Bottom-Left", "Bottom-Right", "Top-Left", "Top-Right", "Left-Top", "Left-Middle",
+                 "Left-Bottom", "Right-Top", "Right-Middle", "Right-Bottom", "Front-TopLeft", "Front-TopRight",
+                 "Front-MiddleLeft", "Front-MiddleCenter", "Front-MiddleRight", "Front-BottomLeft",
+                 "Front-BottomRight", "Back-TopLeft", "Back-TopRight", "Back-MiddleLeft", "Back-MiddleCenter",
+                 "Back-MiddleRight", "Back-BottomLeft", "Back-BottomRight")
+    _holeCache = {}  # local space hole tables, keyed by block type and D
+    _surfacesPending = False  # True when the surfaces do not have the latest transform yet
+    @_trace.timed("construction")
     def __init__(self, blockType, translation=[0, 0, 0], rotationSteps=[0, 0, 0], cellNumber=None, reg=None):
-        self._mesh = None
+        self._meshHandle = None
         super().__init__(surfaces=[], cellNumber=cellNumber, reg=reg)  # a block is a cell
 
         self.blockType = blockType
@@ -21,10 +69,8 @@ class Block(pyg4ometry.mcnp.Cell):
             raise TypeError(msg)
         self.unit = self.dim[1] / (3 * 2)  # hole separation unit on the surface of the block
 
-        # define holes in local space
-        self.holeInfo = self._defineHoles(D=0.01)
         # define surfaces in local space
-        surfaces = self._makeSurfaces()
+        surfaces = self._makeSurfaces(self._localHoles(D=0.01))
         # set cell surfaces
         if reg:
             self.addSurfaces(surfaces)
@@ -33,77 +79,109 @@ class Block(pyg4ometry.mcnp.Cell):
         # set cell geometry
         geometry = self._makeGeometry(self.surfaceList)
         self.addGeometry(geometry)
-        self.holeInfo = self._defineHoles(D=0)  # D=0 so coords are zero-ed (and any connectors will be centered)
-
-        # cash mesh if needed
-        if blockType == "full" and Block.fullBlockCache is None:
-            start_time = time.time()
-            print("caching full block mesh...")
-            Block.fullBlockCache = self.mesh()
-            print("%s seconds to mesh full block" % (time.time() - start_time))
-            print(" > cache complete")
-        if blockType == "half" and Block.halfBlockCache is None:
-            start_time = time.time()
-            print("caching half block mesh...")
-            Block.halfBlockCache = self.mesh()
-            print("%s seconds to mesh half block" % (time.time() - start_time))
-            print(" > cache complete")
-
-        # copy cashed mesh for this block
-        if blockType == "full":
-            self._mesh = Block.fullBlockCache.clone()
-        elif blockType == "half":
-            self._mesh = Block.halfBlockCache.clone()
+        self._holes = self._localHoles(D=0)  # D=0 so coords are zero-ed (and any connectors will be centered)
 
         # user inputted block transforms
         rotationMatrix = _utils.rotationStepsToMatrix(rotationSteps)
         translationVector = _np.array(translation)
 
-        # apply transformations to holes to make them global space
-        self.holeInfo = self._transformHoles(rotationMatrix, translationVector)
+        # the mesh is only made when requested, until then just the transform from local space is kept
+        self._meshRotation = rotationMatrix
+        self._meshTranslation = translationVector
 
-        holeNames = ["Bottom-Left", "Bottom-Right", "Top-Left", "Top-Right", "Left-Top", "Left-Middle",
-                     "Left-Bottom", "Right-Top", "Right-Middle", "Right-Bottom", "Front-TopLeft", "Front-TopRight",
-                     "Front-MiddleLeft", "Front-MiddleCenter", "Front-MiddleRight", "Front-BottomLeft",
-                     "Front-BottomRight", "Back-TopLeft", "Back-TopRight", "Back-MiddleLeft", "Back-MiddleCenter",
-                     "Back-MiddleRight", "Back-BottomLeft", "Back-BottomRight"]
-
-        self.holeStatus = {i: {"name": holeNames[i], "connected": False, "covered": False, "hasConnector": False} for i in range(len(self.holeInfo))}
+        # apply transformations to holes to make them global space
+        self._holes = self._transformHoles(rotationMatrix, translationVector)
+        self.holeFlags = _np.zeros(len(self._holes), dtype=_np.uint8)
 
         # apply transformations to surfaces to make them global space
         surfaces_p = [s.transform(translation=translationVector.tolist(), rotation=rotationMatrix.tolist()) for s in surfaces]  # transformed surfaces
 
-        # update mesh
-        axis, angle = _utils.rotationMatrixToAxisAndAngle(rotationMatrix)
-        self._mesh = self._mesh
-        self._mesh.rotate(axis, 360-angle)
-        self._mesh.translate(translationVector)
-
         # update geometry
         self.addGeometry(self._makeGeometry(self.surfaceList))
 
         if reg:
-            # add s to registry and generate unique surfaceNumbers
-            for s_p in surfaces_p:
-                if s_p.surfaceNumber in reg.surfaceDict:
-                    s_p.surfaceNumber = reg.getNewSurfaceNumber()
-                if not s_p.surfaceNumber:
-                    s_p.surfaceNumber = reg.getNewSurfaceNumber()
-                reg.surfaceDict[s_p.surfaceNumber] = s_p
-                #self.addSurface(s_p)  # also add to the cell's surfaceList
+            # add s to registry with unique surfaceNumbers from one reserved range
+            with _trace.phase("registry"):
+                _registry.addSurfaces(surfaces_p, reg)
         self.surfaceList = surfaces_p  # update the cell's surfaceList
 
-        m1 = pyg4ometry.mcnp.Material(materialNumber=1, density=-0.9016, reg=reg)  # polyethylene
-        if reg:
-            reg.addMaterial(m1, replace=True)
-        self.addMaterial(m1)
+        _palette.assignMaterial(self, *_palette.polyethylene, reg=reg)  # shared by all blocks of the registry
+
+    def _baseMesh(self):
+        """
+        mesh of this block type in local space, made once per process and shared by all blocks
+        """
+        if self.blockType == "full":
+            if Block.fullBlockCache is None:
+                Block.fullBlockCache = self._cacheMesh()
+            return Block.fullBlockCache
+        if Block.halfBlockCache is None:
+            Block.halfBlockCache = self._cacheMesh()
+        return Block.halfBlockCache
+
+    def _cacheMesh(self):
+        """
+        loads the mesh of this block type from the on-disk cache, or meshes the block and stores it
+        """
+        holes = self._localHoles(D=0.01)
+        key = _cache.meshKey(f"{self.blockType}Block", dim=self.dim, holeRadius=holeRadius, holes=holes)
+        mesh = _cache.loadMesh(key)
+        if mesh is not None:
+            _log.info("loaded %s block mesh from cache", self.blockType)
+            return mesh
+
+        start_time = time.time()
+        _log.info("caching %s block mesh...", self.blockType)
+        surfaces = self._makeSurfaces(holes)
+        localBlock = pyg4ometry.mcnp.Cell(surfaces=surfaces, geometry=self._makeGeometry(surfaces))
+        mesh = localBlock.mesh()
+        _log.info("%s seconds to mesh %s block", time.time() - start_time, self.blockType)
+        _cache.saveMesh(key, mesh)
+        _log.info(" > cache complete")
+        return mesh
+
+    @property
+    def holeInfo(self):
+        """
+        (H,2,3) array of hole [position, direction] in global space
+        """
+        return self._holes
+
+    @holeInfo.setter
+    def holeInfo(self, holes):
+        self._holes = _np.array(holes, dtype=float).reshape(-1, 2, 3)
+
+    @property
+    def holePositions(self):
+        return self._holes[:, 0]
+
+    @property
+    def holeDirections(self):
+        return self._holes[:, 1]
+
+    @property
+    def holeStatus(self):
+        """
+        per hole dict-like views of holeFlags with the keys name, connected, covered and hasConnector
+        """
+        return [_HoleStatus(self.holeFlags, i) for i in range(len(self.holeFlags))]
 
     def printHoleInfo(self):
-        msg = f""
-        for i in range(0, len(self.holeStatus)):
-            print(f"{i} {self.holeStatus[i]['name']} : connected {self.holeStatus[i]['connected']} covered {self.holeStatus[i]['covered']} hasConnector {self.holeStatus[i]['hasConnector']}")
+        for i, flags in enumerate(self.holeFlags):
+            print(f"{i} {Block.holeNames[i]} : connected {bool(flags & holeConnected)} covered {bool(flags & holeCovered)} hasConnector {bool(flags & holeHasConnector)}")
         return
 
+    def _localHoles(self, D=0):
+        """
+        read-only local space hole table of this block type, defined once per process
+        """
+        key = (self.blockType, D)
+        if key not in Block._holeCache:
+            holes = _np.array(self._defineHoles(D=D), dtype=float)
+            holes.flags.writeable = False
+            Block._holeCache[key] = holes
+        return Block._holeCache[key]
+
     def _defineHoles(self, D=0.01):
         """
         :param D: small value to extend past the planes of the box by 0.01 cm so no inf small surface mesh covering hole
@@ -146,15 +224,13 @@ class Block(pyg4ometry.mcnp.Cell):
         return holes
 
     def _transformHoles(self, rotationMatrix, translationVector):
-        holeInfo_p = []
-        for hi in _np.array(self.holeInfo):
-            position_p = rotationMatrix @ hi[0] + translationVector
-            direction_p = rotationMatrix @ hi[1]
-            holeInfo_p.append([position_p, direction_p])
+        holes_p = self._holes @ _np.asarray(rotationMatrix, dtype=float).T  # positions and directions in one product
+        holes_p[:, 0] += translationVector
 
-        return holeInfo_p
+        return holes_p
 
-    def _makeSurfaces(self):
+    def _makeSurfaces(self, holes=None):
+        holes = self._localHoles(D=0.01) if holes is None else holes
         surfaces = [pyg4ometry.mcnp.PX((-self.dim[0] / 2), surfaceNumber=1),  # px1 (left)
                     pyg4ometry.mcnp.PX((self.dim[0] / 2), surfaceNumber=2),   # px2 (right)
                     pyg4ometry.mcnp.PY((-self.dim[1] / 2), surfaceNumber=3),  # py1 (bottom)
@@ -164,9 +240,9 @@ class Block(pyg4ometry.mcnp.Cell):
                     ]
         i = len(surfaces)
 
-        for holePosition, holeDirection in self.holeInfo:
+        for holePosition, holeDirection in holes:
             i = i + 1
-            surfaces.append(pyg4ometry.mcnp.RCC(*holePosition, *holeDirection, 0.4, surfaceNumber=i))
+            surfaces.append(pyg4ometry.mcnp.RCC(*holePosition, *holeDirection, holeRadius, surfaceNumber=i))
 
         return surfaces
 
@@ -182,6 +258,21 @@ class Block(pyg4ometry.mcnp.Cell):
 
         return geom
 
+    def _copy(self):
+        """
+        copy of the block made without calling __init__ (no hole definition, surface creation,
+        meshing or new material), lists and hole status are copied so the copy can be updated
+        independently of this block
+        """
+        block_p = Block.__new__(Block)
+        for key, value in self.__dict__.items():
+            block_p.__dict__[key] = value.copy() if isinstance(value, (list, dict)) else value
+        block_p._meshHandle = None  # the copy may be given another transform
+        block_p.holeFlags = self.holeFlags.copy()
+
+        return block_p
+
+    @_trace.timed("transform")
     def transform(self, translation=[0, 0, 0], rotation=[0, 0, 0], isRotationMatrix=False):
         if isRotationMatrix:
             rotationMatrix = _np.array(rotation)
@@ -189,33 +280,51 @@ class Block(pyg4ometry.mcnp.Cell):
             rotationMatrix = _utils.rotationStepsToMatrix(rotation)
         translationVector = _np.array(translation)
 
-        if hasattr(self, 'reg'):
-            reg = self.reg
-        else:
-            reg = None
+        # new block (prime) derived from this block
+        block_p = self._copy()
+        block_p._holes = self._transformHoles(rotationMatrix, translationVector)
 
-        # new block (prime)
-        block_p = Block(
-            blockType=self.blockType,
-            cellNumber=self.cellNumber
-        )
+        # accumulate the transform from local space, surfaces, geometry and mesh are re-made from local
+        # space with the total transform when next requested, so a chain of transforms costs one
+        block_p._meshRotation = rotationMatrix @ self._meshRotation
+        block_p._meshTranslation = rotationMatrix @ self._meshTranslation + translationVector
+        block_p._surfacesPending = True
 
-        # transform surface
-        surfaces_p = [s.transform(translation=translationVector.tolist(), rotation=rotationMatrix.tolist()) for s in self.surfaceList]
+        return block_p
 
-        # update the new block
-        block_p.surfaceList = surfaces_p
-        block_p.geometry = block_p._makeGeometry(surfaces_p)
-        block_p.holeInfo = self._transformHoles(rotationMatrix, translationVector)
-        block_p.holeStatus = self.holeStatus.copy()
+    @property
+    def surfaceList(self):
+        if self._surfacesPending:
+            self._applyTransform()
+        return self._surfaceList
 
-        # update mesh
-        axis, angle = _utils.rotationMatrixToAxisAndAngle(rotationMatrix)
-        block_p._mesh = self._mesh
-        block_p._mesh.rotate(axis, 360-angle)
-        block_p._mesh.translate(translationVector)
+    @surfaceList.setter
+    def surfaceList(self, surfaces):
+        self._surfaceList = surfaces
+        self._surfacesPending = False
 
-        return block_p
+    @property
+    def geometry(self):
+        if self._surfacesPending:
+            self._applyTransform()
+        return self._geometry
+
+    @geometry.setter
+    def geometry(self, geometry):
+        self._geometry = geometry
+
+    def _applyTransform(self):
+        """
+        makes the surfaces and geometry of the pending transform from the local space surfaces, keeping the
+        surface numbers of the surfaces they replace
+        """
+        rotation, translation = _np.asarray(self._meshRotation).tolist(), _np.asarray(self._meshTranslation).tolist()
+        surfaces_p = [s.transform(translation=translation, rotation=rotation) for s in self._makeSurfaces()]
+        for s_p, s in zip(surfaces_p, self._surfaceList):
+            s_p.surfaceNumber = s.surfaceNumber
+        self._surfaceList = surfaces_p
+        self._geometry = self._makeGeometry(surfaces_p)
+        self._surfacesPending = False
 
     def _isPointInsideBlock(self, dimensions, rotationMatrix, translationVector, pointXYZ):
         """
@@ -231,7 +340,7 @@ class Block(pyg4ometry.mcnp.Cell):
             [dimensions[0], 0, dimensions[2]],  # corner in the +x +z
             [0, dimensions[1], dimensions[2]],  # corner in the +y +z
             [dimensions[0], dimensions[1], dimensions[2]]  # corner in the +x +y +z (max x,y,z)
-        ])
+        ]) - _np.array(dimensions) / 2  # block geometry is centred on the origin
         cornerCoords_p = rotationMatrix @ cornerCoords.T  # apply rotation to each corner
         cornerCoords_p = cornerCoords_p.T + translationVector  # apply translation to each corner (now global coords)
         minCorner = _np.min(cornerCoords_p, axis=0)
@@ -241,61 +350,58 @@ class Block(pyg4ometry.mcnp.Cell):
         else:
             return False
 
-    def makeNewConnectedBlock(self, newBlockType, newBlockHole, localHole, cellNumber=None, makeConnector=False, reg=None):
+    def makeNewConnectedBlock(self, newBlockType, newBlockHole, localHole, cellNumber=None, makeConnector=False, reg=None, holeIndex=None):
         # check input is correct
         if not (0 <= localHole < len(self.holeInfo)) or not (0 <= newBlockHole < len(self.holeInfo)):
             msg = f"Hole numbers must be between 0 and {len(self.holeInfo) - 1}"
             raise TypeError(msg)
 
         # check if hole is available
-        if self.holeStatus[localHole]["connected"] or self.holeStatus[localHole]["covered"]:
+        if self.holeFlags[localHole] & (holeConnected | holeCovered):
             msg = f"Hole {localHole} is not available for connection"
             raise ValueError(msg)
 
 
 
         h1Position, h1Direction = self.holeInfo[localHole]
-        print(f"({localHole}) h1: {h1Position} , {h1Direction}")
+        _log.debug("(%s) h1: %s , %s", localHole, h1Position, h1Direction)
         block_p = Block(blockType=newBlockType, cellNumber=cellNumber, reg=reg)
         h2Position, h2Direction = block_p.holeInfo[newBlockHole]
-        print(f"({newBlockHole}) h2: {h2Position} , {h2Direction}")
+        _log.debug("(%s) h2: %s , %s", newBlockHole, h2Position, h2Direction)
 
         # calculate transformation (-h2 to h1)
         rotationMatrix = _utils.computeRotationMatrix(-_np.array(h2Direction), _np.array(h1Direction)) # negative hole 2 direction
         h2Position_rotated = rotationMatrix @ h2Position
         translationVector = h1Position - h2Position_rotated
-        print(f"tr: {translationVector}")
-        print(f"h2Pos_p: {h2Position_rotated}")
+        _log.debug("tr: %s", translationVector)
+        _log.debug("h2Pos_p: %s", h2Position_rotated)
 
         # apply transformation to the new block
         block_p = block_p.transform(translation=translationVector.tolist(), rotation=rotationMatrix.tolist(), isRotationMatrix=True)
 
         # update connected hole status for new block
-        self.holeStatus[localHole]["connected"] = True
+        self.holeFlags[localHole] |= holeConnected
         # update connected hole status for local block
-        block_p.holeStatus[newBlockHole]["connected"] = True
+        block_p.holeFlags[newBlockHole] |= holeConnected
 
-        # update covered hole status for new block and local block
-        # ToDo
+        # update covered hole status for new block and local block (and any other neighbours)
+        if holeIndex is not None:
+            holeIndex.addBlock(block_p)
 
         # make connector
         if makeConnector:
-            if self.holeStatus[localHole]["hasConnector"]:
+            if self.holeFlags[localHole] & holeHasConnector:
                 msg = f"Hole {localHole} already has a connector"
                 raise ValueError(msg)
             connector = self.addConnector(localHole=localHole, reg=reg)
-            self.holeStatus[localHole]["hasConnector"] = True
-            block_p.holeStatus[newBlockHole]["hasConnector"] = True
+            self.holeFlags[localHole] |= holeHasConnector
+            block_p.holeFlags[newBlockHole] |= holeHasConnector
             if reg:
-                reg.addCell(block_p, replace=True)
-                reg.addSurfaces(block_p.surfaceList, replace=True)
-                reg.addCell(connector, replace=True)
-                reg.addSurfaces(connector.surfaceList, replace=True)
+                _registry.updateCells([block_p, connector], reg)
             return [block_p, connector]
 
         if reg:
-            reg.addCell(block_p, replace=True)
-            reg.addSurfaces(block_p.surfaceList, replace=True)
+            _registry.updateCells([block_p], reg)
         return block_p
 
     def addConnector(self, localHole, cellNumber=None, reg=None):
@@ -305,28 +411,18 @@ class Block(pyg4ometry.mcnp.Cell):
             raise TypeError(msg)
 
         # check if hole is available for connector
-        if self.holeStatus[localHole]["hasConnector"]:
+        if self.holeFlags[localHole] & holeHasConnector:
             msg = f"Hole {localHole} already has connector"
             raise ValueError(msg)
 
         h1Position, h1Direction = self.holeInfo[localHole]
 
-        # connector creation
-        rotationMatrix = _utils.computeRotationMatrix(_np.array([0, 0, 1]), _np.array(h1Direction))
-        direction = h1Direction / _np.linalg.norm(h1Direction)
-        translationVector = h1Position - (direction * (_connector.length / 2))
-
-        # connector at the origin
-        connector = _connector.Connector(
-            cellNumber=cellNumber,
-            reg=reg
-        )
-        # apply transformation to move and align to hole, with 50% length outside hole
-        connector_p = connector.transform(translation=translationVector, rotation=rotationMatrix, isRotationMatrix=True)
+        # connector aligned to the hole with 50% length outside hole
+        connector_p = _connector.Connector.at(h1Position, h1Direction, cellNumber=cellNumber, reg=reg)
 
         return connector_p
 
-    def rotateAboutConnection(self, hole, rotationSteps, reg=False):
+    def rotateAboutConnection(self, hole, rotationSteps, reg=False, holeIndex=None):
         """
         un-transform block so hole is at origin and then apply rotation and translate back
         """
@@ -334,7 +430,7 @@ class Block(pyg4ometry.mcnp.Cell):
         holePosition, holeDirection = self.holeInfo[hole]
 
         # check if hole has connection to rotate around
-        if self.holeStatus[hole]["connected"] is False:
+        if not self.holeFlags[hole] & holeConnected:
             msg = f"hole {hole} has no connection to be rotated around."
             raise ValueError(msg)
 
@@ -347,29 +443,27 @@ class Block(pyg4ometry.mcnp.Cell):
             msg = f"Rotation must be around the hole's axis of connection"
             raise ValueError(msg)
 
-        # move block from connection so hole is at origin
-        block_p = self.transform(translation=-holePosition, rotation=[0, 0, 0])
-        # rotate by rotationSteps
-        block_p = block_p.transform(translation=[0, 0, 0], rotation=rotationSteps)
-        # move block back to connection
-        block_p = block_p.transform(translation=holePosition, rotation=[0, 0, 0])
+        # move block from connection so hole is at origin, rotate by rotationSteps and move back, as one transform
+        block_p = self.transform(translation=holePosition - rotationMatrix @ holePosition, rotation=rotationMatrix,
+                                 isRotationMatrix=True)
 
         if reg:
-            reg.addCell(block_p, replace=True)
-            reg.addSurfaces(block_p.surfaceList, replace=True)
+            _registry.updateCells([block_p], reg)
 
-        # todo update hole status  - some holes will become uncovered and some covered
+        # some holes will become uncovered and some covered
+        if holeIndex is not None:
+            holeIndex.replaceBlock(self, block_p)
 
         return block_p
 
-    def rotateAboutConnectionPartial(self, hole, rotationSteps, reg=False):
+    def rotateAboutConnectionPartial(self, hole, rotationSteps, reg=False, holeIndex=None):
         """
         rotate block around the hole local connection axis, regardless of block orientation
         """
 
         holePosition, holeDirection = self.holeInfo[hole]
 
-        if not self.holeStatus[hole]["connected"]:
+        if not self.holeFlags[hole] & holeConnected:
             raise ValueError(f"Hole {hole} has no connection to rotate around.")
 
         holeDirection = holeDirection / _np.linalg.norm(holeDirection)
@@ -386,16 +480,16 @@ class Block(pyg4ometry.mcnp.Cell):
                                                                       [holeDirection[2], 0, -holeDirection[0]],
                                                                       [-holeDirection[1], holeDirection[0], 0]]) \
                          + (1 - _np.cos(angle_rad)) * (_np.outer(holeDirection, holeDirection) - _np.eye(3))
+        rotationMatrix = _utils.snapRotationMatrix(rotationMatrix)  # exact for the 90-degree steps
 
-        block_p = self.transform(translation=-holePosition, rotation=[0, 0, 0])
-
-        block_p = block_p.transform(rotation=rotationMatrix, isRotationMatrix=True)
-
-        block_p = block_p.transform(translation=holePosition, rotation=[0, 0, 0])
+        block_p = self.transform(translation=holePosition - rotationMatrix @ holePosition, rotation=rotationMatrix,
+                                 isRotationMatrix=True)
 
         if reg:
-            reg.addCell(block_p, replace=True)
-            reg.addSurfaces(block_p.surfaceList, replace=True)
+            _registry.updateCells([block_p], reg)
+
+        if holeIndex is not None:
+            holeIndex.replaceBlock(self, block_p)
 
         return block_p
 
@@ -406,8 +500,18 @@ class Block(pyg4ometry.mcnp.Cell):
     # todo preserve the orientation of the block in the global coordinates so the new block of
     #  makeNewConnectedBlock will match the orientation of the old block
 
+    @property
+    def meshHandle(self):
+        """
+        copy-on-write handle of the mesh, sharing the base mesh of all blocks of this type
+        """
+        if self._meshHandle is None:
+            self._meshHandle = _utils.MeshHandle(self._baseMesh(), self._meshRotation, self._meshTranslation)
+        return self._meshHandle
+
+    @_trace.timed("mesh")
     def mesh(self):
-        if self._mesh is not None:
-            return self._mesh
-        else:
-            return super().mesh()
+        """
+        copy of the mesh of the block that can be modified, meshHandle.read() gives the shared mesh without a copy
+        """
+        return self.meshHandle.read().clone()
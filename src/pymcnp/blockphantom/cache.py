@@ -0,0 +1,145 @@
+import hashlib as _hashlib
+import json as _json
+import os as _os
+import tempfile as _tempfile
+import pyg4ometry
+import numpy as _np
+
+cacheVersion = 1  # increase when the stored mesh format or the meshed geometry changes
+# the on-disk cache is opt-in, it is used when useDiskCache is True or PYMCNP_DISK_CACHE=1 and kept in
+# cacheDir, PYMCNP_CACHE_DIR or ~/.cache/pymcnp. The environment is read when the cache is used.
+cacheDir = None
+useDiskCache = None
+
+
+def _cacheDir():
+    if cacheDir is not None:
+        return cacheDir
+    return _os.environ.get("PYMCNP_CACHE_DIR", _os.path.join(_os.path.expanduser("~"), ".cache", "pymcnp"))
+
+
+def _useDiskCache():
+    if useDiskCache is not None:
+        return useDiskCache
+    return _os.environ.get("PYMCNP_DISK_CACHE", "0") == "1"
+
+
+def _pyg4ometryVersion():
+    try:
+        from importlib import metadata as _metadata
+        return _metadata.version("pyg4ometry")
+    except Exception:
+        return str(getattr(pyg4ometry, "__version__", "unknown"))
+
+
+def _meshClasses():
+    """
+    CSG, Vector, Vertex and Polygon classes of the meshing backend selected in pyg4ometry.config
+    """
+    if pyg4ometry.config.meshing == pyg4ometry.config.meshingType.pycsg:
+        from pyg4ometry.pycsg.core import CSG
+        from pyg4ometry.pycsg.geom import Vector, Vertex, Polygon
+    else:
+        from pyg4ometry.pycgal.core import CSG
+        from pyg4ometry.pycgal.geom import Vector, Vertex, Polygon
+    return CSG, Vector, Vertex, Polygon
+
+
+def meshKey(name, **parameters):
+    """
+    key of a cached mesh, made from the name of the mesh, the parameters that define its geometry
+    (e.g. dimensions, hole radius and hole layout), the cache version, the pyg4ometry version and the
+    meshing backend
+    """
+    description = {
+        "name": name,
+        "parameters": parameters,
+        "cacheVersion": cacheVersion,
+        "pyg4ometry": _pyg4ometryVersion(),
+        "meshing": pyg4ometry.config.backendName(),
+    }
+    text = _json.dumps(description, sort_keys=True, default=lambda o: _np.asarray(o).tolist())
+    return f"{name}-{_hashlib.sha1(text.encode()).hexdigest()[:16]}"
+
+
+def _meshPath(key):
+    return _os.path.join(_cacheDir(), f"{key}.npz")
+
+
+def meshToArrays(mesh):
+    """
+    converts a mesh to arrays of vertices (N,3), flattened polygon vertex indices and polygon sizes
+    """
+    vertices, polygons, _ = mesh.toVerticesAndPolygons()
+    vertices = _np.asarray(vertices, dtype=float).reshape(-1, 3)
+    polygonSizes = _np.array([len(p) for p in polygons], dtype=_np.int64)
+    polygonIndices = _np.concatenate([_np.asarray(p, dtype=_np.int64) for p in polygons]) if len(polygons) else _np.zeros(0, dtype=_np.int64)
+    return vertices, polygonIndices, polygonSizes
+
+
+def arraysToMesh(vertices, polygonIndices, polygonSizes):
+    """
+    builds a mesh from the arrays made by meshToArrays
+    """
+    CSG, Vector, Vertex, Polygon = _meshClasses()
+    points = [Vector(*v) for v in vertices.tolist()]
+    polygons = []
+    for polygon in _np.split(polygonIndices, _np.cumsum(polygonSizes)[:-1]):
+        polygons.append(Polygon([Vertex(points[i]) for i in polygon.tolist()]))
+    return CSG.fromPolygons(polygons)
+
+
+def loadMesh(key):
+    """
+    returns the mesh stored in the on-disk cache under key, or None if there is no usable entry
+    """
+    if not _useDiskCache():
+        return None
+    path = _meshPath(key)
+    if not _os.path.exists(path):
+        return None
+    try:
+        with _np.load(path) as data:
+            return arraysToMesh(data["vertices"], data["polygonIndices"], data["polygonSizes"])
+    except Exception:
+        return None  # unreadable or stale entry, it is re-meshed and overwritten
+
+
+def saveMesh(key, mesh):
+    """
+    stores a mesh in the on-disk cache, a cache directory that cannot be written to is ignored and a
+    failed write leaves no temporary file behind
+    """
+    if not _useDiskCache():
+        return
+    vertices, polygonIndices, polygonSizes = meshToArrays(mesh)
+    directory = _cacheDir()
+    try:
+        _os.makedirs(directory, exist_ok=True)
+        # write to a temporary file first so parallel jobs never read a partially written entry
+        fd, tmpPath = _tempfile.mkstemp(suffix=".npz.tmp", dir=directory)
+    except OSError:
+        return
+    try:
+        with _os.fdopen(fd, "wb") as f:
+            _np.savez(f, vertices=vertices, polygonIndices=polygonIndices, polygonSizes=polygonSizes)
+        _os.replace(tmpPath, _meshPath(key))
+    except BaseException as e:
+        try:
+            _os.remove(tmpPath)
+        except OSError:
+            pass
+        if not isinstance(e, OSError):
+            raise
+
+
+def clearMeshCache():
+    """
+    removes all meshes from the on-disk cache
+    """
+    directory = _cacheDir()
+    if not _os.path.isdir(directory):
+        return
+    for fileName in _os.listdir(directory):
+        if fileName.endswith(".npz") or fileName.endswith(".npz.tmp"):
+            _os.remove(_os.path.join(directory, fileName))
@@ -0,0 +1,55 @@
+import numpy as _np
+
+
+def formatNumber(value):
+    """
+    short text of a number for an MCNP card, integers are written without a decimal point and -0 as 0
+    """
+    value = float(value)
+    if value == 0:
+        return "0"
+    if value == round(value) and abs(value) < 1e15:
+        return str(int(round(value)))
+    return f"{value:.10g}"
+
+
+def formatCard(text, columnMax=80):
+    """
+    wraps the text of one card onto lines of at most columnMax characters, continuation lines start with 5 spaces
+    """
+    words = text.split()
+    lines = []
+    line = words[0]
+    for word in words[1:]:
+        if len(line) + 1 + len(word) > columnMax:
+            lines.append(line)
+            line = "     " + word
+        else:
+            line = line + " " + word
+    lines.append(line)
+
+    return "\n".join(lines)
+
+
+def surfaceCard(surfaceNumber, mnemonic, parameters, columnMax=80):
+    """
+    text of a surface card, e.g. surfaceCard(7, "RCC", [0, 0, 0, 0, 0, 2, 0.39])
+    """
+    return formatCard(f"{surfaceNumber} {mnemonic} " + " ".join(formatNumber(p) for p in parameters), columnMax)
+
+
+def cellCard(cellNumber, materialNumber, density, geometry, parameters=(), columnMax=80):
+    """
+    text of a cell card, geometry is the MCNP geometry text and parameters a list of keyword entries
+    such as "imp:p=1" or "u=1"
+    """
+    material = "0" if materialNumber == 0 else f"{materialNumber} {formatNumber(density)}"
+    return formatCard(f"{cellNumber} {material} {geometry} " + " ".join(parameters), columnMax)
+
+
+def transformationEntries(rotationMatrix, translationVector):
+    """
+    the 12 entries (o1 o2 o3 xx' yx' zx' xy' yy' zy' xz' yz' zz') of a TR/TRCL transformation whose auxiliary
+    axes are the columns of rotationMatrix
+    """
+    return list(_np.asarray(translationVector, dtype=float)) + list(_np.asarray(rotationMatrix, dtype=float).T.ravel())
@@ -1,50 +1,95 @@
+import logging
 import pyg4ometry
 import numpy as _np
+from pymcnp import trace as _trace
 from ..blockphantom import utils as _utils
+from ..blockphantom import cache as _cache
+from ..blockphantom import registry as _registry
+from ..blockphantom import palette as _palette
+
+_log = logging.getLogger(__name__)
 
 length = 2
 radius = 0.39
 
-class Connector(pyg4ometry.mcnp.Cell):
-    connectorCache = None
-    def __init__(self, translation=[0, 0, 0], rotationSteps=[0, 0, 0], cellNumber=None, reg=None):
-        self._mesh = None
-        super().__init__(surfaces=[], cellNumber=cellNumber, reg=reg)  # a connector is a cell
-
-        rotationMatrix = _utils.rotationStepsToMatrix(rotationSteps)
-        translationVector = _np.array(translation)
-
-        surface = pyg4ometry.mcnp.RCC(0, 0, 0, 0, 0, length, radius)
 
-        if Connector.connectorCache is None:
-            print("caching connector mesh...")
-            Connector.connectorCache = self.mesh()
-            print(" > cache complete")
+def _surface(rotationMatrix, translationVector):
+    """
+    RCC of a connector with the given transform from local space, where it starts at the origin along z
+    """
+    start = _np.asarray(translationVector, dtype=float)
+    axis = _np.asarray(rotationMatrix, dtype=float) @ [0, 0, length]
+    return pyg4ometry.mcnp.RCC(*start, *axis, radius)
 
-        self._mesh = Connector.connectorCache.clone()
 
-        surface_p = surface.transform(translation=translationVector.tolist(), rotation=rotationMatrix.tolist())
+class Connector(pyg4ometry.mcnp.Cell):
+    connectorCache = None
+    _surfacesPending = False  # True when the surface does not have the latest transform yet
 
+    @_trace.timed("construction")
+    def __init__(self, translation=[0, 0, 0], rotationSteps=[0, 0, 0], cellNumber=None, reg=None):
+        self._setUp(_utils.rotationStepsToMatrix(rotationSteps), _np.array(translation), cellNumber, reg)
+
+    @classmethod
+    @_trace.timed("construction")
+    def at(cls, position, direction, cellNumber=None, reg=None):
+        """
+        connector centred on position and along direction, e.g. seated in a hole with half its length outside,
+        made with its final surface rather than made at the origin and then transformed
+
+        :param position: centre of the connector
+        :type position: list
+        :param direction: direction of the connector axis
+        :type direction: list
+        :param cellNumber: cell number, a new one is taken from the registry if None
+        :type cellNumber: int
+        :param reg: registry the connector and its surface are added to
+        :type reg: pyg4ometry.mcnp.Registry
+        """
+        direction = _np.asarray(direction, dtype=float)
+        unit = direction / _np.linalg.norm(direction)
+        rotationMatrix = _utils.computeRotationMatrix(_np.array([0, 0, 1]), unit)
+        translationVector = _np.asarray(position, dtype=float) - unit * (length / 2)
+
+        connector = cls.__new__(cls)
+        connector._setUp(rotationMatrix, translationVector, cellNumber, reg)
+        return connector
+
+    def _setUp(self, rotationMatrix, translationVector, cellNumber, reg):
+        """
+        makes the surface, geometry and material of a connector with the given transform from local space
+        """
+        self._meshHandle = None
+
+        # the mesh is only made when requested, until then just the transform from local space is kept
+        self._meshRotation = rotationMatrix
+        self._meshTranslation = translationVector
+
+        surface_p = _surface(rotationMatrix, translationVector)
         if reg:
-            # add surfaces to registry and generate unique surfaceNumbers
-            if surface_p.surfaceNumber in reg.surfaceDict:
-                surface_p.surfaceNumber = reg.getNewSurfaceNumber()
-            if not surface_p.surfaceNumber:
-                surface_p.surfaceNumber = reg.getNewSurfaceNumber()
-            reg.surfaceDict[surface_p.surfaceNumber] = surface_p
-            self.addSurface(surface_p)  # also add to the cell's surfaceList
-        else:
-            self.surfaceList = [surface_p]  # cell's surfaceList
+            # add surface to registry and generate a unique surfaceNumber
+            with _trace.phase("registry"):
+                _registry.addSurfaces([surface_p], reg)
 
         geometry = pyg4ometry.mcnp.Complement(surface_p)
 
-        super().__init__(surfaces=[surface_p], geometry=geometry, cellNumber=self.cellNumber, reg=reg)
+        super().__init__(surfaces=[surface_p], geometry=geometry, cellNumber=cellNumber, reg=reg)  # a connector is a cell
 
-        m2 = pyg4ometry.mcnp.Material(materialNumber=2, density=2.699, reg=reg)  # aluminium
-        if reg:
-            reg.addMaterial(m2, replace=True)
-        self.addMaterial(m2)
+        _palette.assignMaterial(self, *_palette.aluminium, reg=reg)  # shared by all connectors of the registry
+
+    def _copy(self):
+        """
+        copy of the connector made without calling __init__, lists are copied so the copy can be
+        updated independently of this connector
+        """
+        connector_p = Connector.__new__(Connector)
+        for key, value in self.__dict__.items():
+            connector_p.__dict__[key] = value.copy() if isinstance(value, (list, dict)) else value
+        connector_p._meshHandle = None  # the copy may be given another transform
+
+        return connector_p
 
+    @_trace.timed("transform")
     def transform(self, translation=[0, 0, 0], rotation=[0, 0, 0], isRotationMatrix=False):
         if isRotationMatrix:
             rotationMatrix = _np.array(rotation)
@@ -52,36 +97,76 @@ class Connector(pyg4ometry.mcnp.Cell):
             rotationMatrix = _utils.rotationStepsToMatrix(rotation)
         translationVector = _np.array(translation)
 
-        if hasattr(self, 'reg'):
-            reg = self.reg
-        else:
-            reg = None
-
-        # new connector (prime)
-        connector_p = Connector(
-            cellNumber=self.cellNumber,
-        )
-
-        # transform surface
-        surfaces_p = [s.transform(rotation=rotationMatrix.tolist(), translation=translationVector.tolist()) for s in self.surfaceList]
-
-        # update the new connector
-        connector_p.surfaceList = surfaces_p
-        connector_p.geometry = pyg4ometry.mcnp.Complement(surfaces_p[0])
-
-        # update mesh
-        axis, angle = _utils.rotationMatrixToAxisAndAngle(rotationMatrix)
-        connector_p._mesh = self._mesh
-        connector_p._mesh.rotate(axis, 360-angle)
-        connector_p._mesh.translate(translationVector)
+        # new connector (prime), the surface is re-made from local space with the total transform when next requested
+        connector_p = self._copy()
+        connector_p._meshRotation = rotationMatrix @ self._meshRotation
+        connector_p._meshTranslation = rotationMatrix @ self._meshTranslation + translationVector
+        connector_p._surfacesPending = True
 
         return connector_p
 
+    @property
+    def surfaceList(self):
+        if self._surfacesPending:
+            self._applyTransform()
+        return self._surfaceList
+
+    @surfaceList.setter
+    def surfaceList(self, surfaces):
+        self._surfaceList = surfaces
+        self._surfacesPending = False
+
+    @property
+    def geometry(self):
+        if self._surfacesPending:
+            self._applyTransform()
+        return self._geometry
+
+    @geometry.setter
+    def geometry(self, geometry):
+        self._geometry = geometry
+
+    def _applyTransform(self):
+        """
+        makes the surface and geometry of the pending transform from the local space surface, keeping the
+        surface number of the surface it replaces
+        """
+        surface_p = _surface(self._meshRotation, self._meshTranslation)
+        if self._surfaceList:
+            surface_p.surfaceNumber = self._surfaceList[0].surfaceNumber
+        self._surfaceList = [surface_p]
+        self._geometry = pyg4ometry.mcnp.Complement(surface_p)
+        self._surfacesPending = False
+
+    @staticmethod
+    def _baseMesh():
+        """
+        mesh of a connector at the origin, made once per process and shared by all connectors
+        """
+        if Connector.connectorCache is None:
+            key = _cache.meshKey("connector", length=length, radius=radius)
+            Connector.connectorCache = _cache.loadMesh(key)
+            if Connector.connectorCache is None:
+                _log.info("caching connector mesh...")
+                surface = pyg4ometry.mcnp.RCC(0, 0, 0, 0, 0, length, radius)
+                Connector.connectorCache = pyg4ometry.mcnp.Cell(surfaces=[surface], geometry=surface).mesh()
+                _cache.saveMesh(key, Connector.connectorCache)
+                _log.info(" > cache complete")
+        return Connector.connectorCache
+
+    @property
+    def meshHandle(self):
+        """
+        copy-on-write handle of the mesh, sharing the base mesh of all connectors
+        """
+        if self._meshHandle is None:
+            self._meshHandle = _utils.MeshHandle(Connector._baseMesh(), self._meshRotation, self._meshTranslation)
+        return self._meshHandle
+
+    @_trace.timed("mesh")
     def mesh(self):
-        if self._mesh is not None:
-            return self._mesh
-        else:
-            surface = pyg4ometry.mcnp.RCC(0, 0, 0, 0, 0, length, radius)
-            super().__init__(surfaces=[surface], cellNumber=self.cellNumber, geometry=surface)  # a block is a cell
-            return super().mesh()
+        """
+        copy of the mesh of the connector that can be modified, meshHandle.read() gives the shared mesh without a copy
+        """
+        return self.meshHandle.read().clone()
 
@@ -0,0 +1,218 @@
+import json
+import os
+import numpy as _np
+from pymcnp.blockphantom import utils as _utils
+from pymcnp.blockphantom import block as _block
+from pymcnp.blockphantom import placement as _placement
+from pymcnp.blockphantom import registry as _registry
+from pymcnp.blockphantom import palette as _palette
+
+
+def loadPhantom(fileName):
+    """
+    reads a phantom description from a JSON, YAML (needs PyYAML) or TOML file
+
+    A phantom is a list of root blocks, each block is a table of
+        type: "full" or "half"
+        id: optional name of the block, b1, b2, ... in the order the blocks are described otherwise
+        translation, rotationSteps: placement of a root block
+        hole, parentHole: hole of this block connected to a hole of its parent block
+        connector: true to put a connector in the connection
+        rotate: rotation steps about the connection, as rotateAboutConnection(hole, rotate)
+        rotatePartial: rotation steps about the connection, as rotateAboutConnectionPartial(hole, rotatePartial)
+        children: list of blocks connected to this block
+
+    e.g. in YAML
+
+        name: legs
+        blocks:
+          - type: full
+            rotationSteps: [0, 1, 1]
+            children:
+              - {type: full, hole: 2, parentHole: 22, connector: true, rotate: [0, 1, 0]}
+    """
+    extension = os.path.splitext(fileName)[1].lower()
+    if extension == ".json":
+        with open(fileName) as f:
+            return json.load(f)
+    if extension in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError:
+            msg = f"PyYAML is needed to read {fileName}"
+            raise ImportError(msg)
+        with open(fileName) as f:
+            return yaml.safe_load(f)
+    if extension == ".toml":
+        try:
+            import tomllib
+        except ImportError:
+            import tomli as tomllib
+        with open(fileName, "rb") as f:
+            return tomllib.load(f)
+
+    msg = f"Phantom descriptions can only be .json, .yaml, .yml or .toml files, not {fileName}"
+    raise ValueError(msg)
+
+
+def _localHoles(blockType):
+    if blockType not in ("full", "half"):
+        msg = f"Block type can only be 'full' or 'half'"
+        raise TypeError(msg)
+    template = _block.Block.__new__(_block.Block)
+    template.blockType = blockType
+    template.dim = _block.fullBlockDim if blockType == "full" else _block.halfBlockDim
+    template.unit = template.dim[1] / (3 * 2)
+    return template._localHoles(D=0)
+
+
+def _checkHole(hole, holes):
+    if not (0 <= hole < len(holes)):
+        msg = f"Hole numbers must be between 0 and {len(holes) - 1}"
+        raise TypeError(msg)
+
+
+def _rotateAboutHole(R, t, position, rotationMatrix):
+    """
+    composes a rotation about a hole at position (global space) with the transform R, t
+    """
+    R = rotationMatrix @ R
+    t = rotationMatrix @ (t - position) + position
+    return R, t
+
+
+def _partialRotation(direction, rotationSteps):
+    """
+    rotation matrix of rotateAboutConnectionPartial for a hole direction
+    """
+    direction = direction / _np.linalg.norm(direction)
+    stepMagnitude = _np.linalg.norm(rotationSteps)
+    angle = _np.sign(_np.sum(rotationSteps)) * stepMagnitude * (_np.pi / 2)
+    K = _np.array([[0, -direction[2], direction[1]],
+                   [direction[2], 0, -direction[0]],
+                   [-direction[1], direction[0], 0]])
+    R = _np.eye(3) + _np.sin(angle) * K + (1 - _np.cos(angle)) * (_np.outer(direction, direction) - _np.eye(3))
+    return _utils.snapRotationMatrix(R)
+
+
+def compilePhantom(description):
+    """
+    composes the transforms of every block of a phantom description without making any blocks
+
+    :param description: phantom description (see loadPhantom), or just its list of root blocks
+    :type description: dict or list
+    :return: list of nodes with id, type, rotation, translation, parent, hole, parentHole and connector
+    """
+    roots = description["blocks"] if isinstance(description, dict) else description
+    nodes = []
+    ids = set()
+
+    def visit(entry, parent):
+        if "type" not in entry:
+            msg = f"Block {len(nodes) + 1} of the phantom description has no type"
+            raise ValueError(msg)
+        blockType = entry["type"]
+        holes = _localHoles(blockType)
+        node = {"id": entry.get("id", f"b{len(nodes) + 1}"), "type": blockType, "parent": parent,
+                "hole": entry.get("hole"), "parentHole": entry.get("parentHole"),
+                "connector": bool(entry.get("connector", False))}
+        if node["id"] in ids:
+            msg = f"Block id {node['id']} is used more than once"
+            raise ValueError(msg)
+        ids.add(node["id"])
+
+        if parent is None:
+            R = _utils.rotationStepsToMatrix(entry.get("rotationSteps", [0, 0, 0]))
+            t = _np.array(entry.get("translation", [0, 0, 0]), dtype=float)
+        else:
+            # as makeNewConnectedBlock, the new block hole is moved onto the parent hole facing it
+            if node["hole"] is None or node["parentHole"] is None:
+                msg = f"Block {node['id']} needs a hole and a parentHole to connect to its parent"
+                raise ValueError(msg)
+            parentNode = nodes[parent]
+            _checkHole(node["hole"], holes)
+            _checkHole(node["parentHole"], _localHoles(parentNode["type"]))
+            h1Position, h1Direction = _holeInGlobal(parentNode, node["parentHole"])
+            h2Position, h2Direction = holes[node["hole"]]
+            R = _utils.computeRotationMatrix(-_np.array(h2Direction), _np.array(h1Direction))
+            t = h1Position - R @ h2Position
+
+            if "rotate" in entry or "rotatePartial" in entry:
+                position, direction = R @ h2Position + t, R @ h2Direction
+                if "rotate" in entry:
+                    rotationMatrix = _utils.rotationStepsToMatrix(entry["rotate"])
+                    unit = direction / _np.linalg.norm(direction)
+                    if not (_np.allclose(rotationMatrix @ unit, unit, atol=1e-6) or
+                            _np.allclose(rotationMatrix @ unit, -unit, atol=1e-6)):
+                        msg = f"Rotation of block {node['id']} must be around the hole's axis of connection"
+                        raise ValueError(msg)
+                    R, t = _rotateAboutHole(R, t, position, rotationMatrix)
+                if "rotatePartial" in entry and _np.linalg.norm(entry["rotatePartial"]) != 0:
+                    R, t = _rotateAboutHole(R, t, position, _partialRotation(direction, entry["rotatePartial"]))
+
+        node["rotation"], node["translation"] = R, t
+        nodes.append(node)
+        index = len(nodes) - 1
+        for child in entry.get("children", []):
+            visit(child, index)
+
+    for root in roots:
+        visit(root, None)
+
+    return nodes
+
+
+def _holeInGlobal(node, hole):
+    position, direction = _localHoles(node["type"])[hole]
+    return node["rotation"] @ position + node["translation"], node["rotation"] @ direction
+
+
+def buildPhantom(description, reg=None, holeIndex=None):
+    """
+    builds a phantom from its description, every block and connector is made once in its final place
+
+    :param description: phantom description, or the name of a file that loadPhantom can read
+    :type description: dict, list or str
+    :param reg: registry the cells, surfaces and materials are added to
+    :type reg: pyg4ometry.mcnp.Registry
+    :param holeIndex: index the blocks are added to, which flags their connected and covered holes
+    :type holeIndex: HoleIndex
+    :return: dict of block id -> block and list of connectors
+    """
+    if isinstance(description, str):
+        description = loadPhantom(description)
+    nodes = compilePhantom(description)
+
+    blocks, _ = _placement.placeBlocks([n["type"] for n in nodes], [n["translation"] for n in nodes],
+                                       [n["rotation"] for n in nodes], isRotationMatrix=True)
+
+    # connected holes, and connectors seated in the parent holes
+    seated = []
+    for i, node in enumerate(nodes):
+        if node["parent"] is None:
+            continue
+        parent = blocks[node["parent"]]
+        blocks[i].holeFlags[node["hole"]] |= _block.holeConnected
+        parent.holeFlags[node["parentHole"]] |= _block.holeConnected
+        if node["connector"]:
+            blocks[i].holeFlags[node["hole"]] |= _block.holeHasConnector
+            parent.holeFlags[node["parentHole"]] |= _block.holeHasConnector
+            seated.append((node["parent"], i))
+
+    connectors = []
+    if seated:
+        holes = _np.array([blocks[p].holeInfo[nodes[i]["parentHole"]] for p, i in seated])
+        connectors = _placement.connectorsInHoles(holes[:, 0], holes[:, 1])
+
+    if reg:
+        # the copies get the materials of the registry rather than those of the templates
+        _palette.setMaterial(blocks, *_palette.polyethylene, reg=reg)
+        _palette.setMaterial(connectors, *_palette.aluminium, reg=reg)
+        # each connector follows the block it was made with, as with makeNewConnectedBlock
+        after = {i: [c] for (_, i), c in zip(seated, connectors)}
+        _registry.registerCells([cell for i, b in enumerate(blocks) for cell in [b] + after.get(i, [])], reg)
+
+    if holeIndex is not None:
+        holeIndex.addBlocks(blocks)
+
+    return {n["id"]: b for n, b in zip(nodes, blocks)}, connectors
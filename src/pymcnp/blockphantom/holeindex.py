@@ -0,0 +1,159 @@
+import numpy as _np
+from pymcnp.blockphantom import block as _block
+
+
+class HoleIndex:
+    """
+    scene-level index of placed blocks and their global hole positions and directions
+
+    Blocks are kept in a uniform grid of their centres with a cell size of the largest block diagonal, so
+    any block that can touch a new block is in one of the 27 surrounding grid cells. Placing a block only
+    compares its holes with those neighbours, which makes each placement O(1) rather than a check
+    against every block. A hole that coincides with an opposing hole on a neighbour is flagged connected
+    (on both blocks), and a hole closed by a neighbour's face without a matching hole is flagged covered.
+    The connections found are kept so they can be undone when a block is removed or replaced.
+    """
+
+    def __init__(self, tolerance=1e-3):
+        self.tolerance = tolerance
+        self.cellSize = float(_np.linalg.norm(_block.fullBlockDim))
+        self.blocks = {}  # id(block) -> block
+        self._grid = {}  # grid cell -> set of id(block)
+        self._cells = {}  # id(block) -> grid cell
+        self._links = {}  # id(block) -> {hole: set of (id(other block), other hole)} connected by the index
+
+    def _cell(self, block):
+        return tuple(_np.floor(_np.asarray(block._meshTranslation) / self.cellSize).astype(int).tolist())
+
+    def neighbours(self, block):
+        """
+        blocks in the index that are close enough to touch or overlap block
+        """
+        cx, cy, cz = self._cell(block)
+        found = []
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for dz in (-1, 0, 1):
+                    for key in self._grid.get((cx + dx, cy + dy, cz + dz), ()):
+                        if key != id(block):
+                            found.append(self.blocks[key])
+        return found
+
+    def _onBlock(self, positions, block):
+        """
+        mask of the positions that lie inside or on the faces of block
+        """
+        local = (positions - block._meshTranslation) @ block._meshRotation  # global to local space
+        return _np.all(_np.abs(local) <= _np.array(block.dim) / 2 + self.tolerance, axis=1)
+
+    def _opposingPairs(self, a, b):
+        """
+        (i, j) hole numbers where hole i of block a coincides with hole j of block b and faces it
+        """
+        distance = _np.linalg.norm(a.holePositions[:, None, :] - b.holePositions[None, :, :], axis=2)
+        facing = (a.holeDirections @ b.holeDirections.T) < 0
+        return _np.nonzero((distance <= self.tolerance) & facing)
+
+    def _cover(self, a, b, matchedA=None):
+        covered = self._onBlock(a.holePositions, b)
+        if matchedA is not None:
+            covered[matchedA] = False
+        a.holeFlags[covered] |= _block.holeCovered
+
+    def _link(self, a, b):
+        i, j = self._opposingPairs(a, b)
+        a.holeFlags[i] |= _block.holeConnected
+        b.holeFlags[j] |= _block.holeConnected
+        for holeA, holeB in zip(i.tolist(), j.tolist()):
+            self._links.setdefault(id(a), {}).setdefault(holeA, set()).add((id(b), holeB))
+            self._links.setdefault(id(b), {}).setdefault(holeB, set()).add((id(a), holeA))
+        self._cover(a, b, i)
+        self._cover(b, a, j)
+
+    def _unlink(self, block):
+        """
+        undoes the connections the index found for block, a hole of block or a neighbour is no longer
+        connected once it has no connection left
+
+        :return: list of hole numbers of block that were connected by the index
+        """
+        key = id(block)
+        holes = self._links.pop(key, {})
+        for hole, others in holes.items():
+            for otherKey, otherHole in others:
+                otherLinks = self._links[otherKey]
+                otherLinks[otherHole].discard((key, hole))
+                if not otherLinks[otherHole]:
+                    del otherLinks[otherHole]
+                    self.blocks[otherKey].holeFlags[otherHole] &= 0xFF ^ _block.holeConnected
+        holes = list(holes)
+        block.holeFlags[holes] &= 0xFF ^ _block.holeConnected
+        return holes
+
+    def addBlock(self, block):
+        """
+        adds a block to the index and updates the connected and covered flags of it and its neighbours
+
+        :return: list of neighbouring blocks
+        """
+        neighbours = self.neighbours(block)
+        for other in neighbours:
+            self._link(block, other)
+
+        key = id(block)
+        cell = self._cell(block)
+        self.blocks[key] = block
+        self._cells[key] = cell
+        self._grid.setdefault(cell, set()).add(key)
+
+        return neighbours
+
+    def addBlocks(self, blocks):
+        for block in blocks:
+            self.addBlock(block)
+
+    def removeBlock(self, block):
+        """
+        removes a block from the index, the connections the index found for it are undone on both sides and
+        the covered flags of its former neighbours are recomputed
+
+        :return: list of hole numbers of block that were connected by the index
+        """
+        key = id(block)
+        if key not in self.blocks:
+            msg = f"Block is not in the hole index"
+            raise ValueError(msg)
+        holes = self._unlink(block)
+        cell = self._cells.pop(key)
+        self._grid[cell].discard(key)
+        del self.blocks[key]
+
+        for other in self.neighbours(block):
+            other.holeFlags &= 0xFF ^ _block.holeCovered
+            for otherNeighbour in self.neighbours(other):
+                i, _ = self._opposingPairs(other, otherNeighbour)
+                self._cover(other, otherNeighbour, i)
+
+        return holes
+
+    def replaceBlock(self, oldBlock, newBlock):
+        """
+        replaces a block by its moved copy (e.g. from rotateAboutConnection), the connected and covered flags
+        the copy has from the old block's place in the index are recomputed from its new neighbours
+        """
+        if id(oldBlock) in self.blocks:
+            holes = self.removeBlock(oldBlock)
+            newBlock.holeFlags[holes] &= 0xFF ^ _block.holeConnected
+        newBlock.holeFlags &= 0xFF ^ _block.holeCovered
+        return self.addBlock(newBlock)
+
+    def coincidentHoles(self, block, hole):
+        """
+        (block, hole) pairs of the holes on other blocks at the same position as a hole of block
+        """
+        position = block.holePositions[hole]
+        found = []
+        for other in self.neighbours(block):
+            distance = _np.linalg.norm(other.holePositions - position, axis=1)
+            found.extend((other, int(j)) for j in _np.flatnonzero(distance <= self.tolerance))
+        return found
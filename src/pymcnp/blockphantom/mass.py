@@ -0,0 +1,227 @@
+import numpy as _np
+from pymcnp.blockphantom import block as _block
+from pymcnp.blockphantom import connector as _connector
+from pymcnp.blockphantom import phantom as _phantom
+from pymcnp.blockphantom.palette import cellMaterial as _cellMaterial
+
+_kindTables = None  # (volumes, centroids, inertias about the centroid) of each kind for a density of 1
+_legendreNodes = {}  # number of points -> Gauss-Legendre points and weights
+
+
+def _cylinder(radius, length, axis, centre):
+    """
+    volume, centre and second moment tensor about the local origin of a cylinder of unit density
+    """
+    volume = _np.pi * radius ** 2 * length
+    inertia = _np.full(3, volume * (3 * radius ** 2 + length ** 2) / 12)
+    inertia[axis] = volume * radius ** 2 / 2
+    return volume, centre, _np.diag(inertia) + _shift(volume, centre)
+
+
+def _shift(volume, offset):
+    """
+    parallel axis term moving a second moment tensor a distance offset from the centroid
+    """
+    return volume * (offset @ offset * _np.eye(3) - _np.outer(offset, offset))
+
+
+def _holeCylinders(blockType):
+    """
+    hole cylinders of a block type in local space as (axis, across position, start, end), holes on the same
+    line, e.g. the top and bottom tubes, are merged so where they meet is not taken away twice
+    """
+    template = _block.Block.__new__(_block.Block)
+    template.blockType = blockType
+    template.dim = _block.fullBlockDim if blockType == "full" else _block.halfBlockDim
+    template.unit = template.dim[1] / (3 * 2)
+
+    lines = {}
+    for start, vector in template._localHoles(D=0):
+        axis = int(_np.argmax(_np.abs(vector)))
+        across = tuple(_np.round(_np.delete(start, axis), 9).tolist())
+        ends = sorted([start[axis], start[axis] + vector[axis]])
+        lines.setdefault((axis, across), []).append(ends)
+
+    cylinders = []
+    for (axis, across), intervals in lines.items():
+        intervals.sort()
+        merged = [intervals[0]]
+        for low, high in intervals[1:]:
+            if low <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], high)
+            else:
+                merged.append([low, high])
+        cylinders.extend((axis, across, low, high) for low, high in merged)
+    return cylinders
+
+
+def _legendre(points):
+    """
+    Gauss-Legendre points and weights on [-1, 1], worked out once per number of points
+    """
+    if points not in _legendreNodes:
+        _legendreNodes[points] = _np.polynomial.legendre.leggauss(points)
+    return _legendreNodes[points]
+
+
+def _crossing(first, second, points=1000):
+    """
+    volume, first moment and second moment tensor about the local origin of the region where two hole
+    cylinders along different axes meet. This is numerical rather than closed form: across the third axis
+    each slice of the region is a rectangle whose moments are exact, and the slices are summed along the
+    third axis with Gauss-Legendre points clustered at the ends, where the width of the slices changes
+    fastest, which is accurate to about 1e-7 of the crossing volume.
+    """
+    (a, acrossA, lowA, highA), (b, acrossB, lowB, highB) = first, second
+    if a == b:
+        return 0.0, _np.zeros(3), _np.zeros((3, 3))
+    c = 3 - a - b
+    centreA = _np.insert(_np.array(acrossA, dtype=float), a, 0)  # points on the two axes
+    centreB = _np.insert(_np.array(acrossB, dtype=float), b, 0)
+    r = _block.holeRadius
+    wLow, wHigh = max(centreA[c], centreB[c]) - r, min(centreA[c], centreB[c]) + r
+    if wLow >= wHigh:
+        return 0.0, _np.zeros(3), _np.zeros((3, 3))
+
+    s, weights = _legendre(points)
+    w = wLow + (wHigh - wLow) * (1 - _np.cos(_np.pi * (s + 1) / 2)) / 2
+    dw = (wHigh - wLow) * _np.pi / 4 * _np.sin(_np.pi * (s + 1) / 2) * weights
+
+    # a rectangle in (a, b) at each w, cylinder A limits b and cylinder B limits a
+    halfA = _np.sqrt(_np.maximum(r ** 2 - (w - centreA[c]) ** 2, 0))
+    halfB = _np.sqrt(_np.maximum(r ** 2 - (w - centreB[c]) ** 2, 0))
+    u0, u1 = _np.maximum(centreB[a] - halfB, lowA), _np.minimum(centreB[a] + halfB, highA)
+    v0, v1 = _np.maximum(centreA[b] - halfA, lowB), _np.minimum(centreA[b] + halfA, highB)
+    lengthU, lengthV = _np.maximum(u1 - u0, 0), _np.maximum(v1 - v0, 0)
+    u1, v1 = u0 + lengthU, v0 + lengthV
+    area = lengthU * lengthV
+    sumU, sumV = lengthV * (u1 ** 2 - u0 ** 2) / 2, lengthU * (v1 ** 2 - v0 ** 2) / 2
+
+    volume = float(area @ dw)
+    firstMoment = _np.zeros(3)
+    firstMoment[[a, b, c]] = [sumU @ dw, sumV @ dw, (w * area) @ dw]
+    moments = _np.zeros((3, 3))  # integrals of x_i x_j
+    moments[a, a] = (lengthV * (u1 ** 3 - u0 ** 3) / 3) @ dw
+    moments[b, b] = (lengthU * (v1 ** 3 - v0 ** 3) / 3) @ dw
+    moments[c, c] = (w ** 2 * area) @ dw
+    moments[a, b] = moments[b, a] = ((u1 ** 2 - u0 ** 2) * (v1 ** 2 - v0 ** 2) / 4) @ dw
+    moments[a, c] = moments[c, a] = (w * sumU) @ dw
+    moments[b, c] = moments[c, b] = (w * sumV) @ dw
+
+    return volume, firstMoment, _np.trace(moments) * _np.eye(3) - moments
+
+
+def _blockTable(blockType):
+    dim = _np.array(_block.fullBlockDim if blockType == "full" else _block.halfBlockDim)
+    volume = float(_np.prod(dim))
+    secondMoment = _np.diag(volume * (dim @ dim - dim ** 2) / 12)
+    firstMoment = _np.zeros(3)
+
+    cylinders = _holeCylinders(blockType)
+    for axis, across, low, high in cylinders:
+        centre = _np.insert(_np.array(across, dtype=float), axis, (low + high) / 2)
+        holeVolume, holeCentre, holeMoment = _cylinder(_block.holeRadius, high - low, axis, centre)
+        volume -= holeVolume
+        firstMoment -= holeVolume * holeCentre
+        secondMoment -= holeMoment
+
+    # where two holes cross, e.g. the front holes of a half block reaching the tubes, was taken away twice
+    for i, first in enumerate(cylinders):
+        for second in cylinders[i + 1:]:
+            crossVolume, crossFirstMoment, crossMoment = _crossing(first, second)
+            volume += crossVolume
+            firstMoment += crossFirstMoment
+            secondMoment += crossMoment
+
+    centroid = firstMoment / volume
+    return volume, centroid, secondMoment - _shift(volume, centroid)
+
+
+def _tables():
+    global _kindTables
+    if _kindTables is None:
+        connector = _cylinder(_connector.radius, _connector.length, 2, _np.array([0, 0, _connector.length / 2]))
+        kinds = [_blockTable("full"), _blockTable("half"),
+                 (connector[0], connector[1], connector[2] - _shift(connector[0], connector[1]))]
+        _kindTables = tuple(_np.array([k[i] for k in kinds]) for i in range(3))
+    return _kindTables
+
+
+def _materialDensity(cell):
+    """
+    mass density of the material given to a cell, e.g. with setMaterial
+    """
+    (materialNumber, density), _ = _cellMaterial(cell)
+    if density is None:
+        msg = f"Material {materialNumber} of cell {cell.cellNumber} has no density to work out its mass"
+        raise ValueError(msg)
+    return abs(density)  # g/cm3 whichever sign convention the deck uses
+
+
+class MassProperties:
+    """
+    volume, mass, centre of mass and inertia tensor of every cell of a phantom and of the whole phantom,
+    worked out without meshing from the block boxes, hole cylinders and connector cylinders
+
+    :param volumes: volume of each cell (N,)
+    :param masses: mass of each cell (N,)
+    :param centres: centre of mass of each cell (N,3)
+    :param inertias: inertia tensor of each cell about its centre of mass (N,3,3)
+    :param kinds: kind number of each cell (N,), see kindNumbers
+    """
+
+    def __init__(self, volumes, masses, centres, inertias, kinds):
+        self.volumes = volumes
+        self.masses = masses
+        self.centres = centres
+        self.inertias = inertias
+        self.kinds = kinds
+
+        self.volume = float(volumes.sum())
+        self.mass = float(masses.sum())
+        self.centreOfMass = masses @ centres / self.mass if self.mass else _np.zeros(3)
+        # inertia about the centre of mass of the phantom, moving each cell's tensor with the parallel axis rule
+        offsets = centres - self.centreOfMass
+        self.inertia = (inertias.sum(axis=0) + _np.sum(masses * _np.sum(offsets ** 2, axis=1)) * _np.eye(3)
+                        - _np.einsum("n,ni,nj->ij", masses, offsets, offsets))
+
+    @property
+    def blockMass(self):
+        """
+        total mass of the blocks
+        """
+        return float(self.masses[self.kinds != _phantom.kindNumbers["connector"]].sum())
+
+    @property
+    def connectorMass(self):
+        """
+        total mass of the connectors
+        """
+        return float(self.masses[self.kinds == _phantom.kindNumbers["connector"]].sum())
+
+
+def massProperties(cells):
+    """
+    volumes, masses, centres of mass and inertia tensors of blocks and connectors without meshing. The
+    properties of each kind in local space are worked out once (a box less its hole cylinders, a connector
+    cylinder) and every cell is a rotation and translation of one of them. A connector sits in the holes of
+    the blocks it joins, which are already taken out of the blocks, so nothing is counted twice. Each cell
+    has the density of the material assigned to it, e.g. with setMaterial, and a material without a density
+    is an error.
+
+    :param cells: phantom, or blocks and connectors
+    :type cells: Phantom or list
+    :return: MassProperties
+    """
+    phantom = cells if isinstance(cells, _phantom.Phantom) else _phantom.Phantom(cells)
+    kinds = phantom.kinds.astype(_np.intp)
+    rotations, translations = phantom.rotations, phantom.translations
+    volumes, centroids, inertias = _tables()
+
+    densities = _np.array([_materialDensity(cell) for cell in phantom.cells], dtype=float).reshape(-1)
+    cellVolumes = volumes[kinds]
+    masses = densities * cellVolumes
+    centres = _np.einsum("nij,nj->ni", rotations, centroids[kinds]) + translations
+    cellInertias = densities[:, None, None] * _np.einsum("nij,njk,nlk->nil", rotations, inertias[kinds], rotations)
+
+    return MassProperties(cellVolumes, masses, centres, cellInertias, phantom.kinds.copy())
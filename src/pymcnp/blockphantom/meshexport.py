@@ -0,0 +1,302 @@
+import os as _os
+import numpy as _np
+from pymcnp import trace as _trace
+from pymcnp.blockphantom import block as _block
+from pymcnp.blockphantom import connector as _connector
+from pymcnp.blockphantom import cache as _cache
+
+_baseArrays = {}  # kind -> (vertices, polygonIndices, reversedPolygonIndices, polygonSizes) of the local space mesh
+
+
+class CellMesh:
+    """
+    mesh of one cell as arrays, the vertices are a view into the vertex buffer of all exported cells
+
+    :param cell: block or connector the mesh is of
+    :param vertices: (N,3) vertices
+    :param polygonIndices: flattened vertex indices of the polygons
+    :param polygonSizes: number of vertices of each polygon
+    """
+    __slots__ = ("cell", "vertices", "polygonIndices", "polygonSizes")
+
+    def __init__(self, cell, vertices, polygonIndices, polygonSizes):
+        self.cell = cell
+        self.vertices = vertices
+        self.polygonIndices = polygonIndices
+        self.polygonSizes = polygonSizes
+
+    def toMesh(self):
+        """
+        mesh of the meshing backend, e.g. for VtkViewer.addMeshSimple
+        """
+        return _cache.arraysToMesh(self.vertices, self.polygonIndices, self.polygonSizes)
+
+    def toPolyData(self):
+        return polyData(self.vertices, self.polygonIndices, self.polygonSizes)
+
+
+def polyData(vertices, polygonIndices, polygonSizes):
+    """
+    vtkPolyData of a mesh given as arrays, built from the arrays without a loop over points or polygons
+    """
+    import vtk as _vtk
+    from vtk.util import numpy_support as _numpy_support
+
+    points = _vtk.vtkPoints()
+    points.SetData(_numpy_support.numpy_to_vtk(_np.ascontiguousarray(vertices, dtype=float), deep=True))
+    offsets = _np.concatenate([[0], _np.cumsum(polygonSizes)]).astype(_np.int64)
+    polygons = _vtk.vtkCellArray()
+    polygons.SetData(_numpy_support.numpy_to_vtk(offsets, deep=True, array_type=_vtk.VTK_ID_TYPE),
+                     _numpy_support.numpy_to_vtk(_np.asarray(polygonIndices, dtype=_np.int64), deep=True,
+                                                 array_type=_vtk.VTK_ID_TYPE))
+    meshPolyData = _vtk.vtkPolyData()
+    meshPolyData.SetPoints(points)
+    meshPolyData.SetPolys(polygons)
+
+    return meshPolyData
+
+
+def addToViewer(viewer, meshes, colour=(0.8, 0.8, 0.8)):
+    """
+    adds exported cell meshes to a pyg4ometry VtkViewer as one actor, made from a single polydata of the
+    merged vertex buffer rather than a polydata and actor per cell
+
+    :return: the actor
+    """
+    import vtk as _vtk
+
+    vertices, polygonIndices, polygonSizes, _ = mergeMeshes(meshes)
+    mapper = _vtk.vtkPolyDataMapper()
+    mapper.SetInputData(polyData(vertices, polygonIndices, polygonSizes))
+    actor = _vtk.vtkActor()
+    actor.SetMapper(mapper)
+    actor.GetProperty().SetColor(*colour)
+    viewer.addActor(actor)
+
+    return actor
+
+
+def _cellKind(cell):
+    if isinstance(cell, _block.Block):
+        return cell.blockType
+    if isinstance(cell, _connector.Connector):
+        return "connector"
+    msg = f"Meshes can only be exported for blocks and connectors, not {type(cell).__name__}"
+    raise TypeError(msg)
+
+
+def _baseMeshArrays(kind, cell):
+    """
+    arrays of the local space mesh of a kind of cell, converted once per process
+    """
+    if kind not in _baseArrays:
+        vertices, polygonIndices, polygonSizes = _cache.meshToArrays(cell._baseMesh())
+        # the same polygons with the opposite winding, for transforms that mirror the mesh
+        ends = _np.cumsum(polygonSizes)
+        position = _np.arange(len(polygonIndices))
+        polygon = _np.repeat(_np.arange(len(polygonSizes)), polygonSizes)
+        reversedIndices = polygonIndices[(ends[polygon] - 1) - (position - (ends[polygon] - polygonSizes[polygon]))]
+        _baseArrays[kind] = (vertices, polygonIndices, reversedIndices, polygonSizes)
+    return _baseArrays[kind]
+
+
+def _transformVertices(base, kinds, rotations, translations, offsets, out):
+    """
+    writes the vertices of each cell (base vertices of its kind, rotated and translated) into out, all the
+    cells of a kind at once
+    """
+    kinds = _np.array(kinds)
+    for kind, vertices in base.items():
+        cells = _np.flatnonzero(kinds == kind)
+        if not len(cells):
+            continue
+        transformed = _np.einsum("nij,vj->nvi", rotations[cells], vertices) + translations[cells, None, :]
+        rows = offsets[cells, None] + _np.arange(len(vertices))
+        out[rows.ravel()] = transformed.reshape(-1, 3)
+
+
+@_trace.timed("mesh")
+def exportMeshes(cells):
+    """
+    meshes of many blocks and connectors as arrays. Every cell is a rigid transform of one of three local
+    space meshes (full block, half block, connector), so only those are meshed, and the vertices of all
+    cells are written into one buffer with one transform per kind of cell.
+
+    :param cells: blocks and connectors
+    :type cells: list
+    :return: list of CellMesh
+    """
+    cells = list(cells)
+    kinds = [_cellKind(c) for c in cells]
+    arrays = {}
+    for kind, cell in zip(kinds, cells):
+        if kind not in arrays:
+            arrays[kind] = _baseMeshArrays(kind, cell)
+    base = {kind: a[0] for kind, a in arrays.items()}
+
+    rotations = _np.array([_np.asarray(c._meshRotation, dtype=float) for c in cells]).reshape(-1, 3, 3)
+    translations = _np.array([_np.asarray(c._meshTranslation, dtype=float) for c in cells]).reshape(-1, 3)
+    sizes = _np.array([len(base[k]) for k in kinds], dtype=_np.int64)
+    offsets = _np.concatenate([[0], _np.cumsum(sizes)[:-1]]).astype(_np.int64)
+    vertices = _np.empty((int(sizes.sum()), 3))
+    _transformVertices(base, kinds, rotations, translations, offsets, vertices)
+
+    mirrored = _np.linalg.det(rotations) < 0
+    meshes = []
+    for cell, kind, offset, size, mirror in zip(cells, kinds, offsets, sizes, mirrored):
+        _, polygonIndices, reversedIndices, polygonSizes = arrays[kind]
+        meshes.append(CellMesh(cell, vertices[offset:offset + size],
+                               reversedIndices if mirror else polygonIndices, polygonSizes))
+
+    return meshes
+
+
+def mergeMeshes(meshes):
+    """
+    concatenates cell meshes into one mesh
+
+    :return: vertices (N,3), flattened polygon vertex indices, polygon sizes and the index of the cell mesh
+             each polygon comes from
+    """
+    meshes = list(meshes)
+    vertexCounts = _np.array([len(m.vertices) for m in meshes], dtype=_np.int64)
+    vertexOffsets = _np.concatenate([[0], _np.cumsum(vertexCounts)[:-1]]).astype(_np.int64)
+    vertices = _np.concatenate([m.vertices for m in meshes]) if meshes else _np.zeros((0, 3))
+    polygonIndices = _np.concatenate([m.polygonIndices + o for m, o in zip(meshes, vertexOffsets)]) \
+        if meshes else _np.zeros(0, dtype=_np.int64)
+    polygonSizes = _np.concatenate([m.polygonSizes for m in meshes]) if meshes else _np.zeros(0, dtype=_np.int64)
+    cellIds = _np.repeat(_np.arange(len(meshes)), [len(m.polygonSizes) for m in meshes])
+
+    return vertices, polygonIndices, polygonSizes, cellIds
+
+
+def triangulate(polygonIndices, polygonSizes):
+    """
+    (T,3) vertex indices of the fan triangulation of the polygons and the polygon of each triangle
+    """
+    polygonSizes = _np.asarray(polygonSizes, dtype=_np.int64)
+    counts = _np.maximum(polygonSizes - 2, 0)
+    starts = _np.concatenate([[0], _np.cumsum(polygonSizes)[:-1]]).astype(_np.int64)
+    polygon = _np.repeat(_np.arange(len(polygonSizes)), counts)
+    j = _np.arange(counts.sum()) - _np.repeat(_np.cumsum(counts) - counts, counts) + 1
+    first = starts[polygon]
+    triangles = _np.stack([polygonIndices[first], polygonIndices[first + j], polygonIndices[first + j + 1]], axis=1)
+
+    return triangles, polygon
+
+
+def writeSTL(fileName, vertices, polygonIndices, polygonSizes, name="pymcnp"):
+    """
+    writes a mesh as a binary STL file
+    """
+    triangles, _ = triangulate(polygonIndices, polygonSizes)
+    corners = vertices[triangles]  # (T,3,3)
+    normals = _np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    lengths = _np.linalg.norm(normals, axis=1)
+    normals[lengths > 0] /= lengths[lengths > 0, None]
+
+    records = _np.zeros(len(triangles), dtype=[("normal", "<f4", 3), ("corners", "<f4", (3, 3)),
+                                                ("attribute", "<u2")])
+    records["normal"] = normals
+    records["corners"] = corners
+    with open(fileName, "wb") as f:
+        f.write(name.encode()[:80].ljust(80, b" "))
+        f.write(_np.uint32(len(records)).tobytes())
+        records.tofile(f)
+
+
+def writePLY(fileName, vertices, polygonIndices, polygonSizes):
+    """
+    writes a mesh of triangles as a binary PLY file
+    """
+    triangles, _ = triangulate(polygonIndices, polygonSizes)
+    faces = _np.zeros(len(triangles), dtype=[("count", "u1"), ("indices", "<i4", 3)])
+    faces["count"] = 3
+    faces["indices"] = triangles
+    header = ("ply\nformat binary_little_endian 1.0\n"
+              f"element vertex {len(vertices)}\nproperty double x\nproperty double y\nproperty double z\n"
+              f"element face {len(faces)}\nproperty list uchar int vertex_indices\nend_header\n")
+    with open(fileName, "wb") as f:
+        f.write(header.encode())
+        _np.ascontiguousarray(vertices, dtype="<f8").tofile(f)
+        faces.tofile(f)
+
+
+def writeVTK(fileName, vertices, polygonIndices, polygonSizes, cellIds=None):
+    """
+    writes a mesh as a binary legacy VTK polydata file, with the cell index of each polygon if given
+    """
+    polygonSizes = _np.asarray(polygonSizes, dtype=_np.int64)
+    starts = _np.concatenate([[0], _np.cumsum(polygonSizes)[:-1]]).astype(_np.int64)
+    polygons = _np.insert(_np.asarray(polygonIndices, dtype=_np.int64), starts, polygonSizes)  # size, indices, ...
+    with open(fileName, "wb") as f:
+        f.write(b"# vtk DataFile Version 3.0\npymcnp\nBINARY\nDATASET POLYDATA\n")
+        f.write(f"POINTS {len(vertices)} double\n".encode())
+        _np.ascontiguousarray(vertices, dtype=">f8").tofile(f)
+        f.write(f"\nPOLYGONS {len(polygonSizes)} {len(polygons)}\n".encode())
+        polygons.astype(">i4").tofile(f)
+        if cellIds is not None:
+            f.write(f"\nCELL_DATA {len(polygonSizes)}\nSCALARS cell int 1\nLOOKUP_TABLE default\n".encode())
+            _np.asarray(cellIds).astype(">i4").tofile(f)
+        f.write(b"\n")
+
+
+def exportAssembly(fileName, cells):
+    """
+    writes the meshes of all blocks and connectors merged into one .vtk, .stl or .ply file, the
+    VTK file has the index of the cell of each polygon as cell data
+    """
+    extension = _os.path.splitext(fileName)[1].lower()
+    if extension not in (".vtk", ".stl", ".ply"):
+        msg = f"Assemblies can only be exported to .vtk, .stl or .ply files, not {fileName}"
+        raise ValueError(msg)
+    vertices, polygonIndices, polygonSizes, cellIds = mergeMeshes(exportMeshes(cells))
+    if extension == ".vtk":
+        writeVTK(fileName, vertices, polygonIndices, polygonSizes, cellIds)
+    elif extension == ".stl":
+        writeSTL(fileName, vertices, polygonIndices, polygonSizes)
+    else:
+        writePLY(fileName, vertices, polygonIndices, polygonSizes)
+
+
+def writeInstances(fileName, cells):
+    """
+    writes an instanced representation of an assembly to a .npz file, the local space mesh of each kind
+    of cell once and the kind, rotation and translation of every cell
+    """
+    cells = list(cells)
+    kinds = [_cellKind(c) for c in cells]
+    arrays = {}
+    for kind, cell in zip(kinds, cells):
+        if kind not in arrays:
+            vertices, polygonIndices, _, polygonSizes = _baseMeshArrays(kind, cell)
+            arrays[f"{kind}Vertices"] = vertices
+            arrays[f"{kind}PolygonIndices"] = polygonIndices
+            arrays[f"{kind}PolygonSizes"] = polygonSizes
+    _np.savez(fileName, kinds=_np.array(kinds),
+              rotations=_np.array([_np.asarray(c._meshRotation, dtype=float) for c in cells]).reshape(-1, 3, 3),
+              translations=_np.array([_np.asarray(c._meshTranslation, dtype=float) for c in cells]).reshape(-1, 3),
+              **arrays)
+
+
+def readInstances(fileName):
+    """
+    reads a file written by writeInstances and returns a merged mesh as mergeMeshes does
+    """
+    with _np.load(fileName) as data:
+        kinds = data["kinds"].tolist()
+        rotations, translations = data["rotations"], data["translations"]
+        base = {k: (data[f"{k}Vertices"], data[f"{k}PolygonIndices"], data[f"{k}PolygonSizes"]) for k in set(kinds)}
+
+    vertices, polygonIndices, polygonSizes, offset = [], [], [], 0
+    for kind, R, t in zip(kinds, rotations, translations):
+        v, i, s = base[kind]
+        vertices.append(v @ R.T + t)
+        if _np.linalg.det(R) < 0:
+            i = _np.concatenate([p[::-1] for p in _np.split(i, _np.cumsum(s)[:-1])])
+        polygonIndices.append(i + offset)
+        polygonSizes.append(s)
+        offset += len(v)
+    cellIds = _np.repeat(_np.arange(len(kinds)), [len(s) for s in polygonSizes])
+
+    return (_np.concatenate(vertices), _np.concatenate(polygonIndices), _np.concatenate(polygonSizes), cellIds)
@@ -0,0 +1,119 @@
+import numpy as _np
+from pymcnp.blockphantom import block as _block
+from pymcnp.blockphantom import connector as _connector
+
+
+def orientedBoxes(cells):
+    """
+    oriented bounding boxes of blocks and connectors as arrays of centres (N,3), axes (N,3,3, axes as columns)
+    and half extents (N,3)
+    """
+    centres = _np.zeros((len(cells), 3))
+    axes = _np.zeros((len(cells), 3, 3))
+    halfExtents = _np.zeros((len(cells), 3))
+    for i, cell in enumerate(cells):
+        if isinstance(cell, _block.Block):
+            centres[i] = cell._meshTranslation
+            halfExtents[i] = _np.array(cell.dim) / 2
+        elif isinstance(cell, _connector.Connector):
+            centres[i] = cell._meshRotation @ [0, 0, _connector.length / 2] + cell._meshTranslation
+            halfExtents[i] = [_connector.radius, _connector.radius, _connector.length / 2]
+        else:
+            msg = f"Overlaps can only be checked for blocks and connectors, not {type(cell).__name__}"
+            raise TypeError(msg)
+        axes[i] = cell._meshRotation
+
+    return centres, axes, halfExtents
+
+
+def _sweepPairs(lower, upper, tolerance):
+    """
+    candidate pairs (i, j) whose axis-aligned boxes overlap, from a sort and sweep along x
+    """
+    n = len(lower)
+    order = _np.argsort(lower[:, 0], kind="stable")
+    lowerX = lower[order, 0]
+    end = _np.searchsorted(lowerX, upper[order, 0] - tolerance, side="left")
+    counts = _np.maximum(end - _np.arange(n) - 1, 0)
+    first = _np.repeat(_np.arange(n), counts)
+    offsets = _np.arange(counts.sum()) - _np.repeat(_np.cumsum(counts) - counts, counts)
+    second = first + 1 + offsets
+    i, j = order[first], order[second]
+
+    # keep pairs that also overlap in y and z
+    keep = _np.all((lower[j, 1:] < upper[i, 1:] - tolerance) & (lower[i, 1:] < upper[j, 1:] - tolerance), axis=1)
+    return i[keep], j[keep]
+
+
+def _boxesOverlap(cA, RA, hA, cB, RB, hB, tolerance):
+    """
+    separating axis test of M pairs of oriented boxes, boxes that only touch do not overlap
+    """
+    R = _np.einsum("mki,mkj->mij", RA, RB)  # B axes in A space
+    t = _np.einsum("mki,mk->mi", RA, cB - cA)  # B centre in A space
+    absR = _np.abs(R) + 1e-12
+    separated = _np.zeros(len(cA), dtype=bool)
+
+    # axes of A and of B
+    separated |= _np.any(_np.abs(t) >= hA + _np.einsum("mij,mj->mi", absR, hB) - tolerance, axis=1)
+    tB = _np.einsum("mij,mi->mj", R, t)
+    separated |= _np.any(_np.abs(tB) >= hB + _np.einsum("mij,mi->mj", absR, hA) - tolerance, axis=1)
+
+    # cross products of an axis of A with an axis of B
+    for i in range(3):
+        i1, i2 = (i + 1) % 3, (i + 2) % 3
+        for j in range(3):
+            j1, j2 = (j + 1) % 3, (j + 2) % 3
+            distance = _np.abs(t[:, i2] * R[:, i1, j] - t[:, i1] * R[:, i2, j])
+            radius = (hA[:, i1] * absR[:, i2, j] + hA[:, i2] * absR[:, i1, j]
+                      + hB[:, j1] * absR[:, i, j2] + hB[:, j2] * absR[:, i, j1])
+            length = _np.sqrt(_np.maximum(1 - R[:, i, j] ** 2, 0))  # parallel axes give no separating axis
+            separated |= (length > 1e-6) & (distance >= radius - tolerance * length)
+
+    return ~separated
+
+
+def _connectorInHole(block, connector, tolerance):
+    """
+    True if the connector sits in one of the holes of the block (centred on the hole entrance along its axis)
+    """
+    axis = connector._meshRotation @ [0, 0, 1]
+    centre = connector._meshRotation @ [0, 0, _connector.length / 2] + connector._meshTranslation
+    atHole = _np.linalg.norm(block.holePositions - centre, axis=1) <= tolerance
+    directions = block.holeDirections / _np.linalg.norm(block.holeDirections, axis=1)[:, None]
+    alongHole = _np.abs(_np.abs(directions @ axis) - 1) <= 1e-6
+    return bool(_np.any(atHole & alongHole))
+
+
+def findOverlaps(cells, tolerance=1e-6):
+    """
+    finds the pairs of blocks and connectors that overlap, using a sort and sweep of their axis-aligned
+    bounds followed by a vectorized separating axis test of their oriented boxes. Connectors sitting in a
+    block hole and cells that only touch are not reported.
+
+    :param cells: blocks and connectors of an assembly
+    :type cells: list
+    :param tolerance: penetration depth below which cells are treated as touching
+    :type tolerance: float
+    :return: list of (cellA, cellB) pairs
+    """
+    cells = list(cells)
+    if len(cells) < 2:
+        return []
+
+    centres, axes, halfExtents = orientedBoxes(cells)
+    extents = _np.einsum("nij,nj->ni", _np.abs(axes), halfExtents)
+    i, j = _sweepPairs(centres - extents, centres + extents, tolerance)
+
+    overlapping = _boxesOverlap(centres[i], axes[i], halfExtents[i], centres[j], axes[j], halfExtents[j], tolerance)
+    overlaps = []
+    for a, b in zip(i[overlapping].tolist(), j[overlapping].tolist()):
+        cellA, cellB = cells[a], cells[b]
+        if isinstance(cellA, _connector.Connector) and isinstance(cellB, _block.Block):
+            cellA, cellB = cellB, cellA
+        if isinstance(cellA, _block.Block) and isinstance(cellB, _connector.Connector):
+            if _connectorInHole(cellA, cellB, max(tolerance, 1e-6)):
+                continue
+        overlaps.append((cellA, cellB))
+
+    return overlaps
@@ -0,0 +1,120 @@
+import pyg4ometry
+
+polyethylene = (1, -0.9016)  # material number and density of the blocks
+aluminium = (2, 2.699)  # material number and density of the connectors
+air = (3, -0.001225)  # material number and density of the world
+
+_palettes = {}  # palettes of cells made without a registry, keyed by None
+
+
+class Palette:
+    """
+    materials and importances of one registry, each made and added to the registry once and then shared
+    by every cell that uses it
+    """
+
+    def __init__(self, reg=None):
+        self.reg = reg
+        self.materials = {}  # (materialNumber, density) -> Material
+        self.importances = {}  # (particle, value) -> IMP
+
+    def material(self, materialNumber, density=None):
+        key = (materialNumber, density)
+        if key not in self.materials:
+            if density is None:
+                m = pyg4ometry.mcnp.Material(materialNumber, reg=self.reg)
+            else:
+                m = pyg4ometry.mcnp.Material(materialNumber=materialNumber, density=density, reg=self.reg)
+            if self.reg:
+                self.reg.addMaterial(m, replace=True)
+            self.materials[key] = m
+        return self.materials[key]
+
+    def importance(self, particle="p", value=1):
+        key = (particle, value)
+        if key not in self.importances:
+            self.importances[key] = pyg4ometry.mcnp.IMP(particle, value)
+        return self.importances[key]
+
+
+def palette(reg=None):
+    """
+    palette of a registry, made on first use and kept with the registry
+    """
+    if reg is None:
+        if None not in _palettes:
+            _palettes[None] = Palette()
+        return _palettes[None]
+    shared = getattr(reg, "_pymcnpPalette", None)
+    if shared is None:
+        shared = Palette(reg)
+        reg._pymcnpPalette = shared
+    return shared
+
+
+def assignMaterial(cell, materialNumber, density=None, reg=None):
+    """
+    gives a cell the shared material of the registry and records the material, its number and density on
+    the cell, so they can be read back with cellMaterial without depending on how the cell keeps them
+    """
+    material = palette(reg).material(materialNumber, density)
+    cell.addMaterial(material)
+    cell._pymcnpMaterial = ((materialNumber, density), material)
+
+
+def assignImportance(cell, value=1, particle="p", reg=None):
+    """
+    gives a cell the shared importance of the registry and records it on the cell for cellImportance
+    """
+    importance = palette(reg).importance(particle, value)
+    cell.addImportance(importance)
+    cell._pymcnpImportance = importance
+
+
+def cellMaterial(cell):
+    """
+    material last given to a cell with assignMaterial or setMaterial
+
+    :return: (material number, density) and the material
+    """
+    material = getattr(cell, "_pymcnpMaterial", None)
+    if material is None:
+        msg = f"Cell {getattr(cell, 'cellNumber', None)} has no material given by pymcnp"
+        raise ValueError(msg)
+    return material
+
+
+def cellImportance(cell):
+    """
+    importance last given to a cell with assignImportance or setImportance
+    """
+    importance = getattr(cell, "_pymcnpImportance", None)
+    if importance is None:
+        msg = f"Cell {getattr(cell, 'cellNumber', None)} has no importance given by pymcnp"
+        raise ValueError(msg)
+    return importance
+
+
+def setImportance(cells, value=1, particle="p", reg=None):
+    """
+    gives every cell the same shared importance object
+
+    :param cells: cells
+    :type cells: list
+    :param value: importance
+    :type value: float
+    :param particle: particle designator, e.g. "p" or "n"
+    :type particle: str
+    :param reg: registry the cells belong to
+    :type reg: pyg4ometry.mcnp.Registry
+    """
+    for cell in cells:
+        assignImportance(cell, value, particle, reg)
+
+
+def setMaterial(cells, materialNumber, density=None, reg=None):
+    """
+    gives every cell the same shared material object
+    """
+    for cell in cells:
+        assignMaterial(cell, materialNumber, density, reg)
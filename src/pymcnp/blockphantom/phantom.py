@@ -0,0 +1,192 @@
+import pyg4ometry
+import numpy as _np
+from pymcnp.blockphantom import block as _block
+from pymcnp.blockphantom import connector as _connector
+from pymcnp.blockphantom import world as _world
+from pymcnp.blockphantom.palette import assignMaterial as _assignMaterial, setImportance as _setImportance, air as _air
+
+kindNumbers = {"full": 0, "half": 1, "connector": 2}  # kind of each cell as kept in Phantom.kinds
+
+# local space centre and half extents of each kind, indexed by kind number
+_localCentres = _np.array([[0, 0, 0], [0, 0, 0], [0, 0, _connector.length / 2]], dtype=float)
+_halfExtents = _np.array([_np.array(_block.fullBlockDim) / 2, _np.array(_block.halfBlockDim) / 2,
+                          [_connector.radius, _connector.radius, _connector.length / 2]], dtype=float)
+_corners = _np.array([[x, y, z] for x in (-1, 1) for y in (-1, 1) for z in (-1, 1)], dtype=float)
+
+
+def _kindNumber(cell):
+    if isinstance(cell, _block.Block):
+        return kindNumbers[cell.blockType]
+    if isinstance(cell, _connector.Connector):
+        return kindNumbers["connector"]
+    msg = f"A phantom can only hold blocks and connectors, not {type(cell).__name__}"
+    raise TypeError(msg)
+
+
+class Phantom:
+    """
+    blocks and connectors of one phantom, with their kinds and transforms from local space kept in
+    contiguous arrays so operations over the whole phantom can be done at once. The world and void cells
+    around the phantom are made in one call, inside a sphere fitted to the cells.
+
+    :param cells: blocks and connectors of the phantom
+    :type cells: list
+    :param reg: registry of the cells, the world and void cells are added to it
+    :type reg: pyg4ometry.mcnp.Registry
+    """
+
+    def __init__(self, cells=(), reg=None):
+        self.reg = reg
+        self.cells = []
+        self._index = {}  # id(cell) -> row of the cell in the arrays
+        self._kinds = _np.zeros(0, dtype=_np.int8)
+        self._rotations = _np.zeros((0, 3, 3))
+        self._translations = _np.zeros((0, 3))
+        self.world = None
+        self.void = None
+        self.worldSurface = None
+        self.add(cells)
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __iter__(self):
+        return iter(self.cells)
+
+    def __contains__(self, cell):
+        return id(cell) in self._index
+
+    @property
+    def kinds(self):
+        return self._kinds[:len(self.cells)]
+
+    @property
+    def rotations(self):
+        return self._rotations[:len(self.cells)]
+
+    @property
+    def translations(self):
+        return self._translations[:len(self.cells)]
+
+    @property
+    def blocks(self):
+        return [self.cells[i] for i in _np.flatnonzero(self.kinds != kindNumbers["connector"])]
+
+    @property
+    def connectors(self):
+        return [self.cells[i] for i in _np.flatnonzero(self.kinds == kindNumbers["connector"])]
+
+    def _reserve(self, count):
+        """
+        grows the arrays so they have room for count cells, doubling so adding one cell at a time is O(1)
+        """
+        capacity = len(self._kinds)
+        if count <= capacity:
+            return
+        capacity = max(count, 2 * capacity, 16)
+        n = len(self.cells)
+        kinds = _np.zeros(capacity, dtype=_np.int8)
+        rotations = _np.zeros((capacity, 3, 3))
+        translations = _np.zeros((capacity, 3))
+        kinds[:n], rotations[:n], translations[:n] = self.kinds, self.rotations, self.translations
+        self._kinds, self._rotations, self._translations = kinds, rotations, translations
+
+    def _set(self, i, cell):
+        self._kinds[i] = _kindNumber(cell)
+        self._rotations[i] = cell._meshRotation
+        self._translations[i] = cell._meshTranslation
+
+    def add(self, cells):
+        """
+        adds blocks and connectors to the phantom
+        """
+        if isinstance(cells, (_block.Block, _connector.Connector)):
+            cells = [cells]
+        cells = [c for c in cells if id(c) not in self._index]
+        self._reserve(len(self.cells) + len(cells))
+        for cell in cells:
+            i = len(self.cells)
+            self._set(i, cell)
+            self._index[id(cell)] = i
+            self.cells.append(cell)
+
+    def replace(self, oldCell, newCell):
+        """
+        puts newCell in the place of oldCell, e.g. the block returned by oldCell.rotateAboutConnection
+        """
+        i = self._index.pop(id(oldCell), None)
+        if i is None:
+            msg = f"Cell {oldCell.cellNumber} is not in the phantom"
+            raise ValueError(msg)
+        self._set(i, newCell)
+        self._index[id(newCell)] = i
+        self.cells[i] = newCell
+
+    def orientedBoxes(self):
+        """
+        oriented bounding boxes of the cells as arrays of centres (N,3), axes (N,3,3, axes as columns) and
+        half extents (N,3)
+        """
+        kinds = self.kinds
+        centres = _np.einsum("nij,nj->ni", self.rotations, _localCentres[kinds]) + self.translations
+        return centres, self.rotations.copy(), _halfExtents[kinds]
+
+    def bounds(self):
+        """
+        axis-aligned lower and upper bounds (N,3) of the cells
+        """
+        centres, axes, halfExtents = self.orientedBoxes()
+        extents = _np.einsum("nij,nj->ni", _np.abs(axes), halfExtents)
+        return centres - extents, centres + extents
+
+    def boundingSphere(self, margin=1.0):
+        """
+        centre and radius of a sphere around every corner of the cells' bounding boxes, centred on the
+        middle of the phantom rather than the origin
+
+        :param margin: gap between the cells and the sphere
+        :type margin: float
+        """
+        if not self.cells:
+            msg = f"A bounding sphere needs at least one cell"
+            raise ValueError(msg)
+        centres, axes, halfExtents = self.orientedBoxes()
+        offsets = _corners[None, :, :] * halfExtents[:, None, :]  # (N,8,3) corners in local space
+        corners = (centres[:, None, :] + _np.einsum("nij,nkj->nki", axes, offsets)).reshape(-1, 3)
+        centre = (corners.min(axis=0) + corners.max(axis=0)) / 2
+        radius = _np.sqrt(_np.max(_np.sum((corners - centre) ** 2, axis=1))) + margin
+
+        return centre, float(radius)
+
+    def makeWorld(self, margin=1.0, particle="p", material=_air):
+        """
+        makes the world cell, inside the bounding sphere and outside every cell, and the void cell outside
+        the sphere, and sets the importance of the phantom cells and the world to 1 and the void to 0
+
+        :param margin: gap between the cells and the sphere
+        :type margin: float
+        :param particle: particle of the importances
+        :type particle: str
+        :param material: material number and density of the world
+        :type material: list
+        :return: world cell and void cell
+        """
+        centre, radius = self.boundingSphere(margin)
+        reg = self.reg
+        self.worldSurface = pyg4ometry.mcnp.S(*centre.tolist(), radius, reg=reg)
+        self.world = pyg4ometry.mcnp.Cell(reg=reg)
+        self.void = pyg4ometry.mcnp.Cell(reg=reg)
+
+        for cell in self.cells:
+            self.world.addSurface(cell.geometry)
+        self.world.addSurface(self.worldSurface)
+        self.void.addSurface(self.worldSurface)
+        self.world.addGeometry(_world.worldGeometry(self.cells, self.worldSurface))
+        self.void.addGeometry(self.worldSurface)
+
+        _assignMaterial(self.world, *material, reg=reg)
+        _assignMaterial(self.void, 0, reg=reg)
+        _setImportance(self.cells + [self.world], 1, particle, reg=reg)
+        _setImportance([self.void], 0, particle, reg=reg)
+
+        return self.world, self.void
@@ -0,0 +1,192 @@
+import pyg4ometry
+import numpy as _np
+from pymcnp import trace as _trace
+from pymcnp.blockphantom import utils as _utils
+from pymcnp.blockphantom import block as _block
+from pymcnp.blockphantom import connector as _connector
+from pymcnp.blockphantom import registry as _registry
+from pymcnp.blockphantom import palette as _palette
+
+_planes = [pyg4ometry.mcnp.PX, pyg4ometry.mcnp.PY, pyg4ometry.mcnp.PZ]
+
+
+def _rotationMatrices(rotations, n, isRotationMatrix):
+    """
+    (N,3,3) rotation matrices from (N,3) integer rotation steps or (N,3,3) matrices
+    """
+    if rotations is None:
+        return _np.broadcast_to(_np.eye(3), (n, 3, 3)).copy()
+    if isRotationMatrix:
+        return _np.array(rotations, dtype=float).reshape(n, 3, 3)
+
+    steps = _np.array(rotations).reshape(n, 3)
+    if _np.all(steps == _np.round(steps)):
+        steps = steps.astype(int) % 4
+        return _utils._rotationTableFloat[_utils._stepsIndex[steps[:, 0], steps[:, 1], steps[:, 2]]]
+    return _np.array([_utils.rotationStepsToMatrix(s) for s in steps])
+
+
+def _snapRotations(R, atol=1e-6):
+    """
+    replaces the matrices that are within atol of an integer matrix by the exact matrix and returns a mask
+    of which matrices are axis-aligned (cube) rotations
+    """
+    rounded = _np.rint(R)
+    isCube = _np.all(_np.abs(R - rounded) <= atol, axis=(1, 2))
+    R = R.copy()
+    R[isCube] = rounded[isCube]
+    return R, isCube
+
+
+def alignZRotations(directions):
+    """
+    (N,3,3) rotation matrices that align +z with each of the (N,3) directions, vectorized version of
+    computeRotationMatrix([0, 0, 1], direction) (including -I for a direction along -z)
+    """
+    u = directions / _np.linalg.norm(directions, axis=1)[:, None]
+    n = len(u)
+    cross = _np.stack([-u[:, 1], u[:, 0], _np.zeros(n)], axis=1)  # z x u
+    crossNorm = _np.linalg.norm(cross, axis=1)
+    parallel = _np.isclose(crossNorm, 0)
+    k = _np.zeros_like(cross)
+    k[~parallel] = cross[~parallel] / crossNorm[~parallel, None]
+    angle = _np.arccos(_np.clip(u[:, 2], -1, 1))
+
+    K = _np.zeros((n, 3, 3))
+    K[:, 0, 1], K[:, 0, 2] = -k[:, 2], k[:, 1]
+    K[:, 1, 0], K[:, 1, 2] = k[:, 2], -k[:, 0]
+    K[:, 2, 0], K[:, 2, 1] = -k[:, 1], k[:, 0]
+    R = _np.eye(3) + _np.sin(angle)[:, None, None] * K + (1 - _np.cos(angle))[:, None, None] * (K @ K)
+    R[parallel] = _np.eye(3) * _np.sign(u[parallel, 2])[:, None, None]
+
+    return _snapRotations(R)[0]
+
+
+def connectorsInHoles(positions, directions):
+    """
+    connectors seated in holes at the (N,3) positions along the (N,3) directions, with half their length
+    outside the hole, made without the surface transforms of Connector.transform
+    """
+    positions = _np.asarray(positions, dtype=float)
+    directions = _np.asarray(directions, dtype=float)
+    template = _connector.Connector()
+    unit = directions / _np.linalg.norm(directions, axis=1)[:, None]
+    starts = positions - unit * (_connector.length / 2)
+    axes = unit * _connector.length
+    meshRotations = alignZRotations(directions)
+
+    connectors = []
+    for start, axis, meshRotation in zip(starts, axes, meshRotations):
+        connector = template._copy()
+        connector.surfaceList = [pyg4ometry.mcnp.RCC(*start, *axis, _connector.radius)]
+        connector.geometry = pyg4ometry.mcnp.Complement(connector.surfaceList[0])
+        connector._meshRotation = meshRotation
+        connector._meshTranslation = start
+        connectors.append(connector)
+
+    return connectors
+
+
+@_trace.timed("construction")
+def placeBlocks(blockTypes, translations, rotations=None, reg=None, connectorHoles=(), isRotationMatrix=False,
+                holeIndex=None):
+    """
+    places N blocks, and optionally a connector in each of connectorHoles of every block, computing the hole
+    positions, surface parameters and connector placements of all blocks in one NumPy pass and registering
+    the cells and surfaces in bulk
+
+    :param blockTypes: "full" or "half", or a list of N block types
+    :type blockTypes: str or list
+    :param translations: (N,3) block centres
+    :type translations: array_like
+    :param rotations: (N,3) 90-degree rotation steps [x, y, z], or (N,3,3) matrices if isRotationMatrix
+    :type rotations: array_like
+    :param reg: registry the cells, surfaces and materials are added to
+    :type reg: pyg4ometry.mcnp.Registry
+    :param connectorHoles: local hole numbers that get a connector on every block
+    :type connectorHoles: list
+    :param holeIndex: index the blocks are added to, which flags their connected and covered holes
+    :type holeIndex: HoleIndex
+    :return: list of N blocks and a list of N lists of connectors
+    """
+    translations = _np.array(translations, dtype=float).reshape(-1, 3)
+    n = len(translations)
+    if isinstance(blockTypes, str):
+        blockTypes = [blockTypes] * n
+    if len(blockTypes) != n:
+        msg = f"{len(blockTypes)} block types given for {n} translations"
+        raise ValueError(msg)
+    connectorHoles = list(connectorHoles)
+
+    R, isCube = _snapRotations(_rotationMatrices(rotations, n, isRotationMatrix))
+
+    blocks = [None] * n
+    connectors = [[] for _ in range(n)]
+
+    for blockType in sorted(set(blockTypes)):
+        # local space template, each block of this type is copied from it
+        template = _block.Block(blockType)
+        localHoles = template.holeInfo  # (H,2,3)
+        rccHoles = template._localHoles(D=0.01)
+        if connectorHoles and not all(0 <= h < len(localHoles) for h in connectorHoles):
+            msg = f"Hole numbers must be between 0 and {len(localHoles) - 1}"
+            raise TypeError(msg)
+
+        index = _np.array([i for i, t in enumerate(blockTypes) if t == blockType and isCube[i]], dtype=int)
+        Rt, tt = R[index], translations[index]
+
+        # holes of all blocks of this type (global space)
+        holes = _np.einsum("nij,hkj->nhki", Rt, localHoles)  # (N,H,2,3)
+        holes[:, :, 0] += tt[:, None, :]
+        rccPositions = _np.einsum("nij,hj->nhi", Rt, rccHoles[:, 0]) + tt[:, None, :]
+        rccDirections = _np.einsum("nij,hj->nhi", Rt, rccHoles[:, 1])
+
+        # box planes, a local axis is mapped onto a global axis so each pair stays a PX/PY/PZ slab
+        planeAxes = _np.argmax(_np.abs(Rt), axis=1)  # (N,3) global axis of each local axis
+        centres = _np.take_along_axis(tt, planeAxes, axis=1)
+        halfDim = _np.array(template.dim) / 2
+        lowerPlanes, upperPlanes = centres - halfDim, centres + halfDim
+
+        for j, i in enumerate(index):
+            surfaces = []
+            for a in range(3):
+                plane = _planes[planeAxes[j, a]]
+                surfaces.append(plane(lowerPlanes[j, a]))
+                surfaces.append(plane(upperPlanes[j, a]))
+            for position, direction in zip(rccPositions[j], rccDirections[j]):
+                surfaces.append(pyg4ometry.mcnp.RCC(*position, *direction, _block.holeRadius))
+
+            block = template._copy()
+            block.surfaceList = surfaces
+            block.geometry = block._makeGeometry(surfaces)
+            block._holes = holes[j]
+            block._meshRotation = Rt[j]
+            block._meshTranslation = tt[j]
+            blocks[i] = block
+
+        # blocks with arbitrary rotations are transformed one at a time
+        for i in [i for i, t in enumerate(blockTypes) if t == blockType and not isCube[i]]:
+            blocks[i] = template.transform(translation=translations[i], rotation=R[i], isRotationMatrix=True)
+
+    # connectors, the RCC is placed with half its length outside the hole
+    if connectorHoles:
+        holes = _np.array([b.holeInfo[connectorHoles] for b in blocks])  # (N,C,2,3)
+        placed = connectorsInHoles(holes[:, :, 0].reshape(-1, 3), holes[:, :, 1].reshape(-1, 3))
+
+        for k, connector in enumerate(placed):
+            i, c = divmod(k, len(connectorHoles))
+            connectors[i].append(connector)
+            blocks[i].holeFlags[connectorHoles[c]] |= _block.holeHasConnector
+
+    if reg:
+        # the copies get the materials of the registry rather than those of the templates
+        _palette.setMaterial(blocks, *_palette.polyethylene, reg=reg)
+        _palette.setMaterial([c for blockConnectors in connectors for c in blockConnectors], *_palette.aluminium,
+                             reg=reg)
+        _registry.registerCells([cell for block, blockConnectors in zip(blocks, connectors)
+                                 for cell in [block] + blockConnectors], reg)
+
+    if holeIndex is not None:
+        holeIndex.addBlocks(blocks)
+
+    return blocks, connectors
@@ -0,0 +1,204 @@
+import numpy as _np
+from pymcnp.blockphantom import block as _block
+from pymcnp.blockphantom import connector as _connector
+from pymcnp.blockphantom import phantom as _phantom
+
+# region of a point, as returned by PointQuery.locate
+regionAir = 0
+regionBlock = 1
+regionConnector = 2
+regionHole = 3  # air inside a block's hole
+
+
+def _holeGroups(blockType, cellSize=_block.holeRadius):
+    """
+    hole cylinders of a block type in local space, grouped by the axis they run along and the face they
+    start from. Each group has a raster over the plane across its axis that gives the only hole of the
+    group a point there can be in, so a point is tested against one hole per group rather than all of them.
+    """
+    template = _block.Block.__new__(_block.Block)
+    template.blockType = blockType
+    template.dim = _block.fullBlockDim if blockType == "full" else _block.halfBlockDim
+    template.unit = template.dim[1] / (3 * 2)
+    holes = template._localHoles(D=0)
+    halfDim = _np.array(template.dim) / 2
+
+    groups = []
+    axes = _np.argmax(_np.abs(holes[:, 1, :]), axis=1)
+    sides = _np.sign(holes[_np.arange(len(holes)), 0, axes])
+    for axis in range(3):
+        across = [a for a in range(3) if a != axis]
+        origin = -halfDim[across]
+        shape = _np.floor(2 * halfDim[across] / cellSize).astype(int) + 1
+        for side in (-1, 1):
+            members = _np.flatnonzero((axes == axis) & (sides == side))
+            if not len(members):
+                continue
+            starts, vectors = holes[members, 0, :], holes[members, 1, :]
+            raster = _np.full(shape, -1, dtype=_np.int16)
+            for h, centre in enumerate(starts[:, across]):
+                low = _np.floor((centre - _block.holeRadius - origin) / cellSize).astype(int)
+                high = _np.floor((centre + _block.holeRadius - origin) / cellSize).astype(int)
+                low, high = _np.clip(low, 0, shape - 1), _np.clip(high, 0, shape - 1)
+                raster[low[0]:high[0] + 1, low[1]:high[1] + 1] = h
+            groups.append((axis, across, origin, raster, starts[:, across], starts[:, axis], vectors[:, axis]))
+
+    return groups, cellSize
+
+
+def _allColumns(mask):
+    """
+    rows of an (N,3) mask that are all True, faster than all(axis=1) for three columns
+    """
+    return mask[:, 0] & mask[:, 1] & mask[:, 2]
+
+
+class PointQuery:
+    """
+    finds the block or connector each of many points is in. Cells are put in a uniform grid of voxels by
+    their bounding boxes, and the points are tested in bulk against the k-th candidate of their voxel for
+    each k in turn: inside a block's oriented box but outside its hole cylinders, or inside a connector's
+    cylinder.
+
+    :param cells: phantom, or blocks and connectors
+    :type cells: Phantom or list
+    :param voxelSize: edge length of the grid voxels, the thickness of a half block if None
+    :type voxelSize: float
+    :param chunkSize: number of points tested at once, to bound the memory used
+    :type chunkSize: int
+    """
+
+    def __init__(self, cells, voxelSize=None, chunkSize=1 << 20):
+        self.phantom = cells if isinstance(cells, _phantom.Phantom) else _phantom.Phantom(cells)
+        self.voxelSize = float(voxelSize or _block.halfBlockDim[2])
+        self.chunkSize = chunkSize
+
+        self.kinds = self.phantom.kinds.copy()
+        self.rotations = self.phantom.rotations.copy()
+        self.translations = self.phantom.translations.copy()
+        self._halfDims = _np.array([_np.array(_block.fullBlockDim) / 2, _np.array(_block.halfBlockDim) / 2])
+        self._holes = [_holeGroups("full"), _holeGroups("half")]
+        self._buildGrid()
+
+    def __getstate__(self):
+        # the arrays are all that is needed to locate points, e.g. in a worker process, not the cells
+        state = self.__dict__.copy()
+        state["phantom"] = None
+        return state
+
+    def _buildGrid(self):
+        """
+        voxel -> candidate cells, as a dense (X,Y,Z) map to rows of a (rows, K) table padded with -1
+        """
+        if not len(self.kinds):
+            self._origin, self._shape = _np.zeros(3), _np.zeros(3, dtype=int)
+            self._rows, self._table = _np.full(0, -1, dtype=_np.int32), _np.full((1, 1), -1, dtype=_np.int32)
+            return
+        lower, upper = self.phantom.bounds()
+        self._origin = lower.min(axis=0)
+        self._shape = _np.floor((upper.max(axis=0) - self._origin) / self.voxelSize).astype(int) + 1
+        first = _np.floor((lower - self._origin) / self.voxelSize).astype(int)
+        last = _np.minimum(_np.floor((upper - self._origin) / self.voxelSize).astype(int), self._shape - 1)
+
+        voxels, cells = [], []
+        for i, (f, l) in enumerate(zip(first, last)):
+            x, y, z = _np.meshgrid(*[_np.arange(f[a], l[a] + 1) for a in range(3)], indexing="ij")
+            voxels.append(_np.ravel_multi_index((x.ravel(), y.ravel(), z.ravel()), self._shape))
+            cells.append(_np.full(x.size, i))
+        voxels, cells = _np.concatenate(voxels), _np.concatenate(cells)
+
+        # candidates of each occupied voxel, in order of cell index so earlier cells are found first
+        order = _np.lexsort((cells, voxels))
+        voxels, cells = voxels[order], cells[order]
+        occupied, starts, counts = _np.unique(voxels, return_index=True, return_counts=True)
+        self._rows = _np.full(int(_np.prod(self._shape)), -1, dtype=_np.int32)
+        self._rows[occupied] = _np.arange(len(occupied), dtype=_np.int32)
+        self._table = _np.full((len(occupied), counts.max()), -1, dtype=_np.int32)
+        slots = _np.arange(len(voxels)) - _np.repeat(starts, counts)
+        self._table[_np.repeat(_np.arange(len(occupied)), counts), slots] = cells
+
+    def _voxelRows(self, points):
+        index = _np.floor((points - self._origin) / self.voxelSize).astype(_np.int64)
+        inGrid = _allColumns(index.view(_np.uint64) < self._shape.astype(_np.uint64))  # negative wraps to large
+        rows = _np.full(len(points), -1, dtype=_np.int32)
+        index = index[inGrid]
+        rows[inGrid] = self._rows[(index[:, 0] * self._shape[1] + index[:, 1]) * self._shape[2] + index[:, 2]]
+        return rows
+
+    def _inHole(self, local, blockType):
+        groups, cellSize = self._holes[blockType]
+        inHole = _np.zeros(len(local), dtype=bool)
+        for axis, across, origin, raster, centres, starts, lengths in groups:
+            ij = _np.floor((local[:, across] - origin) / cellSize).astype(_np.intp)
+            _np.clip(ij, 0, _np.array(raster.shape) - 1, out=ij)
+            h = raster[ij[:, 0], ij[:, 1]]
+            candidate = _np.flatnonzero(h >= 0)
+            h = h[candidate]
+            offset = local[candidate][:, across] - centres[h]
+            along = (local[candidate, axis] - starts[h]) / lengths[h]
+            inside = (offset[:, 0] ** 2 + offset[:, 1] ** 2 < _block.holeRadius ** 2) & (along >= 0) & (along <= 1)
+            inHole[candidate[inside]] = True
+        return inHole
+
+    def _locateChunk(self, points):
+        indices = _np.full(len(points), -1, dtype=_np.int32)
+        regions = _np.full(len(points), regionAir, dtype=_np.int8)
+        rows = self._voxelRows(points)
+        pending = _np.flatnonzero(rows >= 0)
+
+        for k in range(self._table.shape[1]):
+            if not len(pending):
+                break
+            candidates = self._table[rows[pending], k]
+            pending = pending[candidates >= 0]
+            candidates = candidates[candidates >= 0]
+
+            # points in the local space of their candidate
+            local = _np.einsum("mi,mij->mj", points[pending] - self.translations[candidates],
+                               self.rotations[candidates])
+            kinds = self.kinds[candidates]
+            found = _np.zeros(len(pending), dtype=bool)
+
+            isConnector = kinds == _phantom.kindNumbers["connector"]
+            c = local[isConnector]
+            found[isConnector] = ((c[:, 0] ** 2 + c[:, 1] ** 2 < _connector.radius ** 2) &
+                                  (c[:, 2] >= 0) & (c[:, 2] <= _connector.length))
+
+            for blockType in (_phantom.kindNumbers["full"], _phantom.kindNumbers["half"]):
+                isBlock = _np.flatnonzero(kinds == blockType)
+                inBox = _allColumns(_np.abs(local[isBlock]) <= self._halfDims[blockType])
+                isBlock = isBlock[inBox]
+                inHole = self._inHole(local[isBlock], blockType)
+                found[isBlock[~inHole]] = True
+                regions[pending[isBlock[inHole]]] = regionHole  # unless a later candidate is a connector
+
+            indices[pending[found]] = candidates[found]
+            regions[pending[found]] = _np.where(isConnector[found], regionConnector, regionBlock)
+            pending = pending[~found]
+
+        return indices, regions
+
+    def locate(self, points):
+        """
+        index into phantom.cells of the cell each point is in (-1 in air) and the region of each point,
+        regionAir, regionBlock, regionConnector or regionHole
+
+        :param points: points (N,3)
+        :type points: numpy.ndarray
+        :return: indices (N,) and regions (N,)
+        """
+        points = _np.asarray(points, dtype=float).reshape(-1, 3)
+        indices = _np.full(len(points), -1, dtype=_np.int32)
+        regions = _np.full(len(points), regionAir, dtype=_np.int8)
+        for start in range(0, len(points), self.chunkSize):
+            stop = start + self.chunkSize
+            indices[start:stop], regions[start:stop] = self._locateChunk(points[start:stop])
+        return indices, regions
+
+    def cellNumbers(self, points):
+        """
+        cell number of the cell each point is in, 0 in air
+        """
+        indices, _ = self.locate(points)
+        numbers = _np.array([c.cellNumber or 0 for c in self.phantom.cells] + [0], dtype=_np.int64)
+        return numbers[indices]
@@ -0,0 +1,164 @@
+import pyg4ometry
+from pymcnp import trace as _trace
+
+# number of facets of the macrobodies, the registry also keeps each facet as "number.facet"
+_facets = {pyg4ometry.mcnp.RCC: 3, pyg4ometry.mcnp.BOX: 6, pyg4ometry.mcnp.RPP: 6}
+
+
+class NumberAllocator:
+    """
+    hands out contiguous ranges of surface and cell numbers of a registry. The highest numbers in use are
+    found once rather than with a scan of the registry for every new number, and are only looked for
+    again if something else has added to the registry since or a reserved range is already in use, e.g.
+    when something else replaced a number with a higher one and left the number of entries the same.
+    """
+
+    def __init__(self, reg):
+        self.reg = reg
+        self._scan()
+
+    def _scan(self):
+        self._nextSurface = max((k for k in self.reg.surfaceDict if isinstance(k, int)), default=0) + 1
+        self._nextCell = max((k for k in self.reg.cellDict if isinstance(k, int)), default=0) + 1
+        self._sizes = (len(self.reg.surfaceDict), len(self.reg.cellDict))
+
+    def _check(self):
+        if self._sizes != (len(self.reg.surfaceDict), len(self.reg.cellDict)):
+            self._scan()
+
+    def _isFree(self, numbers, first, count):
+        """
+        True if none of the count numbers from first are in numbers
+        """
+        return not any(n in numbers for n in range(first, first + count))
+
+    def _inserted(self):
+        self._sizes = (len(self.reg.surfaceDict), len(self.reg.cellDict))
+
+    def reserveSurfaces(self, count):
+        """
+        first of count contiguous unused surface numbers
+        """
+        self._check()
+        if not self._isFree(self.reg.surfaceDict, self._nextSurface, count):
+            self._scan()
+        first = self._nextSurface
+        self._nextSurface += count
+        return first
+
+    def reserveCells(self, count):
+        """
+        first of count contiguous unused cell numbers
+        """
+        self._check()
+        if not self._isFree(self.reg.cellDict, self._nextCell, count):
+            self._scan()
+        first = self._nextCell
+        self._nextCell += count
+        return first
+
+
+def allocator(reg):
+    """
+    number allocator of a registry, made on first use and kept with the registry
+    """
+    numbers = getattr(reg, "_pymcnpAllocator", None)
+    if numbers is None:
+        numbers = NumberAllocator(reg)
+        reg._pymcnpAllocator = numbers
+    return numbers
+
+
+def _insertSurface(reg, surface):
+    reg.surfaceDict[surface.surfaceNumber] = surface
+    for i in range(1, _facets.get(type(surface), 0) + 1):
+        reg.surfaceDict[f"{surface.surfaceNumber}.{i}"] = surface
+
+
+def addSurfaces(surfaces, reg):
+    """
+    numbers surfaces from one reserved range and adds them to the registry
+    """
+    numbers = allocator(reg)
+    first = numbers.reserveSurfaces(len(surfaces))
+    for i, s in enumerate(surfaces):
+        s.surfaceNumber = first + i
+        _insertSurface(reg, s)
+    numbers._inserted()
+
+
+def _reinsert(surfaces, numbers, reg):
+    """
+    puts the numbered surfaces back in the registry under their numbers, moving the next free number past
+    them, and returns the unnumbered ones
+    """
+    unnumbered = []
+    for s in surfaces:
+        if s.surfaceNumber:
+            _insertSurface(reg, s)
+            numbers._nextSurface = max(numbers._nextSurface, s.surfaceNumber + 1)
+        else:
+            unnumbered.append(s)
+    return unnumbered
+
+
+def registerCells(cells, reg):
+    """
+    adds cells and their surfaces to the registry in one pass, the surfaces and cells without a number are
+    numbered from two contiguous reserved ranges so registering N cells is O(N). Cells and surfaces that
+    already have a number, e.g. of a block made with a registry, keep it and are not added twice.
+
+    :param cells: blocks, connectors or other cells
+    :type cells: list
+    :param reg: registry
+    :type reg: pyg4ometry.mcnp.Registry
+    """
+    cells = list(cells)
+    with _trace.phase("registry"):
+        seen = set()
+        surfaces = []
+        for cell in cells:
+            for s in cell.surfaceList:
+                if id(s) not in seen:
+                    seen.add(id(s))
+                    surfaces.append(s)
+
+        numbers = allocator(reg)
+        numbers._check()
+        unnumbered = _reinsert(surfaces, numbers, reg)
+        unnumberedCells = []
+        for cell in cells:
+            if cell.cellNumber:
+                reg.cellDict[cell.cellNumber] = cell
+                numbers._nextCell = max(numbers._nextCell, cell.cellNumber + 1)
+            else:
+                unnumberedCells.append(cell)
+        numbers._inserted()
+
+        addSurfaces(unnumbered, reg)
+        firstCell = numbers.reserveCells(len(unnumberedCells))
+        for i, cell in enumerate(unnumberedCells):
+            cell.cellNumber = firstCell + i
+            reg.cellDict[cell.cellNumber] = cell
+        numbers._inserted()
+
+
+def updateCells(cells, reg):
+    """
+    puts cells and their surfaces back in the registry under the numbers they already have, e.g. after a
+    block has been moved, replacing what is there without renumbering. Cells or surfaces without a number
+    are given new numbers.
+    """
+    with _trace.phase("registry"):
+        numbers = allocator(reg)
+        numbers._check()
+        unnumbered = []
+        for cell in cells:
+            unnumbered.extend(_reinsert(cell.surfaceList, numbers, reg))
+            if not cell.cellNumber:
+                cell.cellNumber = numbers.reserveCells(1)
+            reg.cellDict[cell.cellNumber] = cell
+            numbers._nextCell = max(numbers._nextCell, cell.cellNumber + 1)
+        numbers._inserted()
+        if unnumbered:
+            addSurfaces(unnumbered, reg)
@@ -0,0 +1,173 @@
+import numpy as _np
+from pymcnp.blockphantom import block as _block
+from pymcnp.blockphantom import connector as _connector
+from pymcnp.blockphantom import cards as _cards
+from pymcnp.blockphantom import world as _world
+from pymcnp.blockphantom import palette as _palette
+
+_universeNumbers = {"full": 1, "half": 2}
+_mirrorX = _np.diag([-1.0, 1.0, 1.0])  # a mirror in x maps both block shapes onto themselves
+
+
+class UniverseDeck:
+    """
+    MCNP input deck of an assembly in which the full and half block are each defined once as a universe,
+    and every placed block is a box cell filled with that universe and positioned with a TRCL transform.
+    A block then costs one BOX surface instead of its 6 planes and 17-24 hole RCCs.
+
+    :param title: title card of the deck
+    :type title: str
+    :param polyethylene: material number and density of the blocks
+    :type polyethylene: list
+    :param aluminium: material number and density of the connectors
+    :type aluminium: list
+    :param air: material number and density of the holes and the world (0 for void)
+    :type air: list
+    :param particle: particle of the importance entries
+    :type particle: str
+    :param columnMax: maximum line length of the cards
+    :type columnMax: int
+    """
+
+    def __init__(self, title="pymcnp block phantom", polyethylene=_palette.polyethylene, aluminium=_palette.aluminium,
+                 air=_palette.air, particle="p", columnMax=80):
+        self.title = title
+        self.polyethylene = polyethylene
+        self.aluminium = aluminium
+        self.air = air
+        self.particle = particle
+        self.columnMax = columnMax
+        self.blocks = []
+        self.connectors = []
+
+    def addBlocks(self, blocks):
+        self.blocks.extend(blocks)
+
+    def addConnectors(self, connectors):
+        self.connectors.extend(connectors)
+
+    def _importance(self, value=1):
+        return f"imp:{self.particle}={value}"
+
+    def _connectorsInHoles(self):
+        """
+        dict of id(block) -> indices of the connectors centred on one of its holes
+        """
+        atPosition = {}
+        for i, c in enumerate(self.connectors):
+            centre = c._meshRotation @ [0, 0, _connector.length / 2] + c._meshTranslation
+            atPosition.setdefault(tuple(_np.round(centre, 4).tolist()), []).append(i)
+
+        inHoles = {}
+        for b in self.blocks:
+            found = []
+            for position in _np.round(b.holePositions, 4).tolist():
+                found.extend(atPosition.get(tuple(position), ()))
+            inHoles[id(b)] = sorted(set(found))
+        return inHoles
+
+    def _universeCards(self, blockType, cellNumber, surfaceNumber):
+        """
+        cell and surface cards of the universe of one block shape in its local space
+        """
+        template = _block.Block.__new__(_block.Block)
+        template.blockType = blockType
+        template.dim = _block.fullBlockDim if blockType == "full" else _block.halfBlockDim
+        template.unit = template.dim[1] / (3 * 2)
+        holes = template._localHoles(D=0.01)
+
+        surfaces = []
+        geometry = []
+        for axis, mnemonic in enumerate(["PX", "PY", "PZ"]):
+            for sign, sense in [(-1, ""), (1, "-")]:
+                surfaces.append(_cards.surfaceCard(surfaceNumber + len(surfaces), mnemonic,
+                                                   [sign * template.dim[axis] / 2], self.columnMax))
+                geometry.append(f"{sense}{surfaceNumber + len(surfaces) - 1}")
+        for start, vector in holes:
+            surfaces.append(_cards.surfaceCard(surfaceNumber + len(surfaces), "RCC",
+                                               [*start, *vector, _block.holeRadius], self.columnMax))
+            geometry.append(f"{surfaceNumber + len(surfaces) - 1}")
+
+        universe = f"u={_universeNumbers[blockType]}"
+        cells = [_cards.cellCard(cellNumber, *self.polyethylene, " ".join(geometry),
+                                 [universe, self._importance()], self.columnMax),
+                 _cards.cellCard(cellNumber + 1, *self.air, f"#{cellNumber}",
+                                 [universe, self._importance()], self.columnMax)]
+
+        return cells, surfaces
+
+    def cards(self):
+        """
+        cell, surface and data cards of the deck as three lists of card text
+        """
+        cellCards, surfaceCards = [], []
+        cellNumber, surfaceNumber = 1, 1
+        for blockType in _universeNumbers:
+            if not any(b.blockType == blockType for b in self.blocks):
+                continue
+            cells, surfaces = self._universeCards(blockType, cellNumber, surfaceNumber)
+            cellCards.extend(cells)
+            surfaceCards.extend(surfaces)
+            cellNumber += len(cells)
+            surfaceNumber += len(surfaces)
+
+        # connectors are cells of the real world
+        connectorSurfaces = []
+        for c in self.connectors:
+            start = c._meshTranslation
+            axis = c._meshRotation @ [0, 0, _connector.length]
+            surfaceCards.append(_cards.surfaceCard(surfaceNumber, "RCC", [*start, *axis, _connector.radius],
+                                                   self.columnMax))
+            cellCards.append(_cards.cellCard(cellNumber, *self.aluminium, f"-{surfaceNumber}",
+                                             [self._importance()], self.columnMax))
+            connectorSurfaces.append(surfaceNumber)
+            cellNumber += 1
+            surfaceNumber += 1
+
+        # each block is a box filled with its universe, outside the connectors in its holes
+        inHoles = self._connectorsInHoles()
+        boxSurfaces = []
+        for b in self.blocks:
+            R = _np.asarray(b._meshRotation, dtype=float)
+            if _np.linalg.det(R) < 0:
+                R = R @ _mirrorX  # TRCL needs a proper rotation, the mirrored block is identical
+            dim = _np.array(b.dim)
+            corner = b._meshTranslation - R @ (dim / 2)
+            edges = (R * dim).T.ravel()  # box edges are the scaled columns of R
+            surfaceCards.append(_cards.surfaceCard(surfaceNumber, "BOX", [*corner, *edges], self.columnMax))
+            geometry = " ".join([f"-{surfaceNumber}"] + [str(connectorSurfaces[i]) for i in inHoles[id(b)]])
+            fill = " ".join(_cards.formatNumber(e) for e in _cards.transformationEntries(R, b._meshTranslation))
+            cellCards.append(_cards.cellCard(cellNumber, 0, None, geometry,
+                                             [f"fill={_universeNumbers[b.blockType]} ({fill})", self._importance()],
+                                             self.columnMax))
+            boxSurfaces.append(surfaceNumber)
+            cellNumber += 1
+            surfaceNumber += 1
+
+        # world sphere around everything and the void outside it
+        if self.blocks or self.connectors:
+            lower, upper = _world.cellBounds(self.blocks + self.connectors)
+            radius = _np.max(_np.linalg.norm(_np.maximum(_np.abs(lower), _np.abs(upper)), axis=1)) + 1.0
+        else:
+            radius = 1.0
+        surfaceCards.append(_cards.surfaceCard(surfaceNumber, "SO", [radius], self.columnMax))
+        outside = " ".join(str(s) for s in boxSurfaces + connectorSurfaces)
+        cellCards.append(_cards.cellCard(cellNumber, *self.air, f"-{surfaceNumber} {outside}",
+                                         [self._importance()], self.columnMax))
+        cellCards.append(_cards.cellCard(cellNumber + 1, 0, None, f"{surfaceNumber}",
+                                         [self._importance(0)], self.columnMax))
+
+        dataCards = [f"mode {self.particle}"]
+
+        return cellCards, surfaceCards, dataCards
+
+    def write(self, fileName):
+        """
+        writes the deck to fileName
+        """
+        cellCards, surfaceCards, dataCards = self.cards()
+        with open(fileName, "w") as f:
+            f.write(self.title + "\n")
+            f.write("\n".join(cellCards) + "\n\n")
+            f.write("\n".join(surfaceCards) + "\n\n")
+            f.write("\n".join(dataCards) + "\n")
@@ -1,6 +1,99 @@
 import numpy as _np
 
 
+def _makeRotationTables():
+    """
+    builds the exact integer matrices of the 24 rotations of a cube (index 0 is the identity), the
+    (4, 4, 4) lookup from [x, y, z] steps (modulo 4) to table index, and the composition and inverse
+    tables of the indices
+    """
+    cosStep = [1, 0, -1, 0]
+    sinStep = [0, 1, 0, -1]
+
+    def rotX(n):
+        return _np.array([[1, 0, 0], [0, cosStep[n], -sinStep[n]], [0, sinStep[n], cosStep[n]]])
+
+    def rotY(n):
+        return _np.array([[cosStep[n], 0, sinStep[n]], [0, 1, 0], [-sinStep[n], 0, cosStep[n]]])
+
+    def rotZ(n):
+        return _np.array([[cosStep[n], -sinStep[n], 0], [sinStep[n], cosStep[n], 0], [0, 0, 1]])
+
+    matrices = []
+    indexOf = {}
+    stepsIndex = _np.zeros((4, 4, 4), dtype=int)
+    for x in range(4):
+        for y in range(4):
+            for z in range(4):
+                matrix = rotZ(z) @ rotY(y) @ rotX(x)  # same order as applying the x, y then z steps
+                key = matrix.tobytes()
+                if key not in indexOf:
+                    indexOf[key] = len(matrices)
+                    matrices.append(matrix)
+                stepsIndex[x, y, z] = indexOf[key]
+
+    table = _np.array(matrices, dtype=int)
+    composition = _np.array([[indexOf[(a @ b).tobytes()] for b in table] for a in table], dtype=int)
+    inverse = _np.array([indexOf[a.T.copy().tobytes()] for a in table], dtype=int)
+
+    return table, stepsIndex, composition, inverse
+
+
+rotationTable, _stepsIndex, _compositionTable, _inverseTable = _makeRotationTables()
+_rotationTableFloat = rotationTable.astype(float)
+
+
+def rotationStepsToIndex(steps):
+    """
+    index in rotationTable of the rotation given by integer 90-degree steps [x, y, z]
+    """
+    x, y, z = (int(step) % 4 for step in steps)
+    return int(_stepsIndex[x, y, z])
+
+
+def rotationIndexToMatrix(index):
+    """
+    exact (float) 3x3 matrix of the rotation with index in rotationTable
+    """
+    return _rotationTableFloat[index].copy()
+
+
+def rotationMatrixToIndex(R, atol=1e-6):
+    """
+    index in rotationTable of a rotation matrix, or None if R is not one of the 24 cube rotations
+    """
+    R = _np.asarray(R, dtype=float)
+    rounded = _np.rint(R)
+    if not _np.allclose(R, rounded, atol=atol):
+        return None
+    matches = _np.flatnonzero(_np.all(rotationTable == rounded, axis=(1, 2)))
+    return int(matches[0]) if len(matches) else None
+
+
+def composeRotationIndices(first, second):
+    """
+    index of the rotation made by applying rotation first and then rotation second
+    """
+    return int(_compositionTable[second, first])
+
+
+def invertRotationIndex(index):
+    """
+    index of the inverse rotation
+    """
+    return int(_inverseTable[index])
+
+
+def snapRotationMatrix(R, atol=1e-6):
+    """
+    replaces a matrix that is within atol of one of the 24 cube rotations by the exact matrix
+    """
+    index = rotationMatrixToIndex(R, atol=atol)
+    if index is None:
+        return _np.asarray(R, dtype=float)
+    return rotationIndexToMatrix(index)
+
+
 def rotationStepsToMatrix(stepsIn):
     """
     converts a list of 90-degree step rotations [x, y, z] into a 3x3 rotation matrix
@@ -12,6 +105,10 @@ def rotationStepsToMatrix(stepsIn):
 
     steps = _np.array(stepsIn)
 
+    # whole steps are looked up in the exact table
+    if _np.all(steps == _np.round(steps)):
+        return rotationIndexToMatrix(rotationStepsToIndex(steps))
+
     def rotX(n):
         theta = n * _np.pi / 2
         return _np.array([
@@ -72,17 +169,24 @@ def computeRotationMatrix(v1, v2):
         [-crossProd[1], crossProd[0], 0]
     ])
 
-    return _np.eye(3) + _np.sin(angle) * K + (1 - _np.cos(angle)) * _np.dot(K, K)
+    return snapRotationMatrix(_np.eye(3) + _np.sin(angle) * K + (1 - _np.cos(angle)) * _np.dot(K, K))
 
 def rotationMatrixToAxisAndAngle(R):
     """
     Converts a rotation matrix to axis-angle representation.
     Returns (axis, angle in degrees)
     """
-    angle = _np.arccos((_np.trace(R) - 1) / 2)
+    angle = _np.arccos(_np.clip((_np.trace(R) - 1) / 2, -1, 1))
     if _np.isclose(angle, 0):
         return _np.array([1, 0, 0]), 0.0  # No rotation
 
+    if _np.isclose(angle, _np.pi):
+        # half turn, the antisymmetric part vanishes so the axis is taken from R = 2aa^T - I
+        B = (R + _np.eye(3)) / 2
+        i = _np.argmax(_np.diag(B))
+        axis = B[:, i] / _np.linalg.norm(B[:, i])
+        return axis, 180.0
+
     rx = R[2, 1] - R[1, 2]
     ry = R[0, 2] - R[2, 0]
     rz = R[1, 0] - R[0, 1]
@@ -91,6 +195,68 @@ def rotationMatrixToAxisAndAngle(R):
 
     return axis, _np.degrees(angle)
 
+def transformMesh(mesh, rotationMatrix, translationVector):
+    """
+    rotates and then translates a mesh, a matrix with a negative determinant (e.g. the inversion
+    returned by computeRotationMatrix for opposite vectors) is applied as an inversion through the
+    origin followed by the rotation -R, with the polygons flipped so the mesh is not inside out.
+    Use the returned mesh, the pycsg backend flips the polygons of a new mesh.
+    """
+    rotationMatrix = _np.array(rotationMatrix, dtype=float)
+    if _np.linalg.det(rotationMatrix) < 0:
+        mesh.scale([-1, -1, -1])
+        mesh = mesh.inverse()  # the inversion reverses the winding, turn the normals back out
+        rotationMatrix = -rotationMatrix
+    axis, angle = rotationMatrixToAxisAndAngle(rotationMatrix)
+    if angle != 0:
+        mesh.rotate(axis, 360-angle)
+    mesh.translate(_np.array(translationVector, dtype=float))
+
+    return mesh
+
+
+class MeshHandle:
+    """
+    copy-on-write handle of the mesh of a cell, the shared local space base mesh and the transform from
+    local space. Reading the mesh of an untransformed cell gives the shared base mesh without a copy, a
+    private transformed copy is only made when the mesh of a transformed cell is first read or when a
+    mesh that may be modified is asked for.
+    """
+    __slots__ = ("_base", "rotation", "translation", "_private")
+
+    def __init__(self, base, rotationMatrix=None, translationVector=None):
+        self._base = base
+        self.rotation = _np.eye(3) if rotationMatrix is None else _np.array(rotationMatrix, dtype=float)
+        self.translation = _np.zeros(3) if translationVector is None else _np.array(translationVector, dtype=float)
+        self._private = None
+
+    @property
+    def isIdentity(self):
+        return bool(_np.array_equal(self.rotation, _np.eye(3)) and not _np.any(self.translation))
+
+    @property
+    def isShared(self):
+        """
+        True while the handle has no private mesh
+        """
+        return self._private is None
+
+    def read(self):
+        """
+        mesh for reading only, the shared base mesh when the transform is the identity
+        """
+        if self._private is None and self.isIdentity:
+            return self._base
+        return self.write()
+
+    def write(self):
+        """
+        private mesh of this handle that can be modified, copied from the base mesh on the first call
+        """
+        if self._private is None:
+            self._private = transformMesh(self._base.clone(), self.rotation, self.translation)
+        return self._private
+
 def rotationAroundAxis(axis, angleRad):
     """
     Rodrigues’ rotation formula for rotation about an arbitrary axis.
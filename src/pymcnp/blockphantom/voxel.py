@@ -0,0 +1,149 @@
+import os as _os
+import numpy as _np
+from concurrent import futures as _futures
+from pymcnp import trace as _trace
+from pymcnp.blockphantom import query as _query
+from pymcnp.blockphantom.palette import air as _air, cellMaterial as _cellMaterial
+
+# material number and density of the regions outside the cells, a voxel in a cell has the cell's material
+defaultMaterials = {_query.regionAir: _air, _query.regionHole: _air}
+
+
+def _openGrid(fileName, dtype, shape, mode):
+    """
+    memory-mapped grid in a .npy file, or in a raw file of any other extension
+    """
+    if fileName.endswith(".npy"):
+        return _np.lib.format.open_memmap(fileName, mode=mode, dtype=dtype, shape=shape if mode == "w+" else None)
+    return _np.memmap(fileName, dtype=dtype, mode=mode, shape=shape)
+
+
+def _materialTables(cells, materials):
+    """
+    material numbers and mass densities of each cell followed by those of each region, so a voxel's entry
+    is its cell index if it is in a cell and the number of cells plus its region if not
+    """
+    regionMaterials = {**defaultMaterials, **(materials or {})}
+    if set(regionMaterials) - set(defaultMaterials):
+        msg = "Only the materials of the air and holes can be replaced, blocks and connectors have their own"
+        raise ValueError(msg)
+    entries = [_cellMaterial(cell)[0] for cell in cells]
+    entries += [regionMaterials.get(region, (0, None)) for region in range(4)]
+    numbers = _np.array([materialNumber for materialNumber, _ in entries], dtype=_np.int16)
+    # mass density whichever sign convention the deck uses, 0 for a void
+    densities = _np.array([abs(density or 0) for _, density in entries], dtype=_np.float32)
+    return numbers, densities
+
+
+def _voxeliseSlab(query, origin, voxelSize, shape, first, last, numbers, densities, materialGrid, densityGrid):
+    """
+    fills z layers first to last of the grids from the cell or region at the centre of each voxel
+    """
+    z = origin[2] + (_np.arange(first, last) + 0.5) * voxelSize
+    y = origin[1] + (_np.arange(shape[1]) + 0.5) * voxelSize
+    x = origin[0] + (_np.arange(shape[2]) + 0.5) * voxelSize
+    zz, yy, xx = _np.meshgrid(z, y, x, indexing="ij")
+    indices, regions = query.locate(_np.stack([xx.ravel(), yy.ravel(), zz.ravel()], axis=1))
+    entries = _np.where(indices >= 0, indices, len(numbers) - 4 + regions).reshape(last - first, shape[1], shape[2])
+
+    materialGrid[first:last] = numbers[entries]
+    if densityGrid is not None:
+        densityGrid[first:last] = densities[entries]
+
+
+_workerState = None
+
+
+def _initWorker(query, origin, voxelSize, shape, numbers, densities, fileName, densityFileName):
+    global _workerState
+    materialGrid = _openGrid(fileName, _np.int16, shape, "r+")
+    densityGrid = _openGrid(densityFileName, _np.float32, shape, "r+") if densityFileName else None
+    _workerState = (query, origin, voxelSize, shape, numbers, densities, materialGrid, densityGrid)
+
+
+def _voxeliseWorkerSlab(first, last):
+    query, origin, voxelSize, shape, numbers, densities, materialGrid, densityGrid = _workerState
+    _voxeliseSlab(query, origin, voxelSize, shape, first, last, numbers, densities, materialGrid, densityGrid)
+    materialGrid.flush()
+    if densityGrid is not None:
+        densityGrid.flush()
+
+
+@_trace.timed("voxelise")
+def voxelise(cells, voxelSize=0.1, fileName=None, densityFileName=None, lower=None, upper=None, materials=None,
+             slabVoxels=None, processes=1):
+    """
+    rasterises a phantom to grids of material numbers and mass densities, from the cell or region at the
+    centre of each voxel. A voxel in a block or connector has the material given to that cell, e.g. with
+    setMaterial, and a voxel in a hole or the air has the material of its region. The grids are (Z,Y,X) so x runs fastest, as in an MCNP lattice
+    fill, and are made a slab of z layers at a time. With a fileName the grids are memory-mapped files that
+    are written slab by slab, so the whole grid is never held in memory, and slabs can be shared between
+    processes.
+
+    :param cells: phantom, blocks and connectors, or a PointQuery of them
+    :type cells: Phantom or list or PointQuery
+    :param voxelSize: edge length of the voxels
+    :type voxelSize: float
+    :param fileName: file of the material grid, .npy or raw int16, in memory if None
+    :type fileName: str
+    :param densityFileName: file of the density grid, .npy or raw float32, only made if given or in memory
+    :type densityFileName: str
+    :param lower: lower corner of the grid, the lower bound of the cells if None
+    :type lower: list
+    :param upper: upper corner of the grid, the upper bound of the cells if None
+    :type upper: list
+    :param materials: region (regionAir or regionHole) -> (material number, density) replacing entries of
+                      defaultMaterials
+    :type materials: dict
+    :param slabVoxels: number of z layers per slab, about a million voxels per slab if None
+    :type slabVoxels: int
+    :param processes: number of worker processes, all cores if None, needs a fileName when more than 1
+    :type processes: int
+    :return: material grid, density grid (None if not made) and the lower corner of the grid
+    """
+    query = cells if isinstance(cells, _query.PointQuery) else _query.PointQuery(cells)
+    if lower is None or upper is None:
+        boundsLower, boundsUpper = query.phantom.bounds()
+        lower = boundsLower.min(axis=0) if lower is None else lower
+        upper = boundsUpper.max(axis=0) if upper is None else upper
+    origin = _np.asarray(lower, dtype=float)
+    counts = _np.maximum(_np.ceil((_np.asarray(upper, dtype=float) - origin) / voxelSize - 1e-9), 1).astype(int)
+    shape = (int(counts[2]), int(counts[1]), int(counts[0]))
+    numbers, densities = _materialTables(query.phantom.cells, materials)
+
+    if slabVoxels is None:
+        slabVoxels = max(1, (1 << 20) // (shape[1] * shape[2]))
+    slabs = [(first, min(first + slabVoxels, shape[0])) for first in range(0, shape[0], slabVoxels)]
+
+    processes = (_os.cpu_count() or 1) if processes is None else processes
+    if processes > 1 and fileName is None:
+        msg = "Voxelising with more than one process needs a fileName for the grid"
+        raise ValueError(msg)
+
+    if fileName is None:
+        materialGrid = _np.empty(shape, dtype=_np.int16)
+        densityGrid = _np.empty(shape, dtype=_np.float32)
+    else:
+        materialGrid = _openGrid(fileName, _np.int16, shape, "w+")
+        densityGrid = _openGrid(densityFileName, _np.float32, shape, "w+") if densityFileName else None
+
+    if processes <= 1 or len(slabs) == 1:
+        for first, last in slabs:
+            _voxeliseSlab(query, origin, voxelSize, shape, first, last, numbers, densities, materialGrid, densityGrid)
+    else:
+        materialGrid.flush()
+        if densityGrid is not None:
+            densityGrid.flush()
+        with _futures.ProcessPoolExecutor(processes, initializer=_initWorker,
+                                          initargs=(query, origin, voxelSize, shape, numbers, densities,
+                                                    fileName, densityFileName)) as pool:
+            jobs = [pool.submit(_voxeliseWorkerSlab, first, last) for first, last in slabs]
+            for job in jobs:
+                job.result()
+
+    if fileName is not None:
+        materialGrid.flush()
+        if densityGrid is not None:
+            densityGrid.flush()
+
+    return materialGrid, densityGrid, origin
@@ -0,0 +1,91 @@
+import pyg4ometry
+import numpy as _np
+from pymcnp.blockphantom import overlap as _overlap
+
+
+def balancedIntersection(regions):
+    """
+    intersection of a list of regions (surfaces, complements or other geometry) as a balanced tree, so the
+    depth of the expression grows as O(log N) instead of O(N) for a chain of intersections
+    """
+    regions = list(regions)
+    if not regions:
+        msg = f"At least one region is needed for an intersection"
+        raise ValueError(msg)
+    while len(regions) > 1:
+        paired = [pyg4ometry.mcnp.Intersection(regions[i], regions[i + 1]) for i in range(0, len(regions) - 1, 2)]
+        if len(regions) % 2:
+            paired.append(regions[-1])
+        regions = paired
+
+    return regions[0]
+
+
+def worldGeometry(cells, outerSurface):
+    """
+    geometry of a world cell that is inside outerSurface and outside every one of the cells, as a balanced tree
+    """
+    return balancedIntersection([pyg4ometry.mcnp.Complement(outerSurface)] +
+                                [pyg4ometry.mcnp.Complement(c) for c in cells])
+
+
+def cellBounds(cells):
+    """
+    axis-aligned lower and upper bounds (N,3) of blocks and connectors
+    """
+    centres, axes, halfExtents = _overlap.orientedBoxes(cells)
+    extents = _np.einsum("nij,nj->ni", _np.abs(axes), halfExtents)
+    return centres - extents, centres + extents
+
+
+def envelopeCells(cells, divisions=(2, 2, 2), margin=0.1, reg=None):
+    """
+    splits the bounding box of the cells into a grid of RPP envelopes and makes one cell per envelope that is
+    inside it and outside only the cells that reach into it. The world cell then only has to be outside the
+    returned bounding RPP rather than outside every cell.
+
+    :param cells: blocks and connectors of an assembly
+    :type cells: list
+    :param divisions: number of envelopes along x, y and z
+    :type divisions: list
+    :param margin: gap between the cells and the bounding box
+    :type margin: float
+    :param reg: registry the envelope surfaces and cells are added to
+    :type reg: pyg4ometry.mcnp.Registry
+    :return: bounding RPP surface and list of envelope cells
+    """
+    cells = list(cells)
+    lower, upper = cellBounds(cells)
+    boxLower, boxUpper = lower.min(axis=0) - margin, upper.max(axis=0) + margin
+    edges = [_np.linspace(boxLower[a], boxUpper[a], divisions[a] + 1) for a in range(3)]
+
+    # range of envelopes each cell reaches into
+    first = _np.stack([_np.clip(_np.searchsorted(edges[a], lower[:, a], side="right") - 1, 0, divisions[a] - 1)
+                       for a in range(3)], axis=1)
+    last = _np.stack([_np.clip(_np.searchsorted(edges[a], upper[:, a], side="left") - 1, 0, divisions[a] - 1)
+                      for a in range(3)], axis=1)
+    members = {}
+    for cell, (i0, j0, k0), (i1, j1, k1) in zip(cells, first.tolist(), last.tolist()):
+        for i in range(i0, i1 + 1):
+            for j in range(j0, j1 + 1):
+                for k in range(k0, k1 + 1):
+                    members.setdefault((i, j, k), []).append(cell)
+
+    envelopes = []
+    for i in range(divisions[0]):
+        for j in range(divisions[1]):
+            for k in range(divisions[2]):
+                rpp = pyg4ometry.mcnp.RPP(edges[0][i], edges[0][i + 1], edges[1][j], edges[1][j + 1],
+                                          edges[2][k], edges[2][k + 1], reg=reg)
+                inside = members.get((i, j, k), [])
+                envelope = pyg4ometry.mcnp.Cell(reg=reg)
+                for c in inside:
+                    envelope.addSurface(c.geometry)
+                envelope.addSurface(rpp)
+                envelope.addGeometry(balancedIntersection([pyg4ometry.mcnp.Complement(rpp)] +
+                                                          [pyg4ometry.mcnp.Complement(c) for c in inside]))
+                envelopes.append(envelope)
+
+    boundingSurface = pyg4ometry.mcnp.RPP(*_np.stack([boxLower, boxUpper], axis=1).ravel().tolist(), reg=reg)
+
+    return boundingSurface, envelopes
@@ -0,0 +1,217 @@
+import numpy as _np
+from pymcnp import trace as _trace
+from pymcnp.blockphantom import block as _block
+from pymcnp.blockphantom import connector as _connector
+from pymcnp.blockphantom import cards as _cards
+from pymcnp.blockphantom import world as _world
+from pymcnp.blockphantom.palette import air as _air, cellMaterial as _cellMaterial
+
+_surfaceCounts = {"full": 30, "half": 23, "connector": 1}  # surfaces of each kind of cell
+_planes = ["PX", "PY", "PZ"]
+
+
+def _kind(cell):
+    if isinstance(cell, _block.Block):
+        return cell.blockType
+    if isinstance(cell, _connector.Connector):
+        return "connector"
+    msg = f"Only blocks and connectors can be written, not {type(cell).__name__}"
+    raise TypeError(msg)
+
+
+def _signature(cell):
+    """
+    key of the cards of a cell, cells of the same kind and material in the same place have the same cards
+    """
+    R = _np.round(_np.asarray(cell._meshRotation, dtype=float), 9) + 0.0  # + 0.0 so -0 and 0 are the same
+    t = _np.round(_np.asarray(cell._meshTranslation, dtype=float), 9) + 0.0
+    material, _ = _cellMaterial(cell)
+    return _kind(cell), R.tobytes(), t.tobytes(), material
+
+
+def _planeCard(surfaceNumber, normal, offset, columnMax):
+    """
+    card of the plane normal.x = offset and True if its positive side is normal.x > offset
+    """
+    axis = int(_np.argmax(_np.abs(normal)))
+    if abs(abs(normal[axis]) - 1) <= 1e-12:
+        sign = float(_np.sign(normal[axis]))
+        return _cards.surfaceCard(surfaceNumber, _planes[axis], [offset * sign], columnMax), sign > 0
+    return _cards.surfaceCard(surfaceNumber, "P", [*normal, offset], columnMax), True
+
+
+class _Slot:
+    __slots__ = ("kind", "cellNumber", "surfaceNumber", "signature", "cell", "cellCard", "surfaceCards")
+
+    def __init__(self, kind, cellNumber, surfaceNumber):
+        self.kind = kind
+        self.cellNumber = cellNumber
+        self.surfaceNumber = surfaceNumber
+        self.signature = None
+        self.cell = None
+        self.cellCard = None
+        self.surfaceCards = None
+
+
+class IncrementalDeck:
+    """
+    MCNP input deck of blocks and connectors that keeps the formatted cards of every cell between writes.
+    Each cell has a slot with a fixed cell number and range of surface numbers. When the deck is updated
+    with a new set of cells, a cell with the same kind, transform and material as a cell already in the deck
+    keeps its slot and its cards, and only the cells that were moved, swapped, given another material or
+    added are formatted again, in freed slots of the same kind where there are any. The world cell is inside
+    a sphere and outside every cell.
+
+    :param title: title card of the deck
+    :type title: str
+    :param particle: particle of the importance entries
+    :type particle: str
+    :param worldRadius: radius of the world sphere, fitted around the cells if None
+    :type worldRadius: float
+    :param columnMax: maximum line length of the cards
+    :type columnMax: int
+    """
+
+    def __init__(self, title="pymcnp block phantom", particle="p", worldRadius=None, columnMax=80):
+        self.title = title
+        self.particle = particle
+        self.worldRadius = worldRadius
+        self.columnMax = columnMax
+        self.slots = []
+        self._nextSurface = 1
+        self._worldKey = None
+        self._worldCache = None
+        self.formatted = 0  # cells formatted by the last write
+
+    def _newSlot(self, kind):
+        slot = _Slot(kind, len(self.slots) + 1, self._nextSurface)
+        self._nextSurface += _surfaceCounts[kind]
+        self.slots.append(slot)
+        return slot
+
+    def update(self, cells):
+        """
+        makes the deck the given blocks and connectors, keeping the slots of cells that did not change
+        """
+        cells = list(cells)
+        bySignature = {}
+        for slot in self.slots:
+            if slot.signature is not None:
+                bySignature.setdefault(slot.signature, []).append(slot)
+
+        kept, new = set(), []
+        for cell in cells:
+            signature = _signature(cell)
+            matches = bySignature.get(signature)
+            if matches:
+                slot = matches.pop()
+                kept.add(id(slot))
+                slot.cell = cell
+            else:
+                new.append((cell, signature))
+
+        # slots of cells that are gone are emptied and re-used for new cells of the same kind
+        free = {}
+        for slot in self.slots:
+            if id(slot) not in kept and slot.signature is not None:
+                slot.signature, slot.cell, slot.cellCard, slot.surfaceCards = None, None, None, None
+            if slot.signature is None:
+                free.setdefault(slot.kind, []).append(slot)
+        for kinds in free.values():
+            kinds.reverse()
+
+        for cell, signature in new:
+            kind = signature[0]
+            slot = free[kind].pop() if free.get(kind) else self._newSlot(kind)
+            slot.signature, slot.cell, slot.cellCard, slot.surfaceCards = signature, cell, None, None
+
+    def add(self, cells):
+        """
+        adds blocks and connectors to the deck
+        """
+        self.update([slot.cell for slot in self.slots if slot.cell is not None] + list(cells))
+
+    def _blockCards(self, slot):
+        b = slot.cell
+        R = _np.asarray(b._meshRotation, dtype=float)
+        t = _np.asarray(b._meshTranslation, dtype=float)
+        halfDim = _np.array(b.dim) / 2
+        number = slot.surfaceNumber
+        surfaces, geometry = [], []
+        for axis in range(3):
+            normal = R[:, axis]
+            centre = normal @ t
+            for offset, inside in [(centre - halfDim[axis], True), (centre + halfDim[axis], False)]:
+                card, positive = _planeCard(number, normal, offset, self.columnMax)
+                surfaces.append(card)
+                geometry.append(f"{'' if positive == inside else '-'}{number}")
+                number += 1
+        for start, vector in b._localHoles(D=0.01):
+            surfaces.append(_cards.surfaceCard(number, "RCC", [*(R @ start + t), *(R @ vector), _block.holeRadius],
+                                               self.columnMax))
+            geometry.append(str(number))
+            number += 1
+        cellCard = _cards.cellCard(slot.cellNumber, *slot.signature[3], " ".join(geometry),
+                                   [f"imp:{self.particle}=1"], self.columnMax)
+        return cellCard, surfaces
+
+    def _connectorCards(self, slot):
+        c = slot.cell
+        start = _np.asarray(c._meshTranslation, dtype=float)
+        axis = _np.asarray(c._meshRotation, dtype=float) @ [0, 0, _connector.length]
+        surfaces = [_cards.surfaceCard(slot.surfaceNumber, "RCC", [*start, *axis, _connector.radius], self.columnMax)]
+        cellCard = _cards.cellCard(slot.cellNumber, *slot.signature[3], f"-{slot.surfaceNumber}",
+                                   [f"imp:{self.particle}=1"], self.columnMax)
+        return cellCard, surfaces
+
+    def _worldCards(self, filled):
+        if self.worldRadius is not None:
+            radius = self.worldRadius
+        elif filled:
+            lower, upper = _world.cellBounds([s.cell for s in filled])
+            radius = float(_np.max(_np.linalg.norm(_np.maximum(_np.abs(lower), _np.abs(upper)), axis=1)) + 1.0)
+        else:
+            radius = 1.0
+        key = (radius, tuple(s.cellNumber for s in filled))
+        if key != self._worldKey:
+            cellNumber, surfaceNumber = len(self.slots) + 1, self._nextSurface
+            outside = " ".join(f"#{s.cellNumber}" for s in filled)
+            self._worldCache = ([_cards.cellCard(cellNumber, *_air, f"-{surfaceNumber} {outside}",
+                                                 [f"imp:{self.particle}=1"], self.columnMax),
+                                 _cards.cellCard(cellNumber + 1, 0, None, f"{surfaceNumber}",
+                                                 [f"imp:{self.particle}=0"], self.columnMax)],
+                                [_cards.surfaceCard(surfaceNumber, "SO", [radius], self.columnMax)])
+            self._worldKey = key
+        return self._worldCache
+
+    @_trace.timed("write")
+    def cards(self):
+        """
+        cell, surface and data cards of the deck as three lists of card text
+        """
+        self.formatted = 0
+        filled = [s for s in self.slots if s.signature is not None]
+        for slot in filled:
+            if slot.cellCard is None:
+                if slot.kind == "connector":
+                    slot.cellCard, slot.surfaceCards = self._connectorCards(slot)
+                else:
+                    slot.cellCard, slot.surfaceCards = self._blockCards(slot)
+                self.formatted += 1
+
+        worldCells, worldSurfaces = self._worldCards(filled)
+        cellCards = [s.cellCard for s in filled] + worldCells
+        surfaceCards = [card for s in filled for card in s.surfaceCards] + worldSurfaces
+
+        return cellCards, surfaceCards, [f"mode {self.particle}"]
+
+    def write(self, fileName):
+        """
+        writes the deck to fileName, only the cells that changed since the last write are formatted
+        """
+        cellCards, surfaceCards, dataCards = self.cards()
+        with open(fileName, "w") as f:
+            f.write(self.title + "\n")
+            f.write("\n".join(cellCards) + "\n\n")
+            f.write("\n".join(surfaceCards) + "\n\n")
+            f.write("\n".join(dataCards) + "\n")
@@ -0,0 +1,130 @@
+import contextlib
+import functools
+import json
+import logging
+import time
+
+logging.getLogger("pymcnp").addHandler(logging.NullHandler())
+
+enabled = False  # phase timers only record while enabled
+_totals = {}  # phase -> [calls, seconds]
+_active = {}  # phase -> number of times it is open, a phase inside itself is only counted once
+
+
+class _Phase:
+    """
+    context manager adding the time spent inside it to a phase, unless the phase is already open, e.g.
+    blocks constructed inside placeBlocks, so the time is not added twice
+    """
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        _active[self.name] = _active.get(self.name, 0) + 1
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        _active[self.name] -= 1
+        if not _active[self.name]:
+            total = _totals.setdefault(self.name, [0, 0.0])
+            total[0] += 1
+            total[1] += time.perf_counter() - self.start
+        return False
+
+
+class _NoPhase:
+    """
+    shared context that records nothing, used while tracing is disabled
+    """
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_null = _NoPhase()  # contextlib.nullcontext needs Python 3.7
+
+
+def enable():
+    global enabled
+    enabled = True
+
+
+def disable():
+    global enabled
+    enabled = False
+
+
+def reset():
+    _totals.clear()
+
+
+def phase(name):
+    """
+    times a block of code as part of a phase, e.g. with phase("registry"): ..., a shared no-op
+    context when tracing is disabled
+    """
+    return _Phase(name) if enabled else _null
+
+
+def timed(name):
+    """
+    decorator timing every call of a function as part of a phase, the function is called directly
+    when tracing is disabled
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return function(*args, **kwargs)
+            with _Phase(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def summary():
+    """
+    dict of phase -> calls, total and mean seconds. Phases are inclusive, so construction also contains
+    the registry insert of a block made with a registry, and a phase entered again inside itself is part
+    of the outer call rather than a call of its own.
+    """
+    return {name: {"calls": calls, "seconds": seconds, "mean": seconds / calls}
+            for name, (calls, seconds) in sorted(_totals.items())}
+
+
+def writeSummary(fileName, **info):
+    """
+    writes the timing summary and any extra information (e.g. the number of blocks) to a JSON file
+    """
+    with open(fileName, "w") as f:
+        json.dump({**info, "phases": summary()}, f, indent=2)
+
+
+@contextlib.contextmanager
+def assembly(name, fileName=None):
+    """
+    times the phases of building one assembly, e.g.
+
+        with pymcnp.trace.assembly("grid", "grid-timing.json"):
+            blocks, connectors = pymcnp.blockphantom.placeBlocks(...)
+
+    the previous tracing state is restored afterwards and the summary is written to fileName if given
+    """
+    global enabled
+    wasEnabled = enabled
+    reset()
+    enabled = True
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        enabled = wasEnabled
+        if fileName is not None:
+            writeSummary(fileName, assembly=name, seconds=time.perf_counter() - start)
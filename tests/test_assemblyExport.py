@@ -0,0 +1,31 @@
+import pymcnp
+import numpy as np
+
+
+def test_assemblyExport(write=False):
+    """
+    test exporting a grid of blocks with connectors as one merged mesh and as instances
+    :param write: write to file
+    :type write: boolean
+    :return: none
+    """
+    x, y = np.meshgrid(np.arange(4) * 20, np.arange(4) * 20)
+    translations = np.stack([x.ravel(), y.ravel(), np.zeros(x.size)], axis=1)
+    blocks, connectors = pymcnp.blockphantom.placeBlocks("full", translations, connectorHoles=[0, 7])
+    cells = blocks + [c for blockConnectors in connectors for c in blockConnectors]
+
+    meshes = pymcnp.blockphantom.exportMeshes(cells)
+    vertices, polygonIndices, polygonSizes, cellIds = pymcnp.blockphantom.mergeMeshes(meshes)
+    assert len(vertices) == sum(len(m.vertices) for m in meshes)
+    assert len(polygonSizes) == len(cellIds) and cellIds[-1] == len(cells) - 1
+
+    if write:
+        for extension in ["vtk", "stl", "ply"]:
+            pymcnp.blockphantom.exportAssembly(f"assemblyExport.{extension}", cells)
+        pymcnp.blockphantom.writeInstances("assemblyExport-instances.npz", cells)
+        instanced = pymcnp.blockphantom.readInstances("assemblyExport-instances.npz")
+        assert np.allclose(instanced[0], vertices)
+
+
+if __name__ == "__main__":
+    test_assemblyExport(True)
@@ -0,0 +1,32 @@
+import pymcnp
+import numpy as np
+
+
+def test_connectorAt():
+    """
+    test a connector made in a hole matches a connector made at the origin and transformed into the hole
+    :return: none
+    """
+    b1 = pymcnp.blockphantom.Block("full", translation=[10, 0, 0], rotationSteps=[0, 1, 1])
+    for hole in [0, 5, 13, 20]:
+        position, direction = b1.holeInfo[hole]
+        c1 = pymcnp.blockphantom.Connector.at(position, direction)
+
+        # connector at the origin moved to the hole
+        unit = np.array(direction) / np.linalg.norm(direction)
+        R = pymcnp.blockphantom.computeRotationMatrix(np.array([0, 0, 1]), unit)
+        start = position - unit * pymcnp.blockphantom.connector.length / 2
+        c2 = pymcnp.blockphantom.Connector().transform(translation=start, rotation=R, isRotationMatrix=True)
+
+        s1, s2 = c1.surfaceList[0], c2.surfaceList[0]
+        assert np.allclose([s1.vx, s1.vy, s1.vz, s1.hx, s1.hy, s1.hz, s1.r],
+                           [s2.vx, s2.vy, s2.vz, s2.hx, s2.hy, s2.hz, s2.r])
+        assert np.allclose(c1._meshRotation, c2._meshRotation)
+        assert np.allclose(c1._meshTranslation, c2._meshTranslation)
+
+        # the connector centre is the hole position
+        assert np.allclose(c1._meshRotation @ [0, 0, 1] + c1._meshTranslation, position)
+
+
+if __name__ == "__main__":
+    test_connectorAt()
@@ -0,0 +1,50 @@
+import pyg4ometry
+import pymcnp
+
+
+def test_holeIndex():
+    """
+    test automatic detection of connected and covered holes with the hole index
+    :return: none
+    """
+    reg = pyg4ometry.mcnp.Registry()
+    holeIndex = pymcnp.blockphantom.HoleIndex()
+
+    # two blocks side by side, the right holes of the first face the left holes of the second
+    blocks, _ = pymcnp.blockphantom.placeBlocks("full", [[0, 0, 0], [11, 0, 0]], reg=reg, holeIndex=holeIndex)
+    for hole in [7, 8, 9]:
+        assert blocks[0].holeStatus[hole]["connected"]
+    for hole in [4, 5, 6]:
+        assert blocks[1].holeStatus[hole]["connected"]
+    assert not blocks[0].holeStatus[4]["connected"]
+
+    # a half block on the front face of the first block, its back face has no holes so the front holes are covered
+    pymcnp.blockphantom.placeBlocks("half", [[0, 0, 4]], reg=reg, holeIndex=holeIndex)
+    for hole in range(10, 17):
+        assert blocks[0].holeStatus[hole]["covered"]
+        assert not blocks[0].holeStatus[hole]["connected"]
+
+    # moving the second block away undoes its connections on both blocks, moving it back restores them
+    moved = blocks[1].transform(translation=[0, 50, 0])
+    holeIndex.replaceBlock(blocks[1], moved)
+    for hole in [7, 8, 9]:
+        assert not blocks[0].holeStatus[hole]["connected"]
+    for hole in [4, 5, 6]:
+        assert not moved.holeStatus[hole]["connected"]
+    back = moved.transform(translation=[0, -50, 0])
+    holeIndex.replaceBlock(moved, back)
+    assert blocks[0].holeStatus[7]["connected"] and back.holeStatus[4]["connected"]
+    holeIndex.removeBlock(back)
+    assert not blocks[0].holeStatus[7]["connected"]
+
+    # connecting through makeNewConnectedBlock updates the index
+    holeIndex = pymcnp.blockphantom.HoleIndex()
+    b1 = pymcnp.blockphantom.Block("full", reg=reg)
+    holeIndex.addBlock(b1)
+    b2 = b1.makeNewConnectedBlock("full", 20, 13, reg=reg, holeIndex=holeIndex)
+    assert b2.holeStatus[20]["connected"] and b1.holeStatus[13]["connected"]
+    assert len(holeIndex.coincidentHoles(b1, 13)) == 1
+
+
+if __name__ == "__main__":
+    test_holeIndex()
@@ -0,0 +1,58 @@
+import pymcnp
+import numpy as np
+
+
+def test_incrementalDeckWrite(write=False):
+    """
+    test rewriting a grid of blocks after moving one block, only the moved block's cards are made again
+    :param write: write to file
+    :type write: boolean
+    :return: none
+    """
+    # --- 4X4 GRID OF BLOCKS ---
+    gridRowNum, gridColNum = 4, 4
+    holeOrder = [0, 1, 2, 3]
+    x, y = np.meshgrid(np.arange(gridColNum) * 20 - 30, np.arange(gridRowNum) * 20 - 30)
+    translations = np.stack([x.ravel(), y.ravel(), np.zeros(x.size)], axis=1)
+    rotations = [[0, 0, i % 4] for i in range(len(translations))]
+    blocks, connectors = pymcnp.blockphantom.placeBlocks("full", translations, rotations,
+                                                         connectorHoles=holeOrder)
+    connectors = [c for blockConnectors in connectors for c in blockConnectors]
+
+    deck = pymcnp.blockphantom.IncrementalDeck(f"{len(blocks)} BLOCKS IN A {gridRowNum}X{gridColNum} GRID")
+    deck.update(blocks + connectors)
+    cellCards, surfaceCards, dataCards = deck.cards()
+    assert deck.formatted == len(blocks) + len(connectors)
+    assert len(cellCards) == len(blocks) + len(connectors) + 2
+    assert len(surfaceCards) == 30 * len(blocks) + len(connectors) + 1
+
+    # --- VARIANT WITH ONE BLOCK RAISED ---
+    variant = list(blocks)
+    variant[5] = blocks[5].transform(translation=[0, 0, 1])
+    deck.update(variant + connectors)
+    cellCards_p, surfaceCards_p, dataCards_p = deck.cards()
+    assert deck.formatted == 1
+    assert len(cellCards_p) == len(cellCards)
+    assert sum(a != b for a, b in zip(cellCards, cellCards_p)) == 0  # same cell numbers and geometry
+    changed = [i for i, (a, b) in enumerate(zip(surfaceCards, surfaceCards_p)) if a != b]
+    assert changed and all(5 * 30 <= i < 6 * 30 for i in changed)  # only surfaces of the moved block's slot
+
+    # --- A REWRITE WITHOUT CHANGES FORMATS NOTHING ---
+    deck.update(variant + connectors)
+    deck.cards()
+    assert deck.formatted == 0
+
+    # --- A BLOCK GIVEN ANOTHER MATERIAL IS FORMATTED AGAIN WITH IT ---
+    pymcnp.blockphantom.setMaterial([variant[6]], 4, -1.2)
+    deck.update(variant + connectors)
+    cellCards_p, _, _ = deck.cards()
+    assert deck.formatted == 1
+    assert cellCards_p[6].split()[1:3] == ["4", "-1.2"]
+    assert cellCards_p[5].split()[1:3] == ["1", "-0.9016"]
+
+    if write:
+        deck.write(f"i-incremental-{gridRowNum}X{gridColNum}Grid.txt")
+
+
+if __name__ == "__main__":
+    test_incrementalDeckWrite(True)
@@ -0,0 +1,70 @@
+import pymcnp
+import numpy as np
+
+
+def test_massProperties():
+    """
+    test the closed form mass properties of connected blocks against a box less its holes and a voxel grid
+    :return: none
+    """
+    b1 = pymcnp.blockphantom.Block("full")
+    [b2, b2c1] = b1.makeNewConnectedBlock("full", 2, 22, makeConnector=True)
+    b3 = pymcnp.blockphantom.Block("half", translation=[30, 0, 0], rotationSteps=[1, 1, 0])
+    cells = [b1, b2, b3, b2c1]
+    properties = pymcnp.blockphantom.massProperties(cells)
+
+    # a full block is its box less 2 through tubes and 20 short holes
+    holeVolume = np.pi * pymcnp.blockphantom.holeRadius ** 2 * (2 * b1.dim[1] + 20 * 1)
+    assert np.isclose(properties.volumes[0], np.prod(b1.dim) - holeVolume, atol=1e-3)
+    # a half block's front holes reach its tubes, where they cross is added back once, checked against
+    # points sampled in the bounds shared by the two holes
+    r = pymcnp.blockphantom.holeRadius
+    rng = np.random.default_rng(1)
+
+    def inside(points, axis, across, low, high):
+        offset = np.delete(points, axis, axis=1) - across
+        return (np.sum(offset ** 2, axis=1) < r ** 2) & (points[:, axis] >= low) & (points[:, axis] <= high)
+
+    cylinders = pymcnp.blockphantom.mass._holeCylinders("half")
+    crossings = 0
+    for i, first in enumerate(cylinders):
+        for second in cylinders[i + 1:]:
+            lower = np.maximum(np.insert(np.array(first[1]) - r, first[0], first[2]),
+                               np.insert(np.array(second[1]) - r, second[0], second[2]))
+            upper = np.minimum(np.insert(np.array(first[1]) + r, first[0], first[3]),
+                               np.insert(np.array(second[1]) + r, second[0], second[3]))
+            if first[0] == second[0] or np.any(lower >= upper):
+                continue
+            points = lower + rng.random((100000, 3)) * (upper - lower)
+            sampled = np.mean(inside(points, *first) & inside(points, *second)) * np.prod(upper - lower)
+            volume, _, _ = pymcnp.blockphantom.mass._crossing(first, second)
+            assert np.isclose(volume, sampled, rtol=0.02)
+            crossings += 1
+    assert crossings
+
+    connectorMass = np.pi * pymcnp.blockphantom.connector.radius ** 2 * pymcnp.blockphantom.connector.length * 2.699
+    assert np.isclose(properties.connectorMass, connectorMass)
+    assert np.isclose(properties.mass, properties.blockMass + properties.connectorMass)
+
+    # the density is that of the material assigned to the cell
+    b4 = pymcnp.blockphantom.Block("full", translation=[0, 30, 0])
+    pymcnp.blockphantom.setMaterial([b4], 4, -1.2)
+    assert np.isclose(pymcnp.blockphantom.massProperties([b4]).mass, 1.2 * properties.volumes[0])
+
+    # moving a block moves its centre of mass but not its volume or principal moments
+    assert np.allclose(properties.centres[0], b1._meshTranslation)
+    assert np.allclose(np.linalg.eigvalsh(properties.inertias[2]),
+                       np.linalg.eigvalsh(pymcnp.blockphantom.massProperties([b3.transform(rotation=[0, 0, 1])]).inertia))
+
+    # the voxelised blocks and connector have nearly the same mass and centre of mass
+    materials, densities, origin = pymcnp.blockphantom.voxelise(cells, voxelSize=0.25)
+    z, y, x = np.meshgrid(*[origin[a] + (np.arange(materials.shape[2 - a]) + 0.5) * 0.25 for a in (2, 1, 0)],
+                          indexing="ij")
+    masses = densities * (materials != pymcnp.blockphantom.air[0]) * 0.25 ** 3  # without the air around them
+    assert np.isclose(masses.sum(), properties.mass, rtol=0.03)  # holes are coarse at this voxel size
+    centre = [np.sum(masses * c) / masses.sum() for c in (x, y, z)]
+    assert np.allclose(centre, properties.centreOfMass, atol=0.1)
+
+
+if __name__ == "__main__":
+    test_massProperties()
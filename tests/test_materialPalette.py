@@ -0,0 +1,38 @@
+import pyg4ometry
+import pymcnp
+
+
+def test_materialPalette():
+    """
+    test blocks and connectors of a registry share one material object per material
+    :return: none
+    """
+    reg = pyg4ometry.mcnp.Registry()
+    b1 = pymcnp.blockphantom.Block("full", reg=reg)
+    [b2, c2] = b1.makeNewConnectedBlock("full", 20, 13, makeConnector=True, reg=reg)
+    palette = pymcnp.blockphantom.palette(reg)
+    assert len(palette.materials) == 2
+    assert palette.material(*pymcnp.blockphantom.polyethylene) is palette.material(1, -0.9016)
+    (key1, m1), (_, m2) = pymcnp.blockphantom.cellMaterial(b1), pymcnp.blockphantom.cellMaterial(b2)
+    assert m1 is m2 and m1 is palette.material(*pymcnp.blockphantom.polyethylene)
+    assert key1 == pymcnp.blockphantom.polyethylene
+    assert pymcnp.blockphantom.cellMaterial(c2)[1] is palette.material(*pymcnp.blockphantom.aluminium)
+
+    # a material given with setMaterial replaces the block material, a cell without one is an error
+    pymcnp.blockphantom.setMaterial([b2], 4, -1.2, reg=reg)
+    assert pymcnp.blockphantom.cellMaterial(b2)[0] == (4, -1.2)
+    try:
+        pymcnp.blockphantom.cellMaterial(pyg4ometry.mcnp.Cell(reg=reg))
+        assert False
+    except ValueError:
+        pass
+
+    # one importance object for all cells
+    pymcnp.blockphantom.setImportance([b1, b2, c2], 1, reg=reg)
+    assert len(palette.importances) == 1
+    assert pymcnp.blockphantom.cellImportance(b1) is pymcnp.blockphantom.cellImportance(b2)
+    assert pymcnp.blockphantom.cellImportance(b1) is pymcnp.blockphantom.cellImportance(c2)
+
+
+if __name__ == "__main__":
+    test_materialPalette()
@@ -0,0 +1,74 @@
+import os
+import tempfile
+import pymcnp
+import numpy as np
+from pymcnp.blockphantom import cache
+
+
+def cubeMesh():
+    vertices = np.array([[x, y, z] for x in (0.0, 1.0) for y in (0.0, 1.0) for z in (0.0, 1.0)])
+    faces = [[0, 1, 3, 2], [4, 6, 7, 5], [0, 4, 5, 1], [2, 3, 7, 6], [0, 2, 6, 4], [1, 5, 7, 3]]
+    return pymcnp.blockphantom.arraysToMesh(vertices, np.array(faces).ravel(), np.full(len(faces), 4))
+
+
+def polygons(mesh):
+    """
+    polygons of a mesh as sorted vertex coordinates, the order of the vertices may change with the backend
+    """
+    vertices, polygonIndices, polygonSizes = pymcnp.blockphantom.meshToArrays(mesh)
+    split = np.split(polygonIndices, np.cumsum(polygonSizes)[:-1])
+    return sorted(sorted(map(tuple, vertices[p].round(9).tolist())) for p in split)
+
+
+def test_meshCache():
+    """
+    test the on-disk mesh cache in a temporary directory, it is off unless asked for, a saved mesh loads
+    back the same, the key changes with the cache version and the parameters and a failed write leaves
+    no temporary file
+    :return: none
+    """
+    environ = {k: os.environ.get(k) for k in ["PYMCNP_CACHE_DIR", "PYMCNP_DISK_CACHE"]}
+    with tempfile.TemporaryDirectory() as cacheDir:
+        try:
+            os.environ["PYMCNP_CACHE_DIR"] = cacheDir
+            os.environ.pop("PYMCNP_DISK_CACHE", None)
+            mesh = cubeMesh()
+            key = pymcnp.blockphantom.meshKey("cube", dim=[1, 1, 1])
+
+            # the cache is opt-in
+            pymcnp.blockphantom.saveMesh(key, mesh)
+            assert os.listdir(cacheDir) == []
+            os.environ["PYMCNP_DISK_CACHE"] = "1"
+
+            # round trip
+            assert pymcnp.blockphantom.loadMesh(key) is None
+            pymcnp.blockphantom.saveMesh(key, mesh)
+            assert os.listdir(cacheDir) == [f"{key}.npz"]
+            assert polygons(pymcnp.blockphantom.loadMesh(key)) == polygons(mesh)
+
+            # another cache version or other parameters give another entry
+            assert pymcnp.blockphantom.meshKey("cube", dim=[1, 1, 2]) != key
+            version = cache.cacheVersion
+            try:
+                cache.cacheVersion = version + 1
+                newKey = pymcnp.blockphantom.meshKey("cube", dim=[1, 1, 1])
+            finally:
+                cache.cacheVersion = version
+            assert newKey != key
+            assert pymcnp.blockphantom.loadMesh(newKey) is None
+
+            # a write that fails, here onto a directory, leaves no temporary file
+            os.mkdir(os.path.join(cacheDir, f"{newKey}.npz"))
+            pymcnp.blockphantom.saveMesh(newKey, mesh)
+            assert sorted(os.listdir(cacheDir)) == sorted([f"{key}.npz", f"{newKey}.npz"])
+            assert pymcnp.blockphantom.loadMesh(newKey) is None
+        finally:
+            for k, v in environ.items():
+                if v is None:
+                    os.environ.pop(k, None)
+                else:
+                    os.environ[k] = v
+
+
+if __name__ == "__main__":
+    test_meshCache()
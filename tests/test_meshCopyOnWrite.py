@@ -0,0 +1,44 @@
+import pymcnp
+import numpy as np
+
+
+def test_meshCopyOnWrite():
+    """
+    test untransformed blocks share the base mesh, transformed blocks get a private mesh and mesh() gives a copy
+    :return: none
+    """
+    b1 = pymcnp.blockphantom.Block("full")
+    b2 = pymcnp.blockphantom.Block("full")
+    assert b1.meshHandle.read() is b2.meshHandle.read()  # shared, no copy
+
+    # the mesh of mesh() can be modified without changing the shared mesh of the other blocks
+    vertices, _, _ = pymcnp.blockphantom.meshToArrays(b2.meshHandle.read())
+    mesh = b1.mesh()
+    assert mesh is not b1.meshHandle.read()
+    mesh.translate([5, 0, 0])
+    verticesAfter, _, _ = pymcnp.blockphantom.meshToArrays(b2.mesh())
+    assert (vertices == verticesAfter).all()
+
+    # transforming gives a private mesh, the source mesh is not changed
+    b3 = b1.transform(translation=[20, 0, 0], rotation=[0, 1, 0])
+    assert b3.meshHandle.read() is not b1.meshHandle.read()
+    assert b3.meshHandle.read() is b3.meshHandle.read()
+    verticesAfter, _, _ = pymcnp.blockphantom.meshToArrays(b1.mesh())
+    assert (vertices == verticesAfter).all()
+
+    # a mesh that can be modified is copied from the shared mesh
+    assert b2.meshHandle.write() is not b1.meshHandle.read()
+    assert not b2.meshHandle.isShared
+
+    # a connector along -z is placed with an inversion, its mesh is not left inside out
+    c1 = pymcnp.blockphantom.Connector.at([0, 0, 0], [0, 0, -1])
+    assert np.linalg.det(c1._meshRotation) < 0
+    vertices, polygonIndices, polygonSizes = pymcnp.blockphantom.meshToArrays(c1.mesh())
+    triangles, _ = pymcnp.blockphantom.triangulate(polygonIndices, polygonSizes)
+    corners = vertices[triangles]
+    volume = np.einsum("ij,ij->i", corners[:, 0], np.cross(corners[:, 1], corners[:, 2])).sum() / 6
+    assert volume > 0
+
+
+if __name__ == "__main__":
+    test_meshCopyOnWrite()
@@ -0,0 +1,39 @@
+import pyg4ometry
+import pymcnp
+import numpy as np
+
+
+def test_meshExport(vis=False):
+    """
+    test exporting the meshes of a grid of blocks with connectors, transformed a kind of cell at a time
+    :param vis: visualisation
+    :type vis: boolean
+    :return: none
+    """
+    x, y = np.meshgrid(np.arange(20) * 20, np.arange(20) * 20)
+    translations = np.stack([x.ravel(), y.ravel(), np.zeros(x.size)], axis=1)
+    rotations = [[0, i % 4, 0] for i in range(len(translations))]
+    blocks, connectors = pymcnp.blockphantom.placeBlocks("full", translations, rotations, connectorHoles=[0, 7])
+    cells = blocks + [c for blockConnectors in connectors for c in blockConnectors]
+
+    meshes = pymcnp.blockphantom.exportMeshes(cells)
+    assert len(meshes) == len(cells)
+    blockVertices, _, _ = pymcnp.blockphantom.meshToArrays(blocks[0]._baseMesh())
+    connectorVertices, _, _ = pymcnp.blockphantom.meshToArrays(pymcnp.blockphantom.Connector._baseMesh())
+    for mesh, cell in zip(meshes, cells):
+        vertices = blockVertices if isinstance(cell, pymcnp.blockphantom.Block) else connectorVertices
+        assert np.allclose(mesh.vertices, vertices @ cell._meshRotation.T + cell._meshTranslation)
+
+    # same vertices as meshing a block
+    vertices, _, _ = pymcnp.blockphantom.meshToArrays(blocks[1].mesh())
+    assert np.allclose(np.sort(vertices, axis=0), np.sort(meshes[1].vertices, axis=0), atol=1e-6)
+
+    if vis:
+        v = pyg4ometry.visualisation.VtkViewer()
+        v.addAxes()
+        pymcnp.blockphantom.addToViewer(v, meshes)
+        v.view()
+
+
+if __name__ == "__main__":
+    test_meshExport(True)
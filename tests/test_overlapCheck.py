@@ -0,0 +1,31 @@
+import pyg4ometry
+import pymcnp
+
+
+def test_overlapCheck():
+    """
+    test finding overlapping blocks and connectors before writing
+    :return: none
+    """
+    reg = pyg4ometry.mcnp.Registry()
+
+    # touching blocks and connectors in their holes do not overlap
+    blocks, connectors = pymcnp.blockphantom.placeBlocks("full", [[0, 0, 0], [11, 0, 0]], reg=reg,
+                                                         connectorHoles=[7, 8, 9])
+    cells = blocks + connectors[0]
+    assert pymcnp.blockphantom.findOverlaps(cells) == []
+
+    # a block pushed 1 cm into its neighbour overlaps it
+    [b3], _ = pymcnp.blockphantom.placeBlocks("full", [[21, 0, 0]], reg=reg)
+    overlaps = pymcnp.blockphantom.findOverlaps(cells + [b3])
+    assert len(overlaps) == 1
+    assert b3 in overlaps[0] and blocks[1] in overlaps[0]
+
+    # a rotated block through the middle of the assembly
+    [b4], _ = pymcnp.blockphantom.placeBlocks("half", [[5, 0, 0]], [[0, 1, 0]], reg=reg)
+    overlaps = pymcnp.blockphantom.findOverlaps(cells + [b4])
+    assert len(overlaps) >= 2
+
+
+if __name__ == "__main__":
+    test_overlapCheck()
@@ -0,0 +1,41 @@
+import os
+import pyg4ometry
+import pymcnp
+import numpy as np
+
+
+def test_phantomF2Description(write=False):
+    """
+    test building phantom F2 from its description matches building it block by block
+    :param write: write to file
+    :type write: boolean
+    :return: none
+    """
+    reg = pyg4ometry.mcnp.Registry()
+    description = os.path.join(os.path.dirname(os.path.abspath(__file__)), "phantomF2.yaml")
+    blocks, connectors = pymcnp.blockphantom.buildPhantom(description, reg=reg)
+    assert len(blocks) == 14 and len(connectors) == 13
+
+    # the same legs block by block
+    b1 = pymcnp.blockphantom.Block("full", rotationSteps=[0, 1, 1])
+    b2 = b1.makeNewConnectedBlock("full", 2, 22)
+    b2 = b2.rotateAboutConnection(hole=2, rotationSteps=[0, 1, 0])
+    b3 = b2.makeNewConnectedBlock("full", 2, 0)
+    b3 = b3.rotateAboutConnection(hole=2, rotationSteps=[0, 1, 0])
+    b5 = b2.makeNewConnectedBlock("half", 13, 13)
+    b6 = b1.makeNewConnectedBlock("full", 2, 17)
+    b6 = b6.rotateAboutConnection(hole=2, rotationSteps=[0, 1, 0])
+    for name, block in [("b1", b1), ("b2", b2), ("b3", b3), ("b5", b5), ("b6", b6)]:
+        assert np.allclose(np.array(blocks[name].holeInfo), np.array(block.holeInfo))
+    assert blocks["b2"].holeStatus[2]["connected"] and blocks["b2"].holeStatus[2]["hasConnector"]
+    assert blocks["b1"].holeStatus[22]["connected"]
+
+    if write:
+        f = pyg4ometry.mcnp.Writer(columnMax=60)
+        f.setTitle("PHANTOM F2 FROM DESCRIPTION")
+        f.addGeometry(reg=reg)
+        f.write("i-phantomF2Description.txt")
+
+
+if __name__ == "__main__":
+    test_phantomF2Description(True)
@@ -0,0 +1,56 @@
+import pyg4ometry
+import pymcnp
+import numpy as np
+
+
+def test_phantomWorldWrite(write=False):
+    """
+    test collecting placed blocks and connectors in a phantom and making its world and void cells in one call
+    :param write: write to file
+    :type write: boolean
+    :return: none
+    """
+    reg = pyg4ometry.mcnp.Registry()
+
+    # CELLS
+    # --- 4X4 GRID OF BLOCKS ---
+    gridRowNum, gridColNum = 4, 4
+    holeOrder = [0, 1, 2, 3]
+    x, y = np.meshgrid(np.arange(gridColNum) * 20 - 30, np.arange(gridRowNum) * 20 - 30)
+    translations = np.stack([x.ravel(), y.ravel(), np.zeros(x.size)], axis=1)
+    blocks, connectors = pymcnp.blockphantom.placeBlocks("full", translations, reg=reg, connectorHoles=holeOrder)
+
+    phantom = pymcnp.blockphantom.Phantom(reg=reg)
+    phantom.add(blocks)
+    phantom.add([c for blockConnectors in connectors for c in blockConnectors])
+    assert len(phantom.blocks) == len(blocks)
+    assert len(phantom.connectors) == len(blocks) * len(holeOrder)
+    assert np.allclose(phantom.translations[:len(blocks)], translations)
+
+    # a moved block keeps its place in the phantom
+    b5 = phantom.blocks[5].transform(translation=[0, 0, 2])
+    phantom.replace(phantom.blocks[5], b5)
+    pymcnp.blockphantom.updateCells([b5], reg)
+    assert phantom.blocks[5] is b5
+    assert np.allclose(phantom.translations[5], translations[5] + [0, 0, 2])
+
+    # --- WORLD ---
+    cWorld, cVoid = phantom.makeWorld(margin=1.0)
+
+    # the sphere is around the grid rather than the origin and touches none of the cells
+    centre, radius = phantom.boundingSphere(margin=1.0)
+    lower, upper = phantom.bounds()
+    assert np.allclose(centre, (lower.min(axis=0) + upper.max(axis=0)) / 2)
+    assert radius < 100
+    for corner in np.stack([lower, upper], axis=1).reshape(-1, 3):
+        assert np.linalg.norm(corner - centre) < radius
+
+    if write:
+        f = pyg4ometry.mcnp.Writer(columnMax=60)
+        f.setTitle(f"{len(blocks)} BLOCK PHANTOM IN A {gridRowNum}X{gridColNum} GRID")
+        f.addGeometry(reg=reg)
+        f.write(f"i-phantomWorld-{gridRowNum}X{gridColNum}Grid.txt")
+
+
+if __name__ == "__main__":
+    test_phantomWorldWrite(True)
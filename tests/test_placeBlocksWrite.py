@@ -0,0 +1,70 @@
+import pyg4ometry
+import pymcnp
+import numpy as np
+
+
+def test_placeBlocksWrite(write=False):
+    """
+    test placing a grid of blocks with connectors in one call and writing it to MCNP input file
+    :param write: write to file
+    :type write: boolean
+    :return: none
+    """
+    reg = pyg4ometry.mcnp.Registry()
+
+    # CELLS
+    # --- 4X4 GRID OF BLOCKS ---
+    gridRowNum, gridColNum = 4, 4
+    holeOrder = [0, 1, 2, 3, 7, 9, 4, 6]
+    x, y = np.meshgrid(np.arange(gridColNum) * 20 - 30, np.arange(gridRowNum) * 20 - 30)
+    translations = np.stack([x.ravel(), y.ravel(), np.zeros(x.size)], axis=1)
+    rotations = [[0, 0, i % 4] for i in range(len(translations))]
+    blocks, connectors = pymcnp.blockphantom.placeBlocks("full", translations, rotations, reg=reg,
+                                                         connectorHoles=holeOrder)
+
+    # same holes and connector surfaces as placing the blocks one at a time
+    for block, blockConnectors, t, r in zip(blocks, connectors, translations, rotations):
+        block_p = pymcnp.blockphantom.Block("full").transform(translation=t, rotation=r)
+        assert np.allclose(np.array(block.holeInfo), np.array(block_p.holeInfo))
+        for hole, connector in zip(holeOrder, blockConnectors):
+            assert block.holeStatus[hole]["hasConnector"]
+            assert connector.surfaceList[0].surfaceNumber in reg.surfaceDict
+
+    # --- WORLD ---
+    cells = blocks + [c for blockConnectors in connectors for c in blockConnectors]
+    cWorld = pyg4ometry.mcnp.Cell(reg=reg)
+    cVoid = pyg4ometry.mcnp.Cell(reg=reg)
+
+    # SURFACES
+    sSO1 = pyg4ometry.mcnp.SO(100, reg=reg)
+    for cell in cells:
+        cWorld.addSurface(cell.geometry)
+    cWorld.addSurface(sSO1)
+    cVoid.addSurface(sSO1)
+
+    # GEOMETRY
+    geo = pyg4ometry.mcnp.Complement(sSO1)
+    for cell in cells:
+        geo = pyg4ometry.mcnp.Intersection(geo, pyg4ometry.mcnp.Complement(cell))
+    cWorld.addGeometry(geo)
+    cVoid.addGeometry(sSO1)
+
+    # MATERIAL
+    m0 = pyg4ometry.mcnp.Material(0, reg=reg)
+    m3 = pyg4ometry.mcnp.Material(3, -0.001225, reg=reg)
+    cWorld.addMaterial(m3)
+    cVoid.addMaterial(m0)
+
+    # IMPORTANCE
+    pymcnp.blockphantom.setImportance(cells + [cWorld], 1, reg=reg)
+    pymcnp.blockphantom.setImportance([cVoid], 0, reg=reg)
+
+    if write:
+        f = pyg4ometry.mcnp.Writer(columnMax=60)
+        f.setTitle(f"{len(blocks)} BLOCKS PLACED IN A {gridRowNum}X{gridColNum} GRID")
+        f.addGeometry(reg=reg)
+        f.write(f"i-placeBlocks-{gridRowNum}X{gridColNum}Grid.txt")
+
+
+if __name__ == "__main__":
+    test_placeBlocksWrite(True)
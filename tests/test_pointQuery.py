@@ -0,0 +1,38 @@
+import pymcnp
+import numpy as np
+
+
+def test_pointQuery():
+    """
+    test locating points in the blocks, connectors and holes of two connected blocks
+    :return: none
+    """
+    b1 = pymcnp.blockphantom.Block("full", rotationSteps=[0, 1, 1])
+    [b2, b2c1] = b1.makeNewConnectedBlock("full", 2, 22, makeConnector=True)
+    query = pymcnp.blockphantom.PointQuery([b1, b2, b2c1])
+
+    holePositions = b1.holePositions
+    connectorCentre = b2c1._meshRotation @ [0, 0, 1] + b2c1._meshTranslation
+    points = np.array([b1._meshTranslation,  # centre of b1
+                       b2._meshTranslation + b2._meshRotation @ [3, 5, 1],  # inside b2, away from holes
+                       connectorCentre,  # connector between the blocks
+                       holePositions[5] + 0.5 * (b1._meshTranslation - holePositions[5]) / 5.5,  # in an empty hole
+                       [100, 100, 100]])  # far outside
+    indices, regions = query.locate(points)
+    assert list(indices) == [0, 1, 2, -1, -1]
+    assert list(regions) == [pymcnp.blockphantom.regionBlock, pymcnp.blockphantom.regionBlock,
+                             pymcnp.blockphantom.regionConnector, pymcnp.blockphantom.regionHole,
+                             pymcnp.blockphantom.regionAir]
+
+    # many points agree with testing every cell
+    rng = np.random.default_rng(1)
+    points = rng.uniform(-20, 20, (10000, 3))
+    indices, regions = query.locate(points)
+    for cellIndex, block in enumerate([b1, b2]):
+        local = (points - block._meshTranslation) @ block._meshRotation
+        inBox = np.all(np.abs(local) <= np.array(block.dim) / 2, axis=1)
+        assert np.all(inBox[indices == cellIndex])
+
+
+if __name__ == "__main__":
+    test_pointQuery()
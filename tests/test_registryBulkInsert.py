@@ -0,0 +1,44 @@
+import pyg4ometry
+import pymcnp
+import numpy as np
+
+
+def test_registryBulkInsert():
+    """
+    test blocks and connectors are numbered from contiguous ranges without clashing with existing numbers
+    :return: none
+    """
+    reg = pyg4ometry.mcnp.Registry()
+    b1 = pymcnp.blockphantom.Block("full", reg=reg)
+    [b2, c2] = b1.makeNewConnectedBlock("full", 20, 13, makeConnector=True, reg=reg)
+
+    # a grid added in bulk continues after the numbers already in use
+    x, y = np.meshgrid(np.arange(10) * 20 + 40, np.arange(10) * 20)
+    translations = np.stack([x.ravel(), y.ravel(), np.zeros(x.size)], axis=1)
+    blocks, connectors = pymcnp.blockphantom.placeBlocks("full", translations, reg=reg, connectorHoles=[0, 7])
+    cells = [c for block, blockConnectors in zip(blocks, connectors) for c in [block] + blockConnectors]
+
+    cellNumbers = [c.cellNumber for c in cells]
+    assert cellNumbers == list(range(cellNumbers[0], cellNumbers[0] + len(cells)))
+    assert cellNumbers[0] > max(b1.cellNumber, b2.cellNumber, c2.cellNumber)
+    surfaceNumbers = [s.surfaceNumber for c in cells for s in c.surfaceList]
+    assert surfaceNumbers == list(range(surfaceNumbers[0], surfaceNumbers[0] + len(surfaceNumbers)))
+    for c in cells:
+        assert reg.cellDict[c.cellNumber] is c
+
+    # a cell moved to a higher number outside the allocator leaves the number of cells the same
+    top = max(reg.cellDict)
+    reg.cellDict[top + 1] = reg.cellDict.pop(cells[-1].cellNumber)
+    [b3], _ = pymcnp.blockphantom.placeBlocks("full", [[0, 200, 0]], reg=reg)
+    assert b3.cellNumber == top + 2
+
+    # registering a block that is already registered does not add it again
+    b4 = pymcnp.blockphantom.Block("full", reg=reg)
+    cellNumbers, surfaceCount = sorted(reg.cellDict), len(reg.surfaceDict)
+    pymcnp.blockphantom.registerCells([b4], reg)
+    assert sorted(reg.cellDict) == cellNumbers and len(reg.surfaceDict) == surfaceCount
+    assert reg.cellDict[b4.cellNumber] is b4
+
+
+if __name__ == "__main__":
+    test_registryBulkInsert()
@@ -0,0 +1,42 @@
+import itertools
+import numpy as np
+import pymcnp
+
+
+def test_rotationTable():
+    """
+    test the lookup table of the 24 axis-aligned rotations against the matrix products
+    :return: none
+    """
+    utils = pymcnp.blockphantom.utils
+    table = utils.rotationTable
+
+    # 24 distinct exact rotations, identity first
+    assert table.shape == (24, 3, 3)
+    assert len({m.tobytes() for m in table}) == 24
+    assert np.all(np.rint(np.linalg.det(table)) == 1)
+    assert np.array_equal(table[0], np.eye(3))
+
+    # steps lookup is the product of the x, y then z step rotations
+    for steps in itertools.product(range(-2, 5), repeat=3):
+        theta = np.array(steps) * np.pi / 2
+        c, s = np.cos(theta), np.sin(theta)
+        rotX = np.array([[1, 0, 0], [0, c[0], -s[0]], [0, s[0], c[0]]])
+        rotY = np.array([[c[1], 0, s[1]], [0, 1, 0], [-s[1], 0, c[1]]])
+        rotZ = np.array([[c[2], -s[2], 0], [s[2], c[2], 0], [0, 0, 1]])
+        assert np.allclose(utils.rotationStepsToMatrix(list(steps)), rotZ @ rotY @ rotX)
+
+    # composition and inverse as indices
+    for i, j in itertools.product(range(24), repeat=2):
+        assert np.array_equal(table[utils.composeRotationIndices(i, j)], table[j] @ table[i])
+    for i in range(24):
+        assert np.array_equal(table[utils.invertRotationIndex(i)] @ table[i], np.eye(3))
+        assert utils.rotationMatrixToIndex(table[i] + 1e-12) == i
+
+    # aligning axis vectors gives exact matrices
+    R = utils.computeRotationMatrix(np.array([0, 1, 0]), np.array([0, 0, -1]))
+    assert np.array_equal(R, np.rint(R))
+
+
+if __name__ == "__main__":
+    test_rotationTable()
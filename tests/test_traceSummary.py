@@ -0,0 +1,51 @@
+import json
+import time
+import pymcnp
+
+
+def test_traceSummary(write=False):
+    """
+    test the phase timers and the JSON timing summary of an assembly
+    :param write: write to file
+    :type write: boolean
+    :return: none
+    """
+    @pymcnp.trace.timed("construction")
+    def build():
+        with pymcnp.trace.phase("registry"):
+            return sum(range(1000))
+
+    # nothing is recorded while tracing is disabled
+    pymcnp.trace.reset()
+    build()
+    assert pymcnp.trace.summary() == {}
+
+    fileName = "timing-traceSummary.json" if write else None
+    with pymcnp.trace.assembly("traceSummary", fileName):
+        for i in range(3):
+            build()
+    summary = pymcnp.trace.summary()
+    assert not pymcnp.trace.enabled
+    assert summary["construction"]["calls"] == 3 and summary["registry"]["calls"] == 3
+    assert summary["construction"]["seconds"] >= summary["registry"]["seconds"]
+
+    # a phase inside itself is not counted twice
+    @pymcnp.trace.timed("construction")
+    def buildMany():
+        return [build() for i in range(5)]
+
+    with pymcnp.trace.assembly("nestedTraceSummary"):
+        start = time.perf_counter()
+        buildMany()
+        seconds = time.perf_counter() - start
+    summary = pymcnp.trace.summary()
+    assert summary["construction"]["calls"] == 1 and summary["registry"]["calls"] == 5
+    assert summary["construction"]["seconds"] <= seconds
+
+    if write:
+        with open(fileName) as f:
+            assert json.load(f)["assembly"] == "traceSummary"
+
+
+if __name__ == "__main__":
+    test_traceSummary(True)
@@ -0,0 +1,27 @@
+import pymcnp
+import numpy as np
+
+
+def test_transformComposition():
+    """
+    test a chain of transforms is kept as one pending transform and matches transforming step by step
+    :return: none
+    """
+    b1 = pymcnp.blockphantom.Block("full", translation=[1, 2, 3])
+    b2 = b1.transform(translation=[-4, 0, 0], rotation=[0, 1, 0])
+    b3 = b2.transform(translation=[0, 5, 0], rotation=[0, 0, 1])
+    assert b3._surfacesPending
+
+    # the same total transform applied at once
+    R = pymcnp.blockphantom.rotationStepsToMatrix([0, 0, 1]) @ pymcnp.blockphantom.rotationStepsToMatrix([0, 1, 0])
+    b4 = b1.transform(translation=b3._meshTranslation - R @ b1._meshTranslation, rotation=R, isRotationMatrix=True)
+    assert np.allclose(np.array(b3.holeInfo), np.array(b4.holeInfo))
+
+    # surfaces are made when requested, keeping the surface numbers
+    numbers = [s.surfaceNumber for s in b1.surfaceList]
+    assert [s.surfaceNumber for s in b3.surfaceList] == numbers
+    assert not b3._surfacesPending
+
+
+if __name__ == "__main__":
+    test_transformComposition()
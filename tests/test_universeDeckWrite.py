@@ -0,0 +1,37 @@
+import pymcnp
+import numpy as np
+
+
+def test_universeDeckWrite(write=False):
+    """
+    test writing a grid of blocks with connectors as universe filled cells
+    :param write: write to file
+    :type write: boolean
+    :return: none
+    """
+    # --- 4X4 GRID OF BLOCKS ---
+    gridRowNum, gridColNum = 4, 4
+    holeOrder = [0, 1, 2, 3, 7, 9, 4, 6]
+    x, y = np.meshgrid(np.arange(gridColNum) * 20 - 30, np.arange(gridRowNum) * 20 - 30)
+    translations = np.stack([x.ravel(), y.ravel(), np.zeros(x.size)], axis=1)
+    rotations = [[0, 0, i % 4] for i in range(len(translations))]
+    blocks, connectors = pymcnp.blockphantom.placeBlocks("full", translations, rotations,
+                                                         connectorHoles=holeOrder)
+
+    deck = pymcnp.blockphantom.UniverseDeck(f"{len(blocks)} BLOCKS AS FILLED CELLS IN A {gridRowNum}X{gridColNum} GRID")
+    deck.addBlocks(blocks)
+    deck.addConnectors([c for blockConnectors in connectors for c in blockConnectors])
+    cellCards, surfaceCards, dataCards = deck.cards()
+
+    # one universe (2 cells, 30 surfaces), one cell and surface per block and connector, world and void
+    connectorNum = len(blocks) * len(holeOrder)
+    assert len(cellCards) == 2 + len(blocks) + connectorNum + 2
+    assert len(surfaceCards) == 30 + len(blocks) + connectorNum + 1
+    assert sum("fill=1" in c for c in cellCards) == len(blocks)
+
+    if write:
+        deck.write(f"i-universe-{gridRowNum}X{gridColNum}Grid.txt")
+
+
+if __name__ == "__main__":
+    test_universeDeckWrite(True)
@@ -0,0 +1,60 @@
+import os
+import tempfile
+import pymcnp
+import numpy as np
+
+
+def test_voxelise(write=False):
+    """
+    test voxelising two connected blocks to material and density grids, in memory and streamed to file
+    :param write: write to file
+    :type write: boolean
+    :return: none
+    """
+    b1 = pymcnp.blockphantom.Block("full")
+    [b2, b2c1] = b1.makeNewConnectedBlock("full", 2, 22, makeConnector=True)
+    cells = [b1, b2, b2c1]
+
+    materials, densities, origin = pymcnp.blockphantom.voxelise(cells, voxelSize=0.25)
+    polyethylene, aluminium, air = (pymcnp.blockphantom.polyethylene, pymcnp.blockphantom.aluminium,
+                                    pymcnp.blockphantom.air)
+    assert set(np.unique(materials)) == {polyethylene[0], aluminium[0], air[0]}
+    assert np.allclose(densities[materials == polyethylene[0]], abs(polyethylene[1]))
+
+    # volume of the blocks is their boxes less the holes
+    blockVolume = np.sum(materials == polyethylene[0]) * 0.25 ** 3
+    boxVolume = 2 * np.prod(b1.dim)
+    assert 0.9 * boxVolume < blockVolume < boxVolume
+
+    # the voxel at the centre of b1 is in the block
+    k, j, i = np.floor((b1._meshTranslation - origin) / 0.25).astype(int)[::-1]
+    assert materials[k, j, i] == polyethylene[0]
+
+    # streamed to a memory-mapped file in slabs of two layers gives the same grid
+    with tempfile.TemporaryDirectory() as directory:
+        fileName = os.path.join(directory, "materials.npy")
+        pymcnp.blockphantom.voxelise(cells, voxelSize=0.25, fileName=fileName, slabVoxels=2)
+        assert (np.load(fileName) == materials).all()
+
+        # and so do the slabs filled by two worker processes, with the densities
+        fileName = os.path.join(directory, "materialsParallel.npy")
+        densityFileName = os.path.join(directory, "densitiesParallel.npy")
+        pymcnp.blockphantom.voxelise(cells, voxelSize=0.25, fileName=fileName, densityFileName=densityFileName,
+                                     slabVoxels=2, processes=2)
+        assert (np.load(fileName) == materials).all()
+        assert (np.load(densityFileName) == densities).all()
+
+    # a block given another material is voxelised with it
+    pymcnp.blockphantom.setMaterial([b2], 4, -1.2)
+    materials, densities, origin = pymcnp.blockphantom.voxelise(cells, voxelSize=0.25)
+    k, j, i = np.floor((b2._meshTranslation - origin) / 0.25).astype(int)[::-1]
+    assert materials[k, j, i] == 4 and np.isclose(densities[k, j, i], 1.2)
+    assert set(np.unique(materials)) == {polyethylene[0], aluminium[0], air[0], 4}
+
+    if write:
+        pymcnp.blockphantom.voxelise(cells, voxelSize=0.1, fileName="voxelise-materials.npy",
+                                     densityFileName="voxelise-densities.npy", processes=None)
+
+
+if __name__ == "__main__":
+    test_voxelise(True)
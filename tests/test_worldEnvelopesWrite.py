@@ -0,0 +1,92 @@
+import pyg4ometry
+import pymcnp
+import numpy as np
+
+
+def leaves(node):
+    """
+    regions of an intersection tree from left to right
+    """
+    if isinstance(node, pyg4ometry.mcnp.Intersection):
+        return leaves(node.left) + leaves(node.right)
+    return [node]
+
+
+def depth(node):
+    if isinstance(node, pyg4ometry.mcnp.Intersection):
+        return 1 + max(depth(node.left), depth(node.right))
+    return 0
+
+
+def test_worldEnvelopesWrite(write=False):
+    """
+    test writing connected blocks with the world cell split into envelopes
+    :param write: write to file
+    :type write: boolean
+    :return: none
+    """
+    reg = pyg4ometry.mcnp.Registry()
+
+    # CELLS
+    # --- PHANTOM ---
+    b1 = pymcnp.blockphantom.Block("full", rotationSteps=[0, 1, 1], reg=reg)
+    [b2, b2c1] = b1.makeNewConnectedBlock("full", 2, 22, makeConnector=True, reg=reg)
+    b2 = b2.rotateAboutConnection(hole=2, rotationSteps=[0, 1, 0], reg=reg)
+    [b3, b3c1] = b1.makeNewConnectedBlock("full", 2, 17, makeConnector=True, reg=reg)
+    [b4, b4c1] = b1.makeNewConnectedBlock("full", 0, 12, makeConnector=True, reg=reg)
+    cells = [b1, b2, b3, b4, b2c1, b3c1, b4c1]
+
+    # --- WORLD ---
+    sSO1 = pyg4ometry.mcnp.SO(50, reg=reg)
+    sRPP, envelopes = pymcnp.blockphantom.envelopeCells(cells, divisions=[2, 2, 1], reg=reg)
+    cWorld = pyg4ometry.mcnp.Cell(reg=reg)
+    cVoid = pyg4ometry.mcnp.Cell(reg=reg)
+    cWorld.addSurface(sRPP)
+    cWorld.addSurface(sSO1)
+    cVoid.addSurface(sSO1)
+
+    # GEOMETRY
+    cWorld.addGeometry(pyg4ometry.mcnp.Intersection(pyg4ometry.mcnp.Complement(sSO1), sRPP))
+    cVoid.addGeometry(sSO1)
+
+    # the balanced tree of the world without envelopes is outside every cell once and is O(log N) deep
+    geo = pymcnp.blockphantom.worldGeometry(cells, sSO1)
+    regions = [leaf.item for leaf in leaves(geo)]
+    assert regions[0] is sSO1 and sorted(map(id, regions[1:])) == sorted(map(id, cells))
+    assert depth(geo) == int(np.ceil(np.log2(len(cells) + 1)))
+
+    # every cell is in each envelope its bounds reach into, the envelopes are the same grid over the cells
+    lower, upper = pymcnp.blockphantom.cellBounds(cells)
+    edges = [np.linspace(lower[:, a].min() - 0.1, upper[:, a].max() + 0.1, n + 1) for a, n in enumerate([2, 2, 1])]
+    boxes = [(np.array([edges[0][i], edges[1][j], edges[2][k]]),
+              np.array([edges[0][i + 1], edges[1][j + 1], edges[2][k + 1]]))
+             for i in range(2) for j in range(2) for k in range(1)]
+    assert len(envelopes) == len(boxes)
+    for envelope, (boxLower, boxUpper) in zip(envelopes, boxes):
+        members = {id(leaf.item) for leaf in leaves(envelope.geometry)[1:]}
+        for cell, cellLower, cellUpper in zip(cells, lower, upper):
+            reaches = np.all(cellLower < boxUpper - 1e-9) and np.all(cellUpper > boxLower + 1e-9)
+            assert not reaches or id(cell) in members
+
+    # MATERIAL
+    m0 = pyg4ometry.mcnp.Material(0, reg=reg)
+    # material numbers 1 & 2 are used for the block and connector
+    m3 = pyg4ometry.mcnp.Material(3, -0.001225, reg=reg)
+    for envelope in envelopes:
+        envelope.addMaterial(m3)
+    cWorld.addMaterial(m3)
+    cVoid.addMaterial(m0)
+
+    # IMPORTANCE
+    pymcnp.blockphantom.setImportance(cells + envelopes + [cWorld], 1, reg=reg)
+    pymcnp.blockphantom.setImportance([cVoid], 0, reg=reg)
+
+    if write:
+        f = pyg4ometry.mcnp.Writer(columnMax=60)
+        f.setTitle("CONNECTED BLOCKS IN ENVELOPES")
+        f.addGeometry(reg=reg)
+        f.write("i-worldEnvelopes.txt")
+
+
+if __name__ == "__main__":
+    test_worldEnvelopesWrite(True)